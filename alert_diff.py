@@ -0,0 +1,158 @@
+"""
+Incremental alerts keyed by IPO name.
+
+The last-sent state remembers, per subscriber filter profile, the GMP,
+rating and closing status each IPO was last emailed with. Every run
+classifies the IPOs passing a profile's filters against it, and only the
+actionable ones (new, GMP moved, rating changed, closing today) are
+emailed. Unchanged IPOs keep their old baseline, so a slow GMP drift still
+triggers an alert once it adds up.
+"""
+
+import json
+import os
+from datetime import date, datetime
+
+import metrics
+from snapshot_cache import CACHE_DIR, write_json
+
+
+DIFF_ALERTS = os.getenv("IPO_DIFF_ALERTS", "1") != "0"
+GMP_MOVE_THRESHOLD = float(os.getenv("IPO_GMP_MOVE_THRESHOLD", "5"))  # GMP percentage points
+LAST_SENT_FILE = os.path.join(CACHE_DIR, "last_sent.json")
+LEGACY_PROFILE = "*"
+
+NEW = "new"
+CLOSING_TODAY = "closing_today"
+RATING_CHANGED = "rating_changed"
+GMP_MOVED = "gmp_moved"
+UNCHANGED = "unchanged"
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+def load_state():
+    """
+    Returns:
+        dict: {profile_key: {name: {"gmp_pct", "rating_value", "closing_status",
+               "close_date", "sent_at"}}}
+    """
+    try:
+        with open(LAST_SENT_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        debug_print(f"Ignoring unreadable last-sent state: {e}")
+        return {}
+    if any("gmp_pct" in entry for entry in state.values()):
+        # Written before per-profile state: one flat {name: entry} mapping for everyone
+        return {LEGACY_PROFILE: state}
+    return state
+
+
+def load_last_sent(profile_key, state=None):
+    """
+    Last-sent entries for one filter profile.
+
+    Args:
+        profile_key: subscriptions.FilterProfile.key
+        state: Pre-loaded load_state() result, to read the file only once
+
+    Returns:
+        dict: {name: entry}
+    """
+    if state is None:
+        state = load_state()
+    if profile_key in state:
+        return state[profile_key]
+    return state.get(LEGACY_PROFILE, {})
+
+
+def closes_today(ipo, today=None):
+    return ipo.closing_status == "CT" or ipo.days_remaining(today) == 0
+
+
+def gmp_moved(gmp_pct, previous_gmp_pct, threshold=GMP_MOVE_THRESHOLD):
+    if gmp_pct is None or previous_gmp_pct is None:
+        return gmp_pct != previous_gmp_pct  # GMP appeared or disappeared
+    return abs(gmp_pct - previous_gmp_pct) > threshold
+
+
+def classify(ipo, previous, threshold=GMP_MOVE_THRESHOLD, today=None):
+    """
+    Classify one IPO against its last-sent state, most urgent change first.
+
+    Args:
+        ipo: IpoRecord from this run
+        previous: Its load_last_sent() entry, or None if it was never sent
+        threshold: GMP percentage points that count as a move
+
+    Returns:
+        str: NEW, CLOSING_TODAY, RATING_CHANGED, GMP_MOVED or UNCHANGED
+    """
+    if previous is None:
+        return NEW
+    if closes_today(ipo, today) and previous["closing_status"] != "CT":
+        return CLOSING_TODAY
+    if ipo.rating_value != previous["rating_value"]:
+        return RATING_CHANGED
+    if gmp_moved(ipo.gmp_pct, previous["gmp_pct"], threshold):
+        return GMP_MOVED
+    return UNCHANGED
+
+
+def select_actionable(ipos, last_sent, threshold=GMP_MOVE_THRESHOLD, today=None):
+    """
+    Keep only the IPOs worth emailing.
+
+    Args:
+        ipos: IpoBatch of IPOs passing one profile's filters
+        last_sent: That profile's load_last_sent() entries
+
+    Returns:
+        (IpoBatch, dict): Actionable IPOs and {name: change} for each of them
+    """
+    changes = {}
+    keep = []
+    for i, ipo in enumerate(ipos):
+        change = classify(ipo, last_sent.get(ipo.name), threshold, today)
+        if change != UNCHANGED:
+            changes[ipo.name] = change
+            keep.append(i)
+
+    metrics.incr("alerts_actionable", len(keep))
+    metrics.incr("alerts_unchanged", len(ipos) - len(keep))
+    return ipos.take(keep), changes
+
+
+def record_sent(ipos, profile_keys, today=None):
+    """
+    Make the IPOs just emailed the new baseline of each profile that got
+    them, and forget IPOs that have closed.
+
+    Args:
+        ipos: IpoRecords (or an IpoBatch) that subscribers received
+        profile_keys: Keys of the filter profiles the email went to
+    """
+    today = today or date.today()
+    sent_at = datetime.now().isoformat(timespec="seconds")
+    state = load_state()
+    for profile_key in profile_keys:
+        sent = state[profile_key] = dict(load_last_sent(profile_key, state))
+        for ipo in ipos:
+            sent[ipo.name] = {
+                "gmp_pct": ipo.gmp_pct,
+                "rating_value": ipo.rating_value,
+                "closing_status": "CT" if closes_today(ipo, today) else ipo.closing_status,
+                "close_date": ipo.close_date.isoformat() if ipo.close_date else None,
+                "sent_at": sent_at,
+            }
+    state = {
+        profile_key: {name: entry for name, entry in sent.items()
+                      if not entry["close_date"] or entry["close_date"] >= today.isoformat()}
+        for profile_key, sent in state.items()
+    }
+    write_json(LAST_SENT_FILE, state)
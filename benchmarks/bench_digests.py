@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one rendered email per subscriber vs. digests grouped by profile.
+
+Builds --subscribers subscribers spread over --profiles random filter
+profiles and --ipos scraped IPOs, then compares rendering a separate
+email for every subscriber with plan_digests() rendering each distinct
+digest once, and checks that every subscriber ends up with the same IPOs
+either way.
+
+    python -m benchmarks.bench_digests --subscribers 5000 --profiles 24
+"""
+
+import argparse
+import random
+import time
+
+from emailer import create_email_html
+from models import IpoBatch, IpoRecord
+from subscriptions import FilterProfile, plan_digests
+from templates import render_card
+
+
+def sample_ipos(count, rng):
+    return IpoBatch(
+        IpoRecord.from_cells(
+            f"Benchmark {i}{' SME' if i % 3 == 0 else ''} IPO", rng.choice(["O", "CT", ""]),
+            f"₹{rng.randint(1, 200)} ({rng.uniform(-5, 60):.2f}%)", "🔥" * rng.randint(0, 5),
+            f"{rng.randint(1, 28):02d}-Nov",
+        )
+        for i in range(count)
+    )
+
+
+def sample_profiles(count, rng):
+    profiles = {FilterProfile()}
+    while len(profiles) < count:
+        profiles.add(FilterProfile(min_rating=float(rng.randint(1, 5)),
+                                   min_gmp=rng.choice([None, 10.0, 20.0, 30.0]),
+                                   exclude_sme=rng.random() < 0.3))
+    return list(profiles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--profiles", type=int, default=24)
+    parser.add_argument("--ipos", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    ipos = sample_ipos(args.ipos, rng)
+    profiles = sample_profiles(args.profiles, rng)
+    subscriptions = {f"user{i}@example.com": rng.choice(profiles) for i in range(args.subscribers)}
+
+    render_card.cache_clear()
+    start = time.perf_counter()
+    per_subscriber = {email: profile.apply(ipos) for email, profile in subscriptions.items()}
+    for batch in per_subscriber.values():
+        create_email_html(batch)
+    naive_time = time.perf_counter() - start
+
+    render_card.cache_clear()
+    start = time.perf_counter()
+    digests = plan_digests(ipos, subscriptions, diff=False)
+    for digest in digests:
+        create_email_html(digest.ipos, digest.changes)
+    grouped_time = time.perf_counter() - start
+
+    received = {email: digest.ipos.names() for digest in digests for email in digest.recipients}
+    same = all(received.get(email, []) == batch.names() for email, batch in per_subscriber.items())
+
+    print(f"{args.subscribers} subscribers, {len(profiles)} profiles, {args.ipos} IPOs")
+    print(f"  one email per subscriber: {naive_time * 1000:8.1f} ms ({args.subscribers} renders)")
+    print(f"  grouped digests         : {grouped_time * 1000:8.1f} ms ({len(digests)} renders, "
+          f"{naive_time / grouped_time:.0f}x)")
+    print(f"  same IPOs per subscriber: {same}")
+
+
+if __name__ == "__main__":
+    main()
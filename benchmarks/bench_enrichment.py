@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: detail-page enrichment one page at a time vs. concurrently vs. cached.
+
+Serves the fixture report and its detail pages with a per-request delay
+standing in for network latency, then enriches the report's IPOs with
+one worker, with --workers workers and once more from the on-disk cache.
+
+    python -m benchmarks.bench_enrichment --delay 0.2 --workers 4
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+os.environ["IPO_CACHE_DIR"] = tempfile.mkdtemp(prefix="ipo-enrichment-")
+
+import enrichment
+import metrics
+from fixture_server import REPORT_PATH, Faults, start_fixture_server
+from models import IpoBatch
+from scraper import fetch_rows_http, parse_ipo_row
+
+
+def timed_enrich(ipos, workers):
+    metrics.reset()
+    start = time.perf_counter()
+    enriched = enrichment.enrich_ipos(ipos, max_workers=workers)
+    return time.perf_counter() - start, enriched, metrics.snapshot()["counters"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.2, help="Server seconds per request")
+    parser.add_argument("--workers", type=int, default=enrichment.DETAIL_WORKERS)
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    try:
+        url = base_url + REPORT_PATH
+        ipos = IpoBatch(parse_ipo_row(row, base_url=url) for row in fetch_rows_http(url))
+        server.faults = Faults(delay=args.delay)
+
+        results = []
+        for label, workers, clear_cache in (("sequential", 1, True), (f"{args.workers} workers", args.workers, True),
+                                            ("cached", args.workers, False)):
+            if clear_cache and os.path.exists(enrichment.DETAIL_CACHE_FILE):
+                os.remove(enrichment.DETAIL_CACHE_FILE)
+            elapsed, enriched, counters = timed_enrich(ipos, workers)
+            results.append(enriched)
+            print(f"  {label:12}: {elapsed * 1000:7.1f} ms  ({counters.get('detail_fetches', 0)} fetches, "
+                  f"{counters.get('detail_cache_hits', 0)} cache hits)")
+    finally:
+        server.shutdown()
+        shutil.rmtree(os.environ["IPO_CACHE_DIR"], ignore_errors=True)
+
+    complete = sum(bool(ipo.lot_size and ipo.price_band) for ipo in results[0])
+    print(f"  {complete}/{len(ipos)} IPOs enriched, identical across runs: "
+          f"{all(list(r) == list(results[0]) for r in results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-cell WebDriver extraction vs. single execute_script extraction.
+
+Loads a saved report page (scaled to --rows rows) from the local fixture
+server once, then times both extraction modes against the same DOM.
+Requires Chrome.
+
+    python -m benchmarks.bench_extraction --rows 40 --repeat 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from fixture_server import build_report_page, start_fixture_server
+from scraper import create_driver, parse_ipo_row, read_rows_with_cells, read_rows_with_script, wait_for_table
+
+
+def time_mode(read_rows, driver, repeat):
+    timings = []
+    raw_rows = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        raw_rows = read_rows(driver)
+        timings.append(time.perf_counter() - start)
+    return min(timings), raw_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "report.html"), "w", encoding="utf-8") as f:
+            f.write(build_report_page(args.rows))
+
+        server, base_url = start_fixture_server(directory)
+        driver = create_driver()
+        try:
+            driver.get(f"{base_url}/report.html")
+            # get() returns as soon as navigation starts (page load strategy "none")
+            wait_for_table(driver)
+
+            cells_time, cells_rows = time_mode(read_rows_with_cells, driver, args.repeat)
+            script_time, script_rows = time_mode(read_rows_with_script, driver, args.repeat)
+        finally:
+            driver.quit()
+            server.shutdown()
+
+    identical = [parse_ipo_row(r) for r in cells_rows] == [parse_ipo_row(r) for r in script_rows]
+
+    print(f"Rows: {len(script_rows)} (best of {args.repeat})")
+    print(f"  cells  : {cells_time * 1000:8.1f} ms")
+    print(f"  script : {script_time * 1000:8.1f} ms")
+    print(f"  speedup: {cells_time / script_time:8.1f}x")
+    print(f"  identical rows: {identical}")
+
+
+if __name__ == "__main__":
+    main()
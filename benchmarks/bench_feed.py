@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rebuilding the whole data feed vs. the incremental export.
+
+Fills a scratch history database and feed with --past IPOs from earlier
+months, then exports a scrape of --current IPOs of which --changed have
+moved into the existing feed, and compares that with rebuilding every
+IPO's file into an empty directory. Checks that only the changed IPOs'
+files, the current archive partition and current.json were rewritten.
+
+    python -m benchmarks.bench_feed --past 5000 --current 40 --changed 5
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import feed
+import history
+from models import IpoRecord
+
+
+def sample_ipo(i, gmp):
+    return IpoRecord.from_cells(f"Benchmark {i} IPO", "O", f"₹{gmp} ({gmp / 2:.2f}%)", "🔥🔥🔥🔥", "07-Nov")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--past", type=int, default=5000)
+    parser.add_argument("--current", type=int, default=40)
+    parser.add_argument("--changed", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="ipo-feed-")
+    db_path = os.path.join(workdir, "history.db")
+    feed_dir = os.path.join(workdir, "feed")
+    try:
+        # Past IPOs, exported month by month as they were scraped
+        start = datetime(2025, 1, 1)
+        exported = []
+        for month in range(12):
+            scraped_at = start + timedelta(days=31 * month)
+            batch = [sample_ipo(i, 10 + i % 50) for i in range(month * args.past // 12, (month + 1) * args.past // 12)]
+            history.record_scrape(batch, scraped_at, db_path)
+            feed.export_feed(batch, scraped_at, feed_dir, db_path)
+            exported.extend(batch)
+
+        current = [sample_ipo(args.past + i, 20) for i in range(args.current)]
+        scraped_at = start + timedelta(days=400)
+        history.record_scrape(current, scraped_at, db_path)
+        feed.export_feed(current, scraped_at, feed_dir, db_path)
+
+        moved = [replace(ipo, gmp_pct=ipo.gmp_pct + 5) if i < args.changed else ipo for i, ipo in enumerate(current)]
+        scraped_at += timedelta(hours=1)
+        history.record_scrape(moved, scraped_at, db_path)
+
+        rebuild_dir = os.path.join(workdir, "rebuild")
+        begin = time.perf_counter()
+        rebuilt = feed.export_feed(exported + moved, scraped_at, rebuild_dir, db_path)
+        rebuild_time = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        written = feed.export_feed(moved, scraped_at, feed_dir, db_path)
+        incremental_time = time.perf_counter() - begin
+        manifest = feed.load_manifest(feed_dir)
+    finally:
+        shutil.rmtree(workdir)
+
+    expected = {f"ipos/{feed.slugify(ipo.name)}.json" for ipo in moved[:args.changed]}
+    expected |= {f"archive/{scraped_at:%Y-%m}.csv", "current.json"}
+    print(f"Feed: {args.past} past IPOs, {args.current} current, {args.changed} changed "
+          f"({len(manifest['files'])} files, revision {manifest['revision']})")
+    print(f"  full rebuild : {rebuild_time * 1000:8.1f} ms ({len(rebuilt)} files written)")
+    print(f"  incremental  : {incremental_time * 1000:8.1f} ms ({len(written)} files written)")
+    print(f"  only changed partitions rewritten: {set(written) - {'archive/' + f'{scraped_at:%Y-%m}.parquet'} == expected}")
+
+
+if __name__ == "__main__":
+    main()
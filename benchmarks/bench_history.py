@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GMP trend queries over a year of 5-minute polls.
+
+Fills a scratch history database with --days of polls every 5 minutes,
+each seeing ~--live IPOs that stay open for 5 days, then times per-IPO
+trend queries and the IPO listing.
+
+    python -m benchmarks.bench_history --days 365
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+
+import history
+
+
+POLL_MINUTES = 5
+IPO_LIFETIME_DAYS = 5
+
+
+def populate(db_path, days, live):
+    start = datetime(2025, 1, 1)
+    polls = days * 24 * 60 // POLL_MINUTES
+    new_ipo_every = IPO_LIFETIME_DAYS * 24 * 60 // POLL_MINUTES // live
+    rng = random.Random(42)
+
+    rows = []
+    for poll in range(polls):
+        scraped_at = (start + timedelta(minutes=poll * POLL_MINUTES)).isoformat(timespec="seconds")
+        newest = poll // new_ipo_every
+        for ipo in range(max(0, newest - live + 1), newest + 1):
+            gmp = round(rng.uniform(-5, 60), 2)
+            rows.append((scraped_at, f"Benchmark {ipo} IPO", "O", f"{gmp} %", gmp, "4.0/5", 4.0, "13-Oct"))
+
+    with closing(history.connect(db_path)) as conn, conn:
+        history.insert_rows(conn, rows)
+    return len(rows), newest + 1
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--live", type=int, default=8, help="IPOs open at any time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "history.db")
+
+        start = time.perf_counter()
+        row_count, ipo_count = populate(db_path, args.days, args.live)
+        print(f"Inserted {row_count:,d} rows for {ipo_count} IPOs in {time.perf_counter() - start:.1f}s")
+
+        name = f"Benchmark {ipo_count // 2} IPO"
+        trend_time, points = best_of(lambda: history.gmp_trend(name, db_path=db_path))
+        window_time, window = best_of(lambda: history.gmp_trend(
+            name, since=points[0][0], until=points[len(points) // 2][0], db_path=db_path))
+        list_time, ipos = best_of(lambda: history.list_ipos(db_path=db_path))
+
+        with closing(sqlite3.connect(db_path)) as conn:
+            plan = conn.execute("EXPLAIN QUERY PLAN SELECT scraped_at, gmp_pct FROM ipo_history"
+                                " WHERE name = ? ORDER BY scraped_at", (name,)).fetchall()
+
+    print(f"gmp_trend (full, {len(points)} points): {trend_time * 1000:8.2f} ms")
+    print(f"gmp_trend (window, {len(window)} points): {window_time * 1000:8.2f} ms")
+    print(f"list_ipos ({len(ipos)} IPOs):          {list_time * 1000:8.2f} ms")
+    print(f"Query plan: {plan[0][-1]}")
+
+
+if __name__ == "__main__":
+    main()
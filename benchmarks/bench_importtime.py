@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start import cost of each cli.py subcommand.
+
+Runs every subcommand in a fresh interpreter under `python -X importtime`,
+sums the import time of modules the interpreter doesn't load on its own,
+and fails if the median run exceeds the budget or if a subcommand pulls in
+a heavy module it has no use for (Selenium outside `scrape`, for example).
+
+    python -m benchmarks.bench_importtime --runs 5 --budget-ms 100
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from emailer import Digest
+from models import IpoBatch, IpoRecord
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, "cli.py")
+HEAVY_MODULES = ("selenium", "bs4", "requests", "dotenv")
+SAMPLE_DATA = IpoBatch([IpoRecord.from_cells("Test IPO", "O", "₹51 (25.5%)", "🔥🔥🔥🔥", "13-Oct")] * 10)
+
+
+def import_profile(argv, env, cwd):
+    """
+    Run python -X importtime with argv.
+
+    Returns:
+        dict: {top-level module: cumulative microseconds}
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", *argv], env=env, cwd=cwd,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # top-level import; nested ones are in its cumulative
+            profile[name.strip()] = profile.get(name.strip(), 0) + int(cumulative)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("CLI_IMPORT_BUDGET_MS", "100")),
+                        help="Median import time each subcommand may spend (excluding interpreter startup)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {key: value for key, value in os.environ.items()
+               if key not in ("GMAIL_USER", "GMAIL_PASSWORD", "EMAIL_RECIPIENTS")}
+        env.update(IPO_CACHE_DIR=workdir, PYTHONPATH=ROOT)
+
+        os.environ["IPO_CACHE_DIR"] = workdir
+        import snapshot_cache
+        snapshot_cache.save_digests([Digest(SAMPLE_DATA, recipients=["user@example.com"])])
+
+        startup = set(import_profile(["-c", "pass"], env, workdir))
+        commands = {
+            "--help": ([CLI, "--help"], HEAVY_MODULES),
+            "status": ([CLI, "status"], HEAVY_MODULES),
+            "preview": ([CLI, "preview", "-o", os.path.join(workdir, "preview.html")], HEAVY_MODULES),
+            "send": ([CLI, "send"], ("selenium", "bs4", "requests")),
+        }
+
+        failures = []
+        print(f"{'command':10} {'median':>9} {'max':>9}  heaviest imports")
+        for command, (argv, forbidden) in commands.items():
+            timings = []
+            loaded = set()
+            for _ in range(args.runs):
+                profile = {name: us for name, us in import_profile(argv, env, workdir).items()
+                           if name not in startup}
+                timings.append(sum(profile.values()) / 1000)
+                loaded.update(name.split(".")[0] for name in profile)
+            heaviest = sorted(profile.items(), key=lambda item: -item[1])[:3]
+            median = statistics.median(timings)
+            print(f"{command:10} {median:7.1f}ms {max(timings):7.1f}ms  "
+                  + ", ".join(f"{name} {us / 1000:.1f}ms" for name, us in heaviest))
+
+            if median > args.budget_ms:
+                failures.append(f"{command}: median {median:.1f}ms over the {args.budget_ms:.0f}ms budget")
+            unexpected = sorted(loaded & set(forbidden))
+            if unexpected:
+                failures.append(f"{command}: imported {', '.join(unexpected)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"All subcommands within the {args.budget_ms:.0f}ms import budget")
+
+
+if __name__ == "__main__":
+    main()
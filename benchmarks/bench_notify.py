@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: email then one POST per alert per channel vs. the async dispatcher.
+
+Sends --digests digests to --recipients recipients each through the stub
+SMTP server, and every IPO in them to a Slack, a Telegram and a generic
+webhook endpoint on the stub webhook server (--latency seconds per
+request, the first --throttle requests answered with 429). Compares doing
+it all one after another with notifications.notify(), and checks that
+every channel got every alert exactly once.
+
+    python -m benchmarks.bench_notify --ipos 60 --latency 0.05
+"""
+
+import argparse
+import os
+import random
+import socket
+import time
+
+# emailer reads its SMTP settings at import time, so point them at the stub first
+with socket.socket() as probe:
+    probe.bind(("127.0.0.1", 0))
+    SMTP_STUB_PORT = probe.getsockname()[1]
+os.environ.update(SMTP_HOST="127.0.0.1", SMTP_PORT=str(SMTP_STUB_PORT), SMTP_SSL="0", SMTP_RATE_LIMIT="0",
+                  GMAIL_USER="alerts@example.com", GMAIL_PASSWORD="password")
+
+import requests
+
+from emailer import Digest, send_digests
+from models import IpoBatch, IpoRecord
+from notifications import (EmailChannel, SlackChannel, TelegramChannel, WebhookChannel,
+                           alerts_from_digests, notify)
+from smtp_stub import StubSMTPServer
+from webhook_stub import StubWebhookServer
+
+
+def sample_digests(ipo_count, digest_count, recipients, rng):
+    ipos = [
+        IpoRecord.from_cells(f"Benchmark {i} IPO", "O", f"₹{rng.randint(1, 200)} ({rng.uniform(0, 60):.2f}%)",
+                             "🔥" * rng.randint(3, 5), f"{rng.randint(1, 28):02d}-Nov")
+        for i in range(ipo_count)
+    ]
+    return [
+        Digest(IpoBatch(rng.sample(ipos, ipo_count * 2 // 3)), {},
+               [f"user{d}-{i}@example.com" for i in range(recipients)], [f"profile{d}"])
+        for d in range(digest_count)
+    ]
+
+
+def send_sequential(digests, stub_url):
+    """Email first, then every alert to every endpoint, one request at a time."""
+    send_digests(digests)
+    for alert in alerts_from_digests(digests):
+        for path in ("/slack", "/telegram/botx/sendMessage", "/hook"):
+            for _ in range(5):
+                response = requests.post(stub_url + path, json={"text": alert.to_text()}, timeout=10)
+                if response.status_code != 429:
+                    break
+                time.sleep(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ipos", type=int, default=60)
+    parser.add_argument("--digests", type=int, default=3)
+    parser.add_argument("--recipients", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub seconds per webhook request")
+    parser.add_argument("--throttle", type=int, default=2, help="Webhook requests answered with 429")
+    args = parser.parse_args()
+
+    digests = sample_digests(args.ipos, args.digests, args.recipients, random.Random(42))
+    alerts = alerts_from_digests(digests)
+
+    smtp = StubSMTPServer(port=SMTP_STUB_PORT).start()
+    hooks = StubWebhookServer(latency=args.latency, throttle_first=args.throttle).start()
+    try:
+        start = time.perf_counter()
+        send_sequential(digests, hooks.url)
+        sequential_time = time.perf_counter() - start
+
+        smtp.messages.clear()
+        hooks.requests.clear()
+        hooks.throttle_first = args.throttle
+        hooks.max_in_flight = 0
+        channels = [
+            EmailChannel(),
+            SlackChannel(f"{hooks.url}/slack"),
+            TelegramChannel("x", "1", api_url=f"{hooks.url}/telegram"),
+            WebhookChannel(f"{hooks.url}/hook"),
+        ]
+        start = time.perf_counter()
+        results = notify(digests, channels)
+        dispatched_time = time.perf_counter() - start
+    finally:
+        smtp.stop()
+        hooks.stop()
+
+    expected = sorted(alert.ipo.name for alert in alerts)
+    slack = sorted(line[2:].split(":")[0] for body in hooks.bodies("/slack")
+                   for line in body["text"].splitlines()[1:])
+    telegram = sorted(line.split(":")[0] for body in hooks.bodies("/telegram")
+                      for line in body["text"].splitlines()[1:])
+    webhook = sorted(alert["name"] for body in hooks.bodies("/hook") for alert in body["alerts"])
+
+    print(f"Digests: {args.digests} x {args.recipients} recipients, alerts: {len(alerts)}, "
+          f"webhook latency {args.latency * 1000:.0f} ms, {args.throttle} throttled")
+    print(f"  sequential : {sequential_time:7.2f} s")
+    print(f"  dispatched : {dispatched_time:7.2f} s ({len(hooks.requests)} webhook requests, "
+          f"at most {hooks.max_in_flight} at once)")
+    print(f"  digests sent: {results}")
+    print(f"  emails delivered: {len(smtp.delivered_to())} (expected {args.digests * args.recipients})")
+    print(f"  every alert once: slack {slack == expected}, telegram {telegram == expected}, "
+          f"webhook {webhook == expected}")
+
+
+if __name__ == "__main__":
+    main()
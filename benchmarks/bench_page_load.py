@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time-to-table and bytes transferred with and without resource blocking.
+
+Builds a local mirror of the report page (JS-filled table plus images,
+fonts, CSS, analytics and ad scripts), then loads it with a plain driver
+and with the CDP-blocking driver. Requires Chrome.
+
+    python -m benchmarks.bench_page_load --rows 40 --repeat 3
+"""
+
+import argparse
+import tempfile
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from fixture_server import build_report_mirror, start_fixture_server
+from scraper import create_driver, page_bytes_transferred, read_rows_with_script, wait_for_table
+
+
+def measure(url, block_resources, repeat):
+    """
+    Load url repeat times in a fresh driver.
+
+    Returns:
+        tuple: (best time-to-table in seconds, bytes transferred, row count)
+    """
+    driver = create_driver(block_resources=block_resources)
+    try:
+        # Disable the HTTP cache so every repeat pays for the full transfer
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+
+        best = None
+        transferred = 0
+        rows = []
+        for _ in range(repeat):
+            previous = driver.find_element(By.TAG_NAME, "html")
+            start = time.perf_counter()
+            driver.get(url)
+            # With blocking, get() returns before the new document replaces the last repeat's table
+            WebDriverWait(driver, 30).until(EC.staleness_of(previous))
+            wait_for_table(driver)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            transferred = page_bytes_transferred(driver)
+            rows = read_rows_with_script(driver)
+        return best, transferred, len(rows)
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        page = build_report_mirror(directory, args.rows)
+        server, base_url = start_fixture_server(directory)
+        try:
+            url = f"{base_url}/{page}"
+            before = measure(url, block_resources=False, repeat=args.repeat)
+            after = measure(url, block_resources=True, repeat=args.repeat)
+        finally:
+            server.shutdown()
+
+    print(f"{'':10} {'time-to-table':>14} {'bytes':>12} {'rows':>6}")
+    for label, (elapsed, transferred, rows) in (("before", before), ("after", after)):
+        print(f"{label:10} {elapsed * 1000:11.0f} ms {transferred:12,d} {rows:6d}")
+    print(f"Bytes saved: {before[1] - after[1]:,d} ({1 - after[1] / max(before[1], 1):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled, cached card templates vs. the old f-string renderer.
+
+Renders --cards IPO cards with both implementations, cold (every card
+distinct) and warm (the same digest rendered again, as when many digests
+share cards).
+
+    python -m benchmarks.bench_render --cards 10000
+"""
+
+import argparse
+import re
+import time
+from datetime import date, datetime
+
+from emailer import create_email_html
+from models import IpoBatch, IpoRecord
+from templates import render_card
+
+
+def legacy_create_email_html(ipo_data):
+    """
+    The f-string renderer create_email_html replaced, kept for comparison.
+
+    Args:
+        ipo_data (list): List of IPO data
+
+    Returns:
+        str: HTML email content
+    """
+    if not ipo_data:
+        return None
+
+    ipo_cards = "".join(
+        f"""
+        <div class="ipo-card" style="margin-bottom: 20px; border: 1px solid #e0e0e0; border-radius: 12px; padding: 20px; background-color: white; box-sizing: border-box;">
+            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 16px; flex-wrap: wrap; gap: 16px;">
+                <div style="flex: 1; min-width: 280px; box-sizing: border-box;">
+                    <div style="display: flex; align-items: flex-start; margin-bottom: 12px; flex-wrap: wrap; gap: 8px;">
+                        <h3 style="margin: 0; color: #1a237e; font-size: 16px; font-weight: 600; line-height: 1.3; word-break: break-word;">{ipo[0]}</h3>
+                        {"<span style='background-color: #ff9800; color: white; padding: 3px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; white-space: nowrap;'>CT</span>" if ipo[1] == "CT" else "<span style='background-color: #4caf50; color: white; padding: 3px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; white-space: nowrap;'>O</span>" if ipo[1] == "O" else ""}
+                    </div>
+                    <div style="margin-bottom: 12px;">
+                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Est. Gains (GMP %)</div>
+                        <div style="color: {'#2e7d32' if '%' in ipo[2] and float(ipo[2].replace(' %', '')) > 0 else '#c62828' if '%' in ipo[2] and float(ipo[2].replace(' %', '')) < 0 else '#666'}; font-size: 15px; font-weight: 600; word-break: break-all;">{ipo[2]}</div>
+                    </div>
+                    <div>
+                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Rating</div>
+                        <div style="background-color: #fff3e0; color: #e65100; padding: 5px 10px; border-radius: 6px; display: inline-block; font-weight: 500; font-size: 13px;">{ipo[4]}</div>
+                    </div>
+                </div>
+
+                <div style="flex: 1; min-width: 200px; box-sizing: border-box;">
+                    <div style="margin-bottom: 12px;">
+                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Close Date</div>
+                        <div style="color: #333; font-size: 14px; font-weight: 500;">{ipo[3]}</div>
+                    </div>
+                    <div style="margin-top: 8px;">
+                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Days Remaining</div>
+                        <div style="color: #1565c0; font-size: 14px; font-weight: 500;">{(datetime.strptime(f"{ipo[3]}-{datetime.now().year}", '%d-%b-%Y') - datetime.now()).days} days</div>
+                    </div>
+                </div>
+            </div>
+        </div>
+        """
+        for ipo in ipo_data
+    )
+
+    return f"""
+    <html>
+        <head>
+            <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
+            <style>
+                @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap');
+            </style>
+        </head>
+        <body style="font-family: 'Inter', Arial, sans-serif; margin: 0; padding: 8px; background-color: #f5f5f5; -webkit-font-smoothing: antialiased; word-wrap: break-word;">
+            <div style="max-width: 100%; margin: 0 auto; background-color: white; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.05); padding: 20px; box-sizing: border-box;">
+                <div style="margin-bottom: 20px; padding-bottom: 16px; border-bottom: 2px solid #f0f0f0;">
+                    <h1 style="color: #1a237e; font-size: 20px; margin: 0; font-weight: 600; line-height: 1.3;">
+                        🎯 IPO Alerts
+                    </h1>
+                    <p style="color: #666; font-size: 14px; margin: 8px 0 0 0;">
+                        {datetime.now().strftime('%d %B %Y')}
+                    </p>
+                </div>
+
+                <p style="color: #424242; font-size: 15px; margin: 0 0 20px 0; line-height: 1.5;">
+                    Here are the open IPOs that match your alert settings:
+                </p>
+
+                <div style="margin-bottom: 20px;">
+                    {ipo_cards}
+                </div>
+
+                <div style="background-color: #f8f9fa; border-radius: 8px; padding: 16px; margin-top: 20px;">
+                    <p style="color: #666; font-size: 13px; margin: 0; line-height: 1.4;">
+                        ℹ️ <strong>Status Labels:</strong> <span style="background-color: #4caf50; color: white; padding: 2px 6px; border-radius: 3px; font-size: 9px; font-weight: 600;">O</span> = Open, <span style="background-color: #ff9800; color: white; padding: 2px 6px; border-radius: 3px; font-size: 9px; font-weight: 600;">CT</span> = Closes Today
+                    </p>
+                    <p style="color: #666; font-size: 13px; margin: 8px 0 0 0; line-height: 1.4;">
+                        Only showing IPOs that match your filter profile
+                    </p>
+                </div>
+
+                <div style="margin-top: 20px; padding-top: 16px; border-top: 1px solid #f0f0f0; color: #666; font-size: 12px;">
+                    <p style="margin: 0; line-height: 1.4;">To unsubscribe from these alerts, please contact the administrator.</p>
+                </div>
+            </div>
+        </body>
+    </html>
+    """
+
+
+def make_ipos(count):
+    statuses = ["O", "CT", ""]
+    return IpoBatch(
+        IpoRecord.from_cells(f"Benchmark {i} IPO", statuses[i % 3], f"₹10 ({(i % 80) - 10}.5%)",
+                             "🔥" * (4 + i % 2), f"{(i % 28) + 1:02d}-Dec")
+        for i in range(count)
+    )
+
+
+def as_legacy_rows(ipos):
+    return [[r.name, r.closing_status, r.est_gains, r.close_date_text, r.rating] for r in ipos]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10000)
+    args = parser.parse_args()
+
+    ipos = make_ipos(args.cards)
+    render_card.cache_clear()
+
+    legacy_time, legacy_html = timed(legacy_create_email_html, as_legacy_rows(ipos))
+    cold_time, html = timed(create_email_html, ipos)
+    warm_time, _ = timed(create_email_html, ipos)
+    today = date.today()
+    cards_time, _ = timed(lambda: [render_card(ipo, today) for ipo in ipos])
+
+    # The old renderer counted from the current time of day, so it is one day lower
+    days = re.compile(r">(-?\d+) days<")
+    identical = days.sub("", legacy_html) == days.sub("", html)
+
+    print(f"Cards: {args.cards}")
+    print(f"  legacy f-string : {legacy_time * 1000:8.1f} ms")
+    print(f"  compiled (cold) : {cold_time * 1000:8.1f} ms ({legacy_time / cold_time:5.1f}x)")
+    print(f"  compiled (warm) : {warm_time * 1000:8.1f} ms ({legacy_time / warm_time:5.1f}x)")
+    print(f"  cards only (warm): {cards_time * 1000:8.1f} ms (page assembly excluded)")
+    print(f"  identical output (ignoring Days Remaining): {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Scenario run: report fetching against a flaky local fixture server.
+
+Each scenario injects faults into fixture_server.py and calls
+scraper.fetch_report() with short retry, hedge and breaker settings.
+The browser path is replaced by a stand-in that either fails at once or
+stalls, so the run behaves the same with or without Chrome installed.
+
+    python -m benchmarks.bench_resilience
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+# Short delays so the scenarios finish in seconds; set before scraper reads them
+os.environ.update(IPO_CACHE_DIR=tempfile.mkdtemp(prefix="ipo-resilience-"), IPO_RETRY_ATTEMPTS="4",
+                  IPO_RETRY_BASE_DELAY="0.2", IPO_RETRY_MAX_DELAY="1", IPO_HEDGE_AFTER="0.5",
+                  IPO_BREAKER_THRESHOLD="4", IPO_BREAKER_COOLDOWN="60")
+
+import metrics
+import resilience
+import scraper
+from fixture_server import REPORT_PATH, Faults, start_fixture_server
+
+
+def failing_browser(url, extraction_mode=None, session=None):
+    raise RuntimeError("Page load timeout: browser unavailable")
+
+
+def stalled_browser(url, extraction_mode=None, session=None):
+    time.sleep(3)
+    raise RuntimeError("Table loading timeout")
+
+
+def run_scenario(name, faults, browser, timeout=10, calls=1):
+    """
+    Returns:
+        bool: True if the scenario behaved as expected (checked by the caller)
+    """
+    resilience._breakers.clear()
+    if os.path.exists(resilience.BREAKER_FILE):
+        os.remove(resilience.BREAKER_FILE)
+    metrics.reset()
+    scraper.fetch_rows_selenium = browser
+
+    server, base_url = start_fixture_server(faults=faults)
+    outcomes = []
+    start = time.perf_counter()
+    try:
+        for _ in range(calls):
+            try:
+                report = scraper.fetch_report(base_url + REPORT_PATH, timeout=timeout)
+                outcomes.append(f"{len(report['rows'])} rows")
+            except Exception as e:
+                outcomes.append(type(e).__name__)
+    finally:
+        server.shutdown()
+    elapsed = time.perf_counter() - start
+
+    counters = metrics.snapshot()["counters"]
+    print(f"{name:18} {elapsed:5.2f}s  requests {faults.requests:2d} (failed {faults.failures:2d})  "
+          f"retries {counters.get('retries', 0)}  hedged {counters.get('hedged_requests', 0)}/"
+          f"won {counters.get('hedge_wins', 0)}  -> {', '.join(outcomes)}")
+    return outcomes, faults, counters, elapsed
+
+
+def main():
+    checks = []
+
+    outcomes, faults, counters, _ = run_scenario("transient blip", Faults(fail_first=2), failing_browser)
+    checks.append(("blip recovered after two retries", outcomes == ["6 rows"] and counters.get("retries") == 2))
+
+    outcomes, faults, counters, elapsed = run_scenario("stalled browser", Faults(fail_first=1), stalled_browser)
+    checks.append(("hedged HTTP beat the stalled browser",
+                   outcomes == ["6 rows"] and counters.get("hedge_wins") == 1 and elapsed < 2))
+
+    outcomes, faults, counters, elapsed = run_scenario("outage", Faults(fail_rate=1.0), failing_browser, calls=3)
+    checks.append(("breaker opened and stopped requests",
+                   outcomes[-1] == "CircuitOpenError" and faults.requests == 4))
+
+    outcomes, faults, counters, elapsed = run_scenario("budget", Faults(fail_rate=1.0, delay=0.3),
+                                                       failing_browser, timeout=1)
+    checks.append(("retries stopped within the time budget", outcomes == ["RuntimeError"] and elapsed < 1.5))
+
+    shutil.rmtree(os.environ["IPO_CACHE_DIR"], ignore_errors=True)
+
+    print()
+    for description, passed in checks:
+        print(f"{'PASS' if passed else 'FAIL'} {description}")
+    if not all(passed for _, passed in checks):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
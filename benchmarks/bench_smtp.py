@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential per-recipient MIME vs. pooled delivery of one payload.
+
+Runs against the local stand-in SMTP server (smtp_stub.py) with a small
+per-message latency, then checks that every recipient got exactly one
+identical message, that flaky recipients were retried and that rejected
+ones were reported.
+
+    python -m benchmarks.bench_smtp --recipients 500 --latency 0.005
+"""
+
+import argparse
+import smtplib
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from emailer import SMTPPool, build_message, create_email_html, deliver
+from models import IpoBatch, IpoRecord
+from smtp_stub import StubSMTPServer
+
+
+SENDER = "alerts@example.com"
+SUBJECT = "IPO Alerts - benchmark"
+SAMPLE_DATA = IpoBatch([IpoRecord.from_cells("Test IPO", "O", "₹51 (25.5%)", "🔥🔥🔥🔥", "13-Oct")] * 10)
+
+
+def send_sequential(port, recipients, html_content):
+    """The old delivery loop: one connection, a fresh MIME message per recipient."""
+    with smtplib.SMTP("127.0.0.1", port) as server:
+        server.login(SENDER, "password")
+        for recipient in recipients:
+            msg_copy = MIMEMultipart()
+            msg_copy['From'] = SENDER
+            msg_copy['To'] = SENDER
+            msg_copy['Subject'] = SUBJECT
+            msg_copy['Bcc'] = recipient
+            msg_copy.attach(MIMEText(html_content, 'html'))
+            server.send_message(msg_copy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recipients", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.005, help="Stub seconds per message")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    recipients = [f"user{i}@example.com" for i in range(args.recipients)]
+    html_content = create_email_html(SAMPLE_DATA)
+
+    stub = StubSMTPServer(latency=args.latency).start()
+    try:
+        start = time.perf_counter()
+        send_sequential(stub.port, recipients, html_content)
+        sequential_time = time.perf_counter() - start
+
+        stub.messages.clear()
+        stub.reject = {recipients[0]}
+        stub.flaky = {recipients[1], recipients[2]}
+
+        start = time.perf_counter()
+        payload = build_message(SENDER, SUBJECT, html_content)
+        pool = SMTPPool(SENDER, "password", host="127.0.0.1", port=stub.port, use_ssl=False, size=args.workers)
+        try:
+            failed = deliver(pool, recipients, payload, workers=args.workers, rate_limit=0,
+                             retry_delay=0.05)
+        finally:
+            pool.close()
+        pooled_time = time.perf_counter() - start
+    finally:
+        stub.stop()
+
+    delivered = stub.delivered_to()
+    expected = set(recipients) - {recipients[0]}
+    print(f"Recipients: {len(recipients)}, stub latency {args.latency * 1000:.0f} ms/message")
+    print(f"  sequential  : {sequential_time:7.2f} s ({len(recipients) / sequential_time:7.1f} msg/s)")
+    print(f"  pooled (x{args.workers}) : {pooled_time:7.2f} s ({len(recipients) / pooled_time:7.1f} msg/s)")
+    print(f"  each recipient exactly once: {sorted(delivered) == sorted(expected)}")
+    print(f"  identical payloads: {len({data for _, _, data in stub.messages}) == 1}")
+    print(f"  reported failures: {sorted(failed)}")
+
+
+if __name__ == "__main__":
+    main()
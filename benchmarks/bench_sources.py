@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: merging --ipos IPOs reported by two sites with different spellings.
+
+The second site names every IPO the way other GMP sites do ("Ltd",
+"Limited", upper case, no "IPO"), and every tenth with a typo. Times
+merge_report_rows() and checks that each IPO came out as one record
+carrying both sites' GMP.
+
+    python -m benchmarks.bench_sources --ipos 5000
+"""
+
+import argparse
+import random
+import time
+
+import metrics
+from scraper import merge_report_rows
+from sources import InvestorGainAdapter, TableAdapter
+
+
+SYLLABLES = ("sh", "ree", "ji", "vik", "ran", "ork", "la", "sa", "fe", "cu", "ris", "tex", "fab",
+             "ga", "me", "pi", "ne", "lo", "tus", "ar", "ka", "de", "ma", "ni", "su", "ra")
+SUFFIXES = (" Ltd.", " Limited", "", " (SME)")
+
+
+def sample_names(count, rng):
+    def word():
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+    names = set()
+    while len(names) < count:
+        names.add(" ".join(word() for _ in range(rng.randint(2, 3))))
+    return sorted(names)
+
+
+def respell(name, i):
+    """How another site might write name; every tenth one with a letter missing."""
+    if i % 10 == 0:
+        first, rest = name.split(" ", 1)
+        name = f"{first[:-1]} {rest}"
+    return (name.upper() if i % 3 == 0 else name) + SUFFIXES[i % len(SUFFIXES)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ipos", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    names = sample_names(args.ipos, rng)
+    sources = {
+        "open": InvestorGainAdapter("open", "https://www.investorgain.com/report/live-ipo-gmp/331/open/"),
+        "other": TableAdapter("other", "https://gmp.example.com/", "tr", {"name": 0, "gmp": 1}),
+    }
+    reports = {
+        "open": {"rows": [(f"{name} IPO O", f"₹10 ({rng.uniform(-5, 60):.2f}%)", "🔥🔥🔥🔥", "07-Nov", "")
+                          for name in names]},
+        "other": {"rows": [(respell(name, i), f"({rng.uniform(-5, 60):.2f}%)", "", "07-Nov", "")
+                           for i, name in enumerate(names)]},
+    }
+
+    metrics.reset()
+    start = time.perf_counter()
+    merged = merge_report_rows(reports, sources)
+    elapsed = time.perf_counter() - start
+
+    both = sum(1 for ipo in merged if len(ipo.source_gmps) == 2)
+    print(f"IPOs: {args.ipos} on 2 sites ({2 * args.ipos} rows)")
+    print(f"  merge          : {elapsed * 1000:8.1f} ms")
+    print(f"  fuzzy matches  : {metrics.snapshot()['counters'].get('fuzzy_name_matches', 0)}")
+    print(f"  merged records : {len(merged)} (expected {args.ipos})")
+    print(f"  with both GMPs : {both}")
+
+
+if __name__ == "__main__":
+    main()
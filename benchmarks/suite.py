@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: extract, parse, filter, render and send throughput at
+synthetic scale, compared against a stored baseline.
+
+Every stage runs offline. Report pages are built from a saved page (the
+fixture, or --page, e.g. a page captured with 'cli.py scrape --record')
+scaled to each row count, and delivery goes to the local stub SMTP server.
+
+  extract  BeautifulSoup extraction of the scaled page. Skipped above
+           --max-extract-rows, since building and parsing a 100k-row page
+           takes minutes.
+  parse    parse_ipo_row() over every raw row into an IpoBatch
+  filter   the default high-rated filter, a GMP sort and a few profiles
+  render   create_email_html() for the high-rated IPOs, card cache cold
+  send     one 20-IPO digest to min(rows, --max-recipients) recipients
+
+Each stage reports the best of --repeat runs. Results are compared with
+benchmarks/baseline.json and the suite exits 1 if any stage is more than
+--tolerance times slower; --save-baseline rewrites the baseline instead.
+Baselines are machine-specific, so save one before comparing changes.
+
+    python -m benchmarks.suite --scales 10 1000 100000
+    python -m benchmarks.suite --save-baseline
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import date
+
+from emailer import SMTPPool, build_message, create_email_html, deliver
+from fixture_server import FIXTURES_DIR, REPORT_PATH, build_report_page
+from models import IpoBatch
+from scraper import extract_rows_from_html, parse_ipo_row
+from smtp_stub import StubSMTPServer
+from subscriptions import FilterProfile
+from templates import render_card
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+STAGES = ("extract", "parse", "filter", "render", "send")
+SENDER = "alerts@example.com"
+PROFILES = (FilterProfile(), FilterProfile(min_rating=3.0, min_gmp=20.0),
+            FilterProfile(min_rating=None, exclude_sme=True))
+# Stages this quick are timer noise, not regressions
+NOISE_FLOOR = 0.005
+
+
+def best_of(repeat, func):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def scale_rows(template_rows, count):
+    """count raw rows cycled from template_rows, each with a distinct name."""
+    rows = []
+    for i in range(count):
+        name, *rest = template_rows[i % len(template_rows)]
+        rows.append((re.sub(r" IPO\b", f" {i} IPO", name, count=1), *rest))
+    return rows
+
+
+def filter_all(ipos):
+    high_rated = ipos.high_rated().sort_by_gmp()
+    for profile in PROFILES:
+        profile.apply(ipos)
+    return high_rated
+
+
+def render(ipos):
+    render_card.cache_clear()
+    return create_email_html(ipos)
+
+
+def send(port, recipients, payload):
+    pool = SMTPPool(SENDER, "password", host="127.0.0.1", port=port, use_ssl=False)
+    try:
+        failed = deliver(pool, recipients, payload, rate_limit=0, retry_delay=0.05)
+    finally:
+        pool.close()
+    if failed:
+        raise RuntimeError(f"{len(failed)} deliveries failed")
+
+
+def run_scale(rows, args, template_rows, stub):
+    """
+    Returns:
+        dict: {stage: (seconds, items)}; skipped stages are left out
+    """
+    results = {}
+    if rows <= args.max_extract_rows:
+        page = build_report_page(rows, args.page).encode("utf-8")
+        seconds, raw_rows = best_of(args.repeat, lambda: extract_rows_from_html(page))
+        results["extract"] = (seconds, len(raw_rows))
+    raw_rows = scale_rows(template_rows, rows)
+
+    today = date.today()
+    seconds, ipos = best_of(args.repeat, lambda: IpoBatch(parse_ipo_row(row, today) for row in raw_rows))
+    results["parse"] = (seconds, rows)
+
+    seconds, high_rated = best_of(args.repeat, lambda: filter_all(ipos))
+    results["filter"] = (seconds, rows)
+
+    seconds, _ = best_of(args.repeat, lambda: render(high_rated))
+    results["render"] = (seconds, len(high_rated))
+
+    digest = high_rated.take(range(min(20, len(high_rated))))
+    payload = build_message(SENDER, "IPO Alerts - benchmark", create_email_html(digest))
+    recipients = [f"user{i}@example.com" for i in range(min(rows, args.max_recipients))]
+    seconds, _ = best_of(args.repeat, lambda: send(stub.port, recipients, payload))
+    results["send"] = (seconds, len(recipients))
+    return results
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--page", help="Report page to build rows from (default: the fixture)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-extract-rows", type=int, default=5000)
+    parser.add_argument("--max-recipients", type=int, default=1000)
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Slowdown over the baseline that counts as a regression")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.page or os.path.join(FIXTURES_DIR, REPORT_PATH.lstrip("/")), "rb") as f:
+        template_rows = extract_rows_from_html(f.read())
+    baseline = load_baseline()
+    current = {}
+    regressions = []
+
+    stub = StubSMTPServer().start()
+    try:
+        for rows in args.scales:
+            results = run_scale(rows, args, template_rows, stub)
+            current[str(rows)] = {stage: round(seconds, 5) for stage, (seconds, _) in results.items()}
+            print(f"{rows} rows")
+            for stage in STAGES:
+                if stage not in results:
+                    print(f"  {stage:<7} skipped")
+                    continue
+                seconds, items = results[stage]
+                line = f"  {stage:<7} {seconds * 1000:10.1f} ms {items / seconds:12.0f} items/s"
+                previous = baseline.get(str(rows), {}).get(stage)
+                if previous:
+                    ratio = seconds / previous
+                    line += f"   x{ratio:.2f} vs baseline"
+                    if ratio > args.tolerance and seconds > NOISE_FLOOR:
+                        line += "  REGRESSION"
+                        regressions.append(f"{stage} @ {rows} rows")
+                print(line)
+    finally:
+        stub.stop()
+
+    if args.save_baseline:
+        baseline.update(current)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {BASELINE_FILE}")
+        return 0
+    if regressions:
+        print(f"Regressions over x{args.tolerance}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
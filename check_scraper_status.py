@@ -2,25 +2,53 @@
 """
 Status check script for GitHub Actions.
 Reads scraper_status.json and outputs appropriate GitHub Actions annotations.
+Also streams the append-only scraper_status_log.jsonl to report success
+rate, run-duration p50/p95 and IPO-count trends, and to flag performance
+regressions against the previous window.
 Exits with error code if status indicates failure.
 """
 
+import argparse
 import json
+import math
+import random
 import sys
 import os
 from datetime import datetime, timedelta
 
 
+# Seconds each phase may take before the run is flagged (see metrics.py for
+# phase names). Override one with e.g. PHASE_BUDGET_SMTP=120.
+PHASE_BUDGETS = {
+    "total": 240,
+    "scrape": 150,
+    "http_fetch": 20,
+    "chrome_startup": 20,
+    "page_load": 60,
+    "wait_table": 30,
+    "wait_rows": 30,
+    "extract": 5,
+    "parse": 2,
+    "export": 10,
+    "enrich": 30,
+    "render": 2,
+    "smtp": 60,
+}
+
+
+STATUS_FILE = os.getenv("IPO_STATUS_FILE", "scraper_status.json")
+
+
 def load_status():
     """Load scraper status from file."""
     try:
-        with open("scraper_status.json", "r") as f:
+        with open(STATUS_FILE, "r") as f:
             return json.load(f)
     except FileNotFoundError:
-        print("::error file=check_scraper_status.py::scraper_status.json not found - scraper may have failed to run")
+        print(f"::error file=check_scraper_status.py::{STATUS_FILE} not found - scraper may have failed to run")
         return None
     except json.JSONDecodeError as e:
-        print(f"::error file=check_scraper_status.py::Invalid JSON in scraper_status.json: {e}")
+        print(f"::error file=check_scraper_status.py::Invalid JSON in {STATUS_FILE}: {e}")
         return None
 
 
@@ -33,7 +61,178 @@ def check_status_stale(status_data):
         return True
 
 
-def main():
+STATUS_LOG_FILE = os.getenv("IPO_STATUS_LOG", "scraper_status_log.jsonl")
+HEALTHY_STATUSES = ("success", "unchanged", "warning")
+RESERVOIR_SIZE = 1024
+
+
+class Reservoir:
+    """
+    Fixed-size uniform sample of a stream (Algorithm R), for quantiles in
+    bounded memory however long the log grows.
+    """
+
+    def __init__(self, size=RESERVOIR_SIZE, seed=0):
+        self.size = size
+        self.count = 0
+        self.samples = []
+        self.random = random.Random(seed)
+
+    def add(self, value):
+        self.count += 1
+        if len(self.samples) < self.size:
+            self.samples.append(value)
+        else:
+            slot = self.random.randrange(self.count)
+            if slot < self.size:
+                self.samples[slot] = value
+
+    def quantile(self, q):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class WindowStats:
+    """Streaming summary of the runs in one time window."""
+
+    def __init__(self):
+        self.runs = 0
+        self.healthy = 0
+        self.durations = Reservoir()
+        self.ipo_total = 0
+
+    def add(self, record):
+        self.runs += 1
+        if record.get("status") in HEALTHY_STATUSES:
+            self.healthy += 1
+        duration = record.get("duration_seconds")
+        if isinstance(duration, (int, float)):
+            self.durations.add(duration)
+        self.ipo_total += record.get("ipo_count", 0) or 0
+
+    @property
+    def success_rate(self):
+        return self.healthy / self.runs if self.runs else None
+
+    @property
+    def mean_ipo_count(self):
+        return self.ipo_total / self.runs if self.runs else None
+
+
+def iter_status_log(path):
+    """Yield status records from the JSONL log one line at a time."""
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def summarize_status_log(path, window_days, now=None):
+    """
+    Stream the log once into stats for the current and the previous window.
+
+    Returns:
+        tuple: (current WindowStats, previous WindowStats)
+    """
+    now = now or datetime.now()
+    current_start = now - timedelta(days=window_days)
+    previous_start = current_start - timedelta(days=window_days)
+    current, previous = WindowStats(), WindowStats()
+
+    for record in iter_status_log(path):
+        try:
+            timestamp = datetime.fromisoformat(record["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if timestamp >= current_start:
+            current.add(record)
+        elif timestamp >= previous_start:
+            previous.add(record)
+    return current, previous
+
+
+def format_seconds(value):
+    return f"{value:.1f}s" if value is not None else "n/a"
+
+
+def check_trends(path, window_days, regression_factor, min_success_rate, min_runs):
+    """Print rolling statistics and warn about failures or slowdowns."""
+    current, previous = summarize_status_log(path, window_days)
+    if not current.runs:
+        print(f"No runs logged in the last {window_days:g} days ({path})")
+        return
+
+    print(f"Last {window_days:g} days: {current.runs} runs, "
+          f"success rate {current.success_rate:.0%}, "
+          f"duration p50 {format_seconds(current.durations.quantile(0.5))} "
+          f"p95 {format_seconds(current.durations.quantile(0.95))}, "
+          f"avg IPOs {current.mean_ipo_count:.1f}")
+    if previous.runs:
+        print(f"Previous {window_days:g} days: {previous.runs} runs, "
+              f"success rate {previous.success_rate:.0%}, "
+              f"duration p50 {format_seconds(previous.durations.quantile(0.5))} "
+              f"p95 {format_seconds(previous.durations.quantile(0.95))}, "
+              f"avg IPOs {previous.mean_ipo_count:.1f}")
+
+    if current.runs >= min_runs and current.success_rate < min_success_rate:
+        print(f"::warning file=scraper.py,title=Low success rate::"
+              f"{current.success_rate:.0%} of runs healthy in the last {window_days:g} days")
+
+    current_p95 = current.durations.quantile(0.95)
+    previous_p95 = previous.durations.quantile(0.95)
+    if (current_p95 is not None and previous_p95 and current.durations.count >= min_runs
+            and previous.durations.count >= min_runs and current_p95 > regression_factor * previous_p95):
+        print(f"::warning file=scraper.py,title=Performance regression::"
+              f"run duration p95 {format_seconds(current_p95)} vs {format_seconds(previous_p95)} "
+              f"in the previous {window_days:g} days ({current_p95 / previous_p95:.1f}x)")
+
+    if previous.runs and previous.mean_ipo_count and current.mean_ipo_count == 0:
+        print(f"::warning file=scraper.py,title=IPO count dropped::no IPOs found in the last "
+              f"{window_days:g} days (previously {previous.mean_ipo_count:.1f} per run)")
+
+
+def get_phase_budget(phase):
+    override = os.getenv(f"PHASE_BUDGET_{phase.upper()}")
+    return float(override) if override else PHASE_BUDGETS.get(phase)
+
+
+def check_phase_budgets(status_data):
+    """Print a phase breakdown and warn about phases over budget."""
+    phases = status_data.get("phases", {})
+    counters = status_data.get("counters", {})
+    if phases:
+        print("Phase timings:")
+    for phase, seconds in sorted(phases.items(), key=lambda item: -item[1]):
+        budget = get_phase_budget(phase)
+        print(f"  {phase:16} {seconds:8.2f}s" + (f"  (budget {budget:g}s)" if budget else ""))
+        if budget and seconds > budget:
+            print(f"::warning file=scraper.py,title=Slow phase::{phase} took {seconds:.1f}s (budget {budget:g}s)")
+    if counters:
+        print("Counters: " + ", ".join(f"{name}={value}" for name, value in sorted(counters.items())))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check scraper health for GitHub Actions")
+    parser.add_argument("--log", default=STATUS_LOG_FILE, help="JSONL status log to summarise")
+    parser.add_argument("--window-days", type=float, default=float(os.getenv("STATUS_WINDOW_DAYS", "7")),
+                        help="Length of the rolling window compared against the one before it")
+    parser.add_argument("--regression-factor", type=float, default=2.0,
+                        help="Flag when duration p95 grows by more than this factor")
+    parser.add_argument("--min-success-rate", type=float, default=0.8)
+    parser.add_argument("--min-runs", type=int, default=5,
+                        help="Runs a window needs before its rates and quantiles are judged")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     status_data = load_status()
 
     if not status_data:
@@ -51,6 +250,9 @@ def main():
     print(f"Message: {message}")
     print(f"Workflow Run ID: {workflow_run_id}")
 
+    check_phase_budgets(status_data)
+    check_trends(args.log, args.window_days, args.regression_factor, args.min_success_rate, args.min_runs)
+
     # Check if data is stale
     if check_status_stale(status_data):
         print("::warning::Scraper status data is stale (older than 24 hours)")
@@ -75,6 +277,10 @@ def main():
         print(f"::notice::Scraper completed successfully with {ipo_count} IPOs found")
         sys.exit(0)
 
+    elif status == "unchanged":
+        print(f"::notice::Report table unchanged since last run ({ipo_count} IPOs already sent)")
+        sys.exit(0)
+
     else:
         print(f"::error file=scraper.py::Unknown status: {status}")
         sys.exit(1)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+IPO Scraper command line
+
+One entry point for the bot's jobs. Each subcommand imports only what it
+needs, so status checks and previews start without loading Selenium,
+BeautifulSoup or requests.
+
+    python cli.py scrape [--no-send] [--record DIR]  # scrape, cache the digests and email them
+    python cli.py replay DIR [--no-send]  # rerun offline against a recording
+    python cli.py send                 # re-send the last cached digests
+    python cli.py preview [-o FILE]    # render a cached digest to HTML
+    python cli.py status [--min-runs N ...]  # check_scraper_status.py checks
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+
+
+def debug_print(message):
+    print(f"[CLI] {message}")
+
+
+def load_cached_digests():
+    """
+    Returns:
+        (list, dict) or (None, None): Cached emailer.Digests and the raw cache
+    """
+    from emailer import Digest
+    from models import IpoBatch, IpoRecord
+    from snapshot_cache import DIGEST_FILE, load_digests
+
+    cache = load_digests()
+    if cache is None:
+        debug_print(f"No cached digests at {DIGEST_FILE}; run 'cli.py scrape' first")
+        return None, None
+    digests = [
+        Digest(IpoBatch(IpoRecord.from_dict(ipo) for ipo in digest["ipos"]),
+               digest["changes"], digest["recipients"], digest["profiles"])
+        for digest in cache["digests"]
+    ]
+    debug_print(f"Loaded {len(digests)} digests cached at {cache['saved']}")
+    return digests, cache
+
+
+def cmd_scrape(args):
+    if args.record:
+        # Read by recorder when scraper and emailer import it below
+        os.environ["IPO_RECORD_DIR"] = args.record
+    from main import main, setup_environment
+
+    setup_environment()
+    main(send=not args.no_send)
+    return 0
+
+
+def cmd_send(args):
+    from main import setup_environment
+
+    setup_environment()
+    digests, cache = load_cached_digests()
+    if digests is None:
+        return 1
+
+    from alert_diff import record_sent
+    from notifications import notify
+    from snapshot_cache import mark_delivered
+
+    results = notify(digests)
+    for digest, sent in zip(digests, results):
+        if sent:
+            record_sent(digest.ipos, digest.profiles)
+    if not all(results):
+        return 1
+    # Only settles the table if no newer scrape has been recorded since
+    mark_delivered(len({ipo.name for digest in digests for ipo in digest.ipos}),
+                   table_hash=cache["table_hash"])
+    return 0
+
+
+def cmd_preview(args):
+    if args.output == "-":
+        # Log lines (ours and every module's) go to stderr, keeping stdout pure HTML
+        with contextlib.redirect_stdout(sys.stderr):
+            html = render_preview(args.index)
+        if html is None:
+            return 1
+        sys.stdout.reconfigure(encoding="utf-8")
+        sys.stdout.write(html)
+        return 0
+
+    html = render_preview(args.index)
+    if html is None:
+        return 1
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(html)
+    debug_print(f"Wrote digest #{args.index} ({len(html)} characters) to {args.output}")
+    return 0
+
+
+def render_preview(index):
+    """HTML of cached digest #index, or None if there is none."""
+    digests, _ = load_cached_digests()
+    if digests is None:
+        return None
+    if not 0 <= index < len(digests):
+        debug_print(f"No digest #{index}; the cache holds {len(digests)}")
+        return None
+    for i, digest in enumerate(digests):
+        debug_print(f"#{i}: {len(digest.ipos)} IPOs for {len(digest.recipients)} recipients "
+                    f"({'; '.join(digest.profiles)})")
+
+    from emailer import create_email_html
+
+    digest = digests[index]
+    return create_email_html(digest.ipos, digest.changes)
+
+
+def cmd_replay(args):
+    from main import setup_environment
+
+    setup_environment()
+    from recorder import replay
+
+    return 0 if replay(args.directory, send=not args.no_send) else 1
+
+
+def cmd_status(args):
+    import check_scraper_status
+
+    check_scraper_status.main(args.checker_args)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scrape IPO GMP data and send alerts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scrape_parser = subparsers.add_parser("scrape", help="Scrape the reports and email high-rated IPOs")
+    scrape_parser.add_argument("--no-send", action="store_true",
+                               help="Only scrape and cache the digest for a later 'send'")
+    scrape_parser.add_argument("--record", metavar="DIR",
+                               help="Save fetched pages and SMTP deliveries to DIR for 'replay'")
+    scrape_parser.set_defaults(handler=cmd_scrape)
+
+    replay_parser = subparsers.add_parser(
+        "replay", help="Run against a recording with local page and SMTP stubs")
+    replay_parser.add_argument("directory", help="Directory written by 'scrape --record'")
+    replay_parser.add_argument("--no-send", action="store_true",
+                               help="Stop after scraping; don't compare deliveries")
+    replay_parser.set_defaults(handler=cmd_replay)
+
+    send_parser = subparsers.add_parser("send", help="Email the last cached digests again")
+    send_parser.set_defaults(handler=cmd_send)
+
+    preview_parser = subparsers.add_parser("preview", help="Render one of the last cached digests to HTML")
+    preview_parser.add_argument("-o", "--output", default="preview.html",
+                                help="Output file, or - for stdout (default: preview.html)")
+    preview_parser.add_argument("-i", "--index", type=int, default=0,
+                                help="Which digest to render when subscribers get different ones")
+    preview_parser.set_defaults(handler=cmd_preview)
+
+    status_parser = subparsers.add_parser(
+        "status", help="Check scraper health (extra options go to check_scraper_status.py)")
+    status_parser.set_defaults(handler=cmd_status)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != "status":
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.checker_args = extra
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
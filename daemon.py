@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+IPO Scraper Daemon
+
+Runs the scrape-and-notify cycle on a fixed interval for intraday GMP
+polling, keeping one warm Chrome session alive across polls.
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from main import main as run_once, setup_environment
+
+# The daemon is long-lived, so load .env up front for the IPO_* settings below
+setup_environment()
+
+from driver_session import DRIVER_MAX_USES, DriverSession
+
+
+POLL_INTERVAL = int(os.getenv("IPO_POLL_INTERVAL", "300"))
+
+
+def debug_print(message):
+    print(f"[DAEMON] {message}")
+
+
+def run_daemon(interval=POLL_INTERVAL, max_uses=DRIVER_MAX_USES, max_polls=None):
+    """
+    Poll until interrupted (or max_polls is reached).
+
+    Args:
+        interval: Seconds between the start of consecutive polls
+        max_uses: Recycle the Chrome session after this many polls
+        max_polls: Stop after this many polls (None runs forever)
+    """
+    debug_print(f"Started at {datetime.now()} (interval {interval}s, recycle after {max_uses} uses)")
+    polls = 0
+
+    with DriverSession(max_uses=max_uses) as session:
+        while max_polls is None or polls < max_polls:
+            started = time.monotonic()
+            polls += 1
+            debug_print(f"Poll #{polls}")
+
+            try:
+                run_once(session=session)
+            except Exception as e:
+                # A crashed poll must not take the daemon down; start the next one cold
+                debug_print(f"Poll #{polls} failed: {e}")
+                session.discard()
+
+            if max_polls is not None and polls >= max_polls:
+                break
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+
+    debug_print(f"Stopped after {polls} polls ({session.launches} Chrome launches)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poll IPO GMP data on an interval")
+    parser.add_argument("--interval", type=int, default=POLL_INTERVAL, help="Seconds between polls")
+    parser.add_argument("--max-uses", type=int, default=DRIVER_MAX_USES,
+                        help="Recycle Chrome after this many polls")
+    parser.add_argument("--max-polls", type=int, default=None, help="Stop after this many polls")
+    args = parser.parse_args()
+
+    try:
+        run_daemon(args.interval, args.max_uses, args.max_polls)
+    except KeyboardInterrupt:
+        debug_print("Interrupted, shutting down")
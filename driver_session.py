@@ -0,0 +1,128 @@
+"""
+Warm, reusable Chrome session for repeated scrapes.
+
+A DriverSession keeps one webdriver alive across polls, health-checks it
+before each use and recycles it after a fixed number of uses or after a
+crash, so only the first poll (and each recycle) pays Chrome startup.
+"""
+
+import os
+import threading
+from datetime import datetime
+
+
+DRIVER_MAX_USES = int(os.getenv("IPO_DRIVER_MAX_USES", "50"))
+NAVIGATION_TIMEOUT = int(os.getenv("IPO_DRIVER_NAV_TIMEOUT", "30"))
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+class DriverSession:
+    def __init__(self, max_uses=DRIVER_MAX_USES, factory=None):
+        """
+        Args:
+            max_uses: Recycle the driver after this many acquisitions
+            factory: Callable returning a new webdriver (defaults to scraper.create_driver)
+        """
+        self.max_uses = max_uses
+        self.factory = factory
+        self.driver = None
+        self.uses = 0
+        self.launches = 0
+        self.lock = threading.RLock()
+
+    def _launch(self):
+        factory = self.factory
+        if factory is None:
+            from scraper import create_driver
+            factory = create_driver
+        self.driver = factory()
+        self.uses = 0
+        self.launches += 1
+        debug_print(f"Launched Chrome session #{self.launches}")
+
+    def is_healthy(self):
+        """Check that the browser still answers a trivial script."""
+        if self.driver is None:
+            return False
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception as e:
+            debug_print(f"Chrome session health check failed: {e}")
+            return False
+
+    def acquire(self):
+        """
+        Return a healthy driver, launching or recycling one if needed.
+        """
+        if self.driver is not None and self.uses >= self.max_uses:
+            debug_print(f"Recycling Chrome session after {self.uses} uses")
+            self.close()
+        elif self.driver is not None and not self.is_healthy():
+            self.close()
+
+        if self.driver is None:
+            self._launch()
+
+        self.uses += 1
+        return self.driver
+
+    def load(self, url):
+        """
+        Navigate to url, refreshing instead of re-navigating if already there.
+
+        With the "none" page load strategy, get() and refresh() return before
+        the new document replaces the old one, so on a warm driver this also
+        waits for the previous document to go stale. Otherwise the caller
+        could read the last poll's table (or another source's).
+
+        Returns:
+            The driver showing url
+
+        Raises:
+            TimeoutException: If the previous document is still shown after
+                NAVIGATION_TIMEOUT seconds
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        driver = self.acquire()
+        previous = None
+        if self.uses > 1:
+            try:
+                previous = driver.find_element(By.TAG_NAME, "html")
+            except Exception:
+                pass
+
+        if self.uses > 1 and driver.current_url == url:
+            driver.refresh()
+        else:
+            driver.get(url)
+
+        if previous is not None:
+            WebDriverWait(driver, NAVIGATION_TIMEOUT).until(EC.staleness_of(previous))
+        return driver
+
+    def discard(self):
+        """Drop the current driver after a failure so the next acquire starts fresh."""
+        debug_print("Discarding Chrome session after failure")
+        self.close()
+
+    def close(self):
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+        except Exception as e:
+            debug_print(f"Error quitting Chrome session: {e}")
+        self.driver = None
+        self.uses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
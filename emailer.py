@@ -1,9 +1,37 @@
 import os
 import smtplib
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+import metrics
+import recorder
+from models import IpoBatch, IpoRecord
+from templates import render_card, render_page
+
+
+SMTP_HOST = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', '465'))
+SMTP_SSL = os.environ.get('SMTP_SSL', '1') != '0'
+SMTP_TIMEOUT = int(os.environ.get('SMTP_TIMEOUT', '30'))
+SMTP_POOL_SIZE = int(os.environ.get('SMTP_POOL_SIZE', '3'))
+SMTP_RATE_LIMIT = float(os.environ.get('SMTP_RATE_LIMIT', '5'))  # messages per second, 0 = unlimited
+SMTP_MAX_RETRIES = int(os.environ.get('SMTP_MAX_RETRIES', '2'))
+SMTP_RETRY_DELAY = float(os.environ.get('SMTP_RETRY_DELAY', '2'))
+
+
+@dataclass
+class Digest:
+    """One distinct email: the IPOs it shows and everyone who gets it."""
+    ipos: IpoBatch
+    changes: dict = field(default_factory=dict)  # {name: alert_diff change}, shown as badges
+    recipients: list = field(default_factory=list)
+    profiles: list = field(default_factory=list)  # subscriptions.FilterProfile keys served
+
 
 def debug_print(message):
     print(f"[DEBUG {datetime.now()}] {message}")
@@ -41,12 +69,13 @@ def get_recipients():
         return []
 
 
-def create_email_html(ipo_data):
+def create_email_html(ipo_data, changes=None):
     """
     Create HTML email content for IPO alerts.
 
     Args:
-        ipo_data (list): List of IPO data
+        ipo_data (IpoBatch): IPO records to include
+        changes (dict): Optional {name: change} badges from alert_diff
 
     Returns:
         str: HTML email content
@@ -54,147 +83,272 @@ def create_email_html(ipo_data):
     if not ipo_data:
         return None
 
-    ipo_cards = "".join(
-        f"""
-        <div class="ipo-card" style="margin-bottom: 20px; border: 1px solid #e0e0e0; border-radius: 12px; padding: 20px; background-color: white; box-sizing: border-box;">
-            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 16px; flex-wrap: wrap; gap: 16px;">
-                <div style="flex: 1; min-width: 280px; box-sizing: border-box;">
-                    <div style="display: flex; align-items: flex-start; margin-bottom: 12px; flex-wrap: wrap; gap: 8px;">
-                        <h3 style="margin: 0; color: #1a237e; font-size: 16px; font-weight: 600; line-height: 1.3; word-break: break-word;">{ipo[0]}</h3>
-                        {"<span style='background-color: #ff9800; color: white; padding: 3px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; white-space: nowrap;'>CT</span>" if ipo[1] == "CT" else "<span style='background-color: #4caf50; color: white; padding: 3px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; white-space: nowrap;'>O</span>" if ipo[1] == "O" else ""}
-                    </div>
-                    <div style="margin-bottom: 12px;">
-                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Est. Gains (GMP %)</div>
-                        <div style="color: {'#2e7d32' if '%' in ipo[2] and float(ipo[2].replace(' %', '')) > 0 else '#c62828' if '%' in ipo[2] and float(ipo[2].replace(' %', '')) < 0 else '#666'}; font-size: 15px; font-weight: 600; word-break: break-all;">{ipo[2]}</div>
-                    </div>
-                    <div>
-                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Rating</div>
-                        <div style="background-color: #fff3e0; color: #e65100; padding: 5px 10px; border-radius: 6px; display: inline-block; font-weight: 500; font-size: 13px;">{ipo[4]}</div>
-                    </div>
-                </div>
-
-                <div style="flex: 1; min-width: 200px; box-sizing: border-box;">
-                    <div style="margin-bottom: 12px;">
-                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Close Date</div>
-                        <div style="color: #333; font-size: 14px; font-weight: 500;">{ipo[3]}</div>
-                    </div>
-                    <div style="margin-top: 8px;">
-                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Days Remaining</div>
-                        <div style="color: #1565c0; font-size: 14px; font-weight: 500;">{(datetime.strptime(f"{ipo[3]}-{datetime.now().year}", '%d-%b-%Y') - datetime.now()).days} days</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        """
-        for ipo in ipo_data
-    )
-
-    return f"""
-    <html>
-        <head>
-            <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
-            <style>
-                @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap');
-            </style>
-        </head>
-        <body style="font-family: 'Inter', Arial, sans-serif; margin: 0; padding: 8px; background-color: #f5f5f5; -webkit-font-smoothing: antialiased; word-wrap: break-word;">
-            <div style="max-width: 100%; margin: 0 auto; background-color: white; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.05); padding: 20px; box-sizing: border-box;">
-                <div style="margin-bottom: 20px; padding-bottom: 16px; border-bottom: 2px solid #f0f0f0;">
-                    <h1 style="color: #1a237e; font-size: 20px; margin: 0; font-weight: 600; line-height: 1.3;">
-                        🎯 IPO Alerts
-                    </h1>
-                    <p style="color: #666; font-size: 14px; margin: 8px 0 0 0;">
-                        {datetime.now().strftime('%d %B %Y')}
-                    </p>
-                </div>
-
-                <p style="color: #424242; font-size: 15px; margin: 0 0 20px 0; line-height: 1.5;">
-                    Here are the highly-rated IPOs currently open:
-                </p>
-
-                <div style="margin-bottom: 20px;">
-                    {ipo_cards}
-                </div>
-
-                <div style="background-color: #f8f9fa; border-radius: 8px; padding: 16px; margin-top: 20px;">
-                    <p style="color: #666; font-size: 13px; margin: 0; line-height: 1.4;">
-                        ℹ️ <strong>Status Labels:</strong> <span style="background-color: #4caf50; color: white; padding: 2px 6px; border-radius: 3px; font-size: 9px; font-weight: 600;">O</span> = Open, <span style="background-color: #ff9800; color: white; padding: 2px 6px; border-radius: 3px; font-size: 9px; font-weight: 600;">CT</span> = Closes Today
-                    </p>
-                    <p style="color: #666; font-size: 13px; margin: 8px 0 0 0; line-height: 1.4;">
-                        Only showing IPOs with ratings of 4/5 or 5/5
-                    </p>
-                </div>
-
-                <div style="margin-top: 20px; padding-top: 16px; border-top: 1px solid #f0f0f0; color: #666; font-size: 12px;">
-                    <p style="margin: 0; line-height: 1.4;">To unsubscribe from these alerts, please contact the administrator.</p>
-                </div>
-            </div>
-        </body>
-    </html>
+    with metrics.span("render"):
+        today = date.today()
+        changes = changes or {}
+        ipo_cards = "".join(render_card(ipo, today, changes.get(ipo.name)) for ipo in ipo_data)
+        return render_page(ipo_cards, today)
+
+
+class RateLimiter:
+    """Token bucket shared by all SMTP workers (messages per second)."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        if self.rate <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + 1.0 / self.rate
+        time.sleep(max(0, slot - now))
+
+
+class SMTPPool:
+    """
+    At most size authenticated SMTP connections, shared by every thread
+    that sends through the pool.
+
+    A sender checks a connection out for one message and returns it
+    afterwards, so successive deliver() calls reuse the same logins.
+    Connections are opened lazily, dropped after a disconnect and all
+    closed by close().
+    """
+
+    def __init__(self, sender_email, password, host=SMTP_HOST, port=SMTP_PORT, use_ssl=SMTP_SSL,
+                 size=SMTP_POOL_SIZE):
+        self.sender_email = sender_email
+        self.password = password
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.slots = threading.BoundedSemaphore(max(1, size))
+        self.lock = threading.Lock()
+        self.idle = []
+        self.connections = []
+
+    def _connect(self):
+        server_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        with metrics.span("smtp_connect"):
+            server = server_class(self.host, self.port, timeout=SMTP_TIMEOUT)
+            server.login(self.sender_email, self.password)
+        with self.lock:
+            self.connections.append(server)
+        return server
+
+    def _checkout(self):
+        self.slots.acquire()
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+        try:
+            return self._connect()
+        except Exception:
+            self.slots.release()
+            raise
+
+    def _checkin(self, server, broken=False):
+        with self.lock:
+            if not broken:
+                self.idle.append(server)
+            elif server in self.connections:
+                self.connections.remove(server)
+        if broken:
+            try:
+                server.close()
+            except Exception:
+                pass
+        self.slots.release()
+
+    def sendmail(self, recipient, payload):
+        """Send the pre-rendered payload to one envelope recipient."""
+        server = self._checkout()
+        broken = False
+        try:
+            server.sendmail(self.sender_email, [recipient], payload)
+        except Exception as e:
+            recorder.record_delivery(self.sender_email, recipient, payload, e)
+            broken = isinstance(e, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+            raise
+        finally:
+            self._checkin(server, broken)
+        recorder.record_delivery(self.sender_email, recipient, payload)
+
+    def close(self):
+        with self.lock:
+            connections, self.connections = self.connections, []
+            self.idle = []
+        for server in connections:
+            try:
+                server.quit()
+            except Exception:
+                pass
+
+
+def build_message(sender_email, subject, html_content):
+    """
+    Render the alert once as bytes shared by every recipient.
+
+    Recipients go only on the SMTP envelope (BCC), so the message itself is
+    identical for all of them.
+    """
+    msg = MIMEMultipart()
+    msg['From'] = sender_email
+    msg['To'] = sender_email  # Set To as sender
+    msg['Subject'] = subject
+    msg.attach(MIMEText(html_content, 'html'))
+    return msg.as_bytes()
+
+
+def is_permanent_failure(error):
+    """5xx replies (bad recipient, bad credentials) won't succeed on retry."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+def deliver(pool, recipients, payload, workers=SMTP_POOL_SIZE, rate_limit=SMTP_RATE_LIMIT,
+            max_retries=SMTP_MAX_RETRIES, retry_delay=SMTP_RETRY_DELAY):
+    """
+    Deliver one payload to many recipients over a pool of SMTP connections.
+
+    Only recipients that failed transiently are retried, with a growing
+    pause between rounds.
+
+    Args:
+        pool: SMTPPool to send through
+        recipients: Envelope recipient addresses
+        payload: Pre-rendered message bytes
+        workers: Concurrent connections
+        rate_limit: Messages per second across all workers (0 = unlimited)
+        max_retries: Extra rounds for transient failures
+        retry_delay: Pause before the first retry round, doubled each round
+
+    Returns:
+        dict: {recipient: error message} for recipients that were never delivered
     """
+    limiter = RateLimiter(rate_limit)
+
+    def send_one(recipient):
+        limiter.wait()
+        try:
+            pool.sendmail(recipient, payload)
+            metrics.incr("emails_sent")
+            metrics.incr("bytes_sent", len(payload))
+            return recipient, None
+        except Exception as e:
+            return recipient, e
+
+    pending = list(recipients)
+    failed = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as executor:
+        for attempt in range(max_retries + 1):
+            if attempt:
+                debug_print(f"Retrying {len(pending)} failed recipients (attempt {attempt + 1})")
+                time.sleep(min(retry_delay * 2 ** (attempt - 1), 30))
+
+            retry = []
+            for recipient, error in executor.map(send_one, pending):
+                if error is None:
+                    failed.pop(recipient, None)
+                    continue
+                failed[recipient] = str(error)
+                if not is_permanent_failure(error):
+                    retry.append(recipient)
+
+            pending = retry
+            if not pending:
+                break
 
+    return failed
 
-def send_email(ipo_data):
+
+def send_email(ipo_data, changes=None):
     """
     Send email notifications about high-rated IPOs.
 
     Args:
-        ipo_data (list): List of IPO data to include in the email
+        ipo_data (IpoBatch): IPO records to include in the email
+        changes (dict): Optional {name: change} badges from alert_diff
+    """
+    recipient_emails = get_recipients()
+    if not recipient_emails:
+        debug_print("Missing email configuration: EMAIL_RECIPIENTS or config/recipients.txt")
+        return False
+
+    if not ipo_data:
+        debug_print("No qualifying IPOs found. Skipping email send.")
+        return True
+
+    return all(send_digests([Digest(ipo_data, changes or {}, recipient_emails)]))
+
+
+def send_digests(digests):
+    """
+    Render each digest once and send it to its recipients, sharing one
+    SMTP pool across all digests.
+
+    Args:
+        digests: Digests, e.g. from subscriptions.plan_digests()
+
+    Returns:
+        list: True/False per digest, in order
     """
     sender_email = os.environ.get('GMAIL_USER')
     password = os.environ.get('GMAIL_PASSWORD')
-    recipient_emails = get_recipients()
 
-    if not all([sender_email, password, recipient_emails]):
+    if not all([sender_email, password]):
         missing = []
         if not sender_email: missing.append("GMAIL_USER")
         if not password: missing.append("GMAIL_PASSWORD")
-        if not recipient_emails: missing.append("EMAIL_RECIPIENTS or config/recipients.txt")
         debug_print(f"Missing email configuration: {', '.join(missing)}")
-        return False
+        return [False] * len(digests)
+
+    subject = f"🚀 IPO Alerts - {datetime.now().strftime('%d %B %Y')}"
+    pool = SMTPPool(sender_email, password)
+    try:
+        return [send_digest(pool, sender_email, subject, digest) for digest in digests]
+    finally:
+        pool.close()
 
-    if not ipo_data:
-        debug_print("No qualifying IPOs found. Skipping email send.")
-        return True
 
+def send_digest(pool, sender_email, subject, digest):
     # Create HTML email content
-    html_content = create_email_html(ipo_data)
+    html_content = create_email_html(digest.ipos, digest.changes)
     if not html_content:
         debug_print("Failed to create email content")
         return False
 
-    # Create message
-    msg = MIMEMultipart()
-    msg['From'] = sender_email
-    msg['Subject'] = f"🚀 IPO Alerts - {datetime.now().strftime('%d %B %Y')}"
-
-    msg.attach(MIMEText(html_content, 'html'))
-
+    payload = build_message(sender_email, subject, html_content)
+    recipient_emails = digest.recipients
     try:
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            server.login(sender_email, password)
-            # Send individual emails with BCC
-            for recipient in recipient_emails:
-                msg_copy = MIMEMultipart()
-                msg_copy['From'] = sender_email
-                msg_copy['To'] = sender_email  # Set To as sender
-                msg_copy['Subject'] = msg['Subject']
-                msg_copy['Bcc'] = recipient
-                msg_copy.attach(MIMEText(html_content, 'html'))
-                server.send_message(msg_copy)
-                debug_print(f"Email sent to BCC recipient")
-        debug_print("All emails sent successfully!")
-        return True
+        with metrics.span("smtp"):
+            failed = deliver(pool, recipient_emails, payload)
     except Exception as e:
         debug_print(f"Failed to send email: {e}")
         return False
 
+    if failed:
+        debug_print(f"Failed to send email to {len(failed)} of {len(recipient_emails)} recipients")
+        for error in set(failed.values()):
+            debug_print(f"  {error}")
+        return False
+
+    debug_print(f"All {len(recipient_emails)} emails sent successfully!")
+    return True
+
 
 if __name__ == "__main__":
     # For testing purposes
-    sample_data = [
-        ["Test IPO", "O", "25.5 %", "13-Oct", "4.0/5"]
-    ]
+    sample_data = IpoBatch([
+        IpoRecord.from_cells("Test IPO", "O", "₹51 (25.5%)", "🔥🔥🔥🔥", "13-Oct")
+    ])
     print("Testing email HTML generation...")
     html = create_email_html(sample_data)
     if html:
@@ -0,0 +1,187 @@
+"""
+Detail-page enrichment.
+
+Fetches each IPO's own page (linked from its name in the report) on a
+bounded thread pool and fills in subscription, price band, lot size and
+issue size. Results are cached on disk per detail URL for IPO_DETAIL_TTL,
+so lot size, price band and issue size are fetched once per IPO. Only
+open IPOs, whose subscription figure moves during the issue, are
+refetched sooner, after IPO_SUBSCRIPTION_TTL.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import replace
+from datetime import datetime
+from urllib.parse import urlparse
+
+import metrics
+import recorder
+from models import IpoBatch
+from resilience import RetryPolicy, call_with_retry, get_breaker
+from snapshot_cache import CACHE_DIR, write_json
+
+
+ENRICHMENT = os.getenv("IPO_ENRICHMENT", "1") != "0"
+DETAIL_WORKERS = int(os.getenv("IPO_DETAIL_WORKERS", "4"))
+DETAIL_TIMEOUT = float(os.getenv("IPO_DETAIL_TIMEOUT", "30"))  # seconds for the whole stage
+DETAIL_TTL = float(os.getenv("IPO_DETAIL_TTL", str(7 * 24 * 3600)))
+SUBSCRIPTION_TTL = float(os.getenv("IPO_SUBSCRIPTION_TTL", "3600"))
+DETAIL_CACHE_FILE = os.path.join(CACHE_DIR, "ipo_details.json")
+
+# IpoRecord field: lower-case label prefixes it appears under on a detail page
+DETAIL_LABELS = {
+    "price_band": ("price band", "issue price"),
+    "lot_size": ("lot size", "market lot"),
+    "issue_size": ("issue size", "total issue size"),
+    "subscription": ("subscription", "subscribed"),
+}
+STATIC_FIELDS = ("price_band", "lot_size", "issue_size")
+EMPTY_VALUES = ("", "-", "--", "N/A", "NA")
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+def parse_detail_page(html):
+    """
+    Read the label/value rows of a detail page.
+
+    Returns:
+        dict: {field: text} for the DETAIL_LABELS fields found on the page
+    """
+    from bs4 import BeautifulSoup
+
+    details = {}
+    for row in BeautifulSoup(html, "html.parser").find_all("tr"):
+        cells = row.find_all(["td", "th"], recursive=False)
+        if len(cells) < 2:
+            continue
+        label = " ".join(cells[0].get_text(" ").split()).lower()
+        value = " ".join(cells[1].get_text(" ").split())
+        for field, prefixes in DETAIL_LABELS.items():
+            if field not in details and label.startswith(prefixes) and value not in EMPTY_VALUES:
+                details[field] = value
+    return details
+
+
+def fetch_details(url, timeout):
+    """Fetch and parse one detail page."""
+    import requests
+    from scraper import HTTP_HEADERS
+
+    with metrics.span("detail_fetch"):
+        response = requests.get(url, headers=HTTP_HEADERS, timeout=timeout)
+    metrics.incr("detail_fetches")
+    metrics.incr("http_bytes", len(response.content))
+    response.raise_for_status()
+    recorder.record_page(url, response.content, "detail")
+    return parse_detail_page(response.content)
+
+
+def load_detail_cache():
+    """
+    Returns:
+        dict: {detail_url: {"fields": {field: text}, "fetched_at": epoch seconds}}
+    """
+    try:
+        with open(DETAIL_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        debug_print(f"Ignoring unreadable detail cache: {e}")
+        return {}
+
+
+def is_fresh(entry, ipo, now=None):
+    """
+    True if a cached entry can be used without refetching the IPO's page.
+
+    Only an open IPO's subscription figure changes, so only open IPOs are
+    held to the shorter subscription TTL.
+    """
+    age = (now or time.time()) - entry["fetched_at"]
+    if ipo.closing_status in ("O", "CT"):
+        return age < min(DETAIL_TTL, SUBSCRIPTION_TTL)
+    return age < DETAIL_TTL
+
+
+def enrich_ipos(ipos, max_workers=DETAIL_WORKERS, timeout=DETAIL_TIMEOUT):
+    """
+    Fill in detail-page fields for every IPO with a detail link.
+
+    Pages are fetched only for IPOs missing from the cache or past their
+    TTL (or all of them while recording, see recorder.py). A page that fails (or isn't back within timeout) leaves that IPO
+    with its cached fields, if any, so enrichment never fails the run.
+
+    Args:
+        ipos: IpoBatch to enrich
+        max_workers: Detail pages fetched at once
+        timeout: Seconds the whole stage may take
+
+    Returns:
+        IpoBatch: The same IPOs, in order, with detail fields filled in
+    """
+    if not ENRICHMENT or not ipos:
+        return ipos
+
+    with metrics.span("enrich"):
+        cache = load_detail_cache()
+        now = time.time()
+        # A recording must hold every detail page, or its replay renders cards without them
+        recording = recorder.is_recording()
+        stale = sorted({ipo.detail_url for ipo in ipos if ipo.detail_url and (recording or not (
+            ipo.detail_url in cache and is_fresh(cache[ipo.detail_url], ipo, now)))})
+        linked = {ipo.detail_url for ipo in ipos if ipo.detail_url}
+        metrics.incr("detail_cache_hits", len(linked) - len(stale))
+
+        if stale:
+            _refresh(stale, cache, max_workers, timeout)
+            # Forget IPOs nobody has asked about for a while
+            write_json(DETAIL_CACHE_FILE, {url: entry for url, entry in cache.items()
+                                           if now - entry["fetched_at"] < DETAIL_TTL})
+
+        return IpoBatch(
+            replace(ipo, **cache[ipo.detail_url]["fields"]) if ipo.detail_url in cache else ipo
+            for ipo in ipos
+        )
+
+
+def _refresh(urls, cache, max_workers, timeout):
+    debug_print(f"Fetching {len(urls)} IPO detail pages")
+    deadline = time.monotonic() + timeout
+    policy = RetryPolicy(max_attempts=2, base_delay=1, max_delay=2)
+
+    def fetch(url):
+        # Not the report host's breaker: failing detail pages must never block the reports
+        breaker = get_breaker(f"{urlparse(url).netloc}/detail")
+        return call_with_retry(
+            lambda: fetch_details(url, max(1.0, deadline - time.monotonic())),
+            policy, deadline, breaker, f"Fetching {url}")
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))))
+    try:
+        futures = {url: executor.submit(fetch, url) for url in urls}
+        for url, future in futures.items():
+            try:
+                fields = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                debug_print(f"Detail page {url} timed out")
+                metrics.incr("detail_failures")
+                continue
+            except Exception as e:
+                debug_print(f"Detail page {url} failed: {e}")
+                metrics.incr("detail_failures")
+                continue
+
+            previous = cache.get(url, {}).get("fields", {})
+            # Keep static fields we already know if this copy of the page lacks them
+            merged = {field: previous[field] for field in STATIC_FIELDS if field in previous}
+            merged.update(fields)
+            cache[url] = {"fields": merged, "fetched_at": time.time()}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
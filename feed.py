@@ -0,0 +1,203 @@
+"""
+Static data feed of current and historical IPOs.
+
+After each scrape, export_feed() brings IPO_FEED_DIR (default feed/) up to
+date for other teams to serve or sync as plain files:
+
+    manifest.json               schema version, feed revision, and the
+                                sha256, size and revision of every file
+    current.json                every IPO on the latest scrape, all ratings
+    ipos/<slug>.json            one IPO's latest record and its GMP history
+    archive/YYYY-MM.csv         one row per IPO change, partitioned by month
+    archive/YYYY-MM.parquet     the same partition, when pyarrow is installed
+
+Only what changed is rewritten. An IPO's file and archive row are written
+when its record differs from the one last exported (tracked by hash in the
+manifest), so unchanged and long-closed IPOs cost nothing. Only the
+current month's archive partition is appended to, and current.json is
+replaced only when its content changes. The manifest's revision goes up
+whenever any file does, so consumers can poll just manifest.json.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+from datetime import datetime
+
+import history
+import metrics
+
+
+FEED = os.getenv("IPO_FEED", "1") != "0"
+FEED_DIR = os.getenv("IPO_FEED_DIR", "feed")
+SCHEMA_VERSION = 1
+ARCHIVE_COLUMNS = ("scraped_at", "slug", "name", "closing_status", "gmp_pct", "rating_value",
+                   "close_date", "gmp_spread")
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+def slugify(name):
+    """File-safe IPO id, e.g. "Orkla India IPO" -> "orkla-india-ipo"."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def record_hash(ipo):
+    data = json.dumps(ipo.to_dict(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def load_manifest(feed_dir=None):
+    try:
+        with open(os.path.join(feed_dir or FEED_DIR, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"schema_version": SCHEMA_VERSION, "revision": 0, "files": {}}
+
+
+def _json_bytes(data):
+    return (json.dumps(data, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+class FeedWriter:
+    """Writes feed files atomically and keeps their manifest entries current."""
+
+    def __init__(self, feed_dir, manifest, now):
+        self.feed_dir = feed_dir
+        self.manifest = manifest
+        self.files = manifest.setdefault("files", {})
+        self.revision = manifest.get("revision", 0) + 1  # this export's, if anything changes
+        self.now = now
+        self.written = []
+
+    def path(self, relative):
+        return os.path.join(self.feed_dir, *relative.split("/"))
+
+    def write(self, relative, data, **extra):
+        """Replace relative with data (bytes) unless it is byte-for-byte unchanged."""
+        digest = hashlib.sha256(data).hexdigest()
+        if self.files.get(relative, {}).get("sha256") == digest:
+            return False
+        path = self.path(relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+        self._track(relative, digest, len(data), **extra)
+        return True
+
+    def append(self, relative, data):
+        """Append data (bytes) to relative, rehashing the file."""
+        path = self.path(relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(data)
+        with open(path, "rb") as f:
+            content = f.read()
+        self._track(relative, hashlib.sha256(content).hexdigest(), len(content))
+
+    def _track(self, relative, digest, size, **extra):
+        self.files[relative] = {"sha256": digest, "bytes": size, "revision": self.revision,
+                                "updated_at": self.now, **extra}
+        if relative not in self.written:
+            self.written.append(relative)
+
+
+def ipo_document(ipo, slug, db_path=None):
+    """An IPO's latest record plus its GMP history, with repeated readings collapsed."""
+    points = []
+    for scraped_at, gmp_pct, rating, closing_status in history.gmp_trend(ipo.name, db_path=db_path):
+        point = {"scraped_at": scraped_at, "gmp_pct": gmp_pct, "rating": rating,
+                 "closing_status": closing_status}
+        if points and all(points[-1][key] == point[key] for key in ("gmp_pct", "rating", "closing_status")):
+            continue
+        points.append(point)
+    return {"schema_version": SCHEMA_VERSION, "slug": slug, "ipo": ipo.to_dict(), "history": points}
+
+
+def archive_rows(ipos, scraped_at):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for ipo in ipos:
+        writer.writerow((scraped_at, slugify(ipo.name), ipo.name, ipo.closing_status, ipo.gmp_pct,
+                         ipo.rating_value, ipo.close_date.isoformat() if ipo.close_date else ipo.close_date_text,
+                         ipo.gmp_spread))
+    return buffer.getvalue().encode("utf-8")
+
+
+def write_parquet(feed, csv_relative):
+    """Rewrite the Parquet copy of one archive partition; skipped without pyarrow."""
+    try:
+        import pyarrow.csv
+        import pyarrow.parquet
+    except ImportError:
+        return
+    table = pyarrow.csv.read_csv(feed.path(csv_relative))
+    buffer = pyarrow.BufferOutputStream()
+    pyarrow.parquet.write_table(table, buffer, compression="zstd")
+    feed.write(csv_relative.removesuffix(".csv") + ".parquet", buffer.getvalue().to_pybytes())
+
+
+def export_feed(ipos, scraped_at=None, feed_dir=None, db_path=None):
+    """
+    Update the feed with one scrape.
+
+    Args:
+        ipos: Every parsed IpoRecord of the scrape (all ratings)
+        scraped_at: Scrape time (defaults to now)
+        feed_dir: Output directory (defaults to IPO_FEED_DIR)
+        db_path: History database (defaults to IPO_HISTORY_DB)
+
+    Returns:
+        list: Feed-relative paths that were (re)written, manifest excluded
+    """
+    if not FEED:
+        return []
+
+    feed_dir = feed_dir or FEED_DIR
+    scraped_at = (scraped_at or datetime.now()).isoformat(timespec="seconds")
+    with metrics.span("export"):
+        manifest = load_manifest(feed_dir)
+        feed = FeedWriter(feed_dir, manifest, scraped_at)
+
+        changed = []
+        for ipo in ipos:
+            slug = slugify(ipo.name)
+            relative = f"ipos/{slug}.json"
+            digest = record_hash(ipo)
+            if feed.files.get(relative, {}).get("record") == digest:
+                continue
+            changed.append(ipo)
+            feed.write(relative, _json_bytes(ipo_document(ipo, slug, db_path)), record=digest)
+
+        if changed:
+            partition = f"archive/{scraped_at[:7]}.csv"
+            if not os.path.exists(feed.path(partition)):
+                feed.append(partition, (",".join(ARCHIVE_COLUMNS) + "\n").encode("utf-8"))
+            feed.append(partition, archive_rows(changed, scraped_at))
+            write_parquet(feed, partition)
+
+        feed.write("current.json", _json_bytes({
+            "schema_version": SCHEMA_VERSION,
+            "ipos": [{"slug": slugify(ipo.name), **ipo.to_dict()} for ipo in ipos],
+        }))
+
+        if feed.written:
+            manifest["revision"] = feed.revision
+        manifest["schema_version"] = SCHEMA_VERSION
+        manifest["generated_at"] = scraped_at
+        os.makedirs(feed_dir, exist_ok=True)
+        with open(os.path.join(feed_dir, "manifest.json.tmp"), "wb") as f:
+            # Compact: it lists every file ever exported, and indenting JSON is several times slower
+            f.write(json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        os.replace(os.path.join(feed_dir, "manifest.json.tmp"), os.path.join(feed_dir, "manifest.json"))
+
+    metrics.incr("feed_files_written", len(feed.written))
+    debug_print(f"Feed revision {manifest['revision']}: {len(changed)} of {len(ipos)} IPOs changed, "
+                f"{len(feed.written)} files written")
+    return feed.written
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Local fixture server for offline scraping.
+
+Serves saved report pages from the fixtures/ directory so both scraping
+engines (HTTP fast path and Selenium) can be run without touching
+investorgain.com.
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+REPORT_PATH = "/live_ipo_gmp.html"
+
+
+def debug_print(message):
+    print(f"[FIXTURE {datetime.now()}] {message}")
+
+
+class Faults:
+    """
+    Failures injected into the fixture server, to exercise retries, hedging
+    and the circuit breaker.
+
+    Args:
+        fail_first: Answer this many requests with error_status, then serve normally
+        fail_rate: Chance that any later request fails as well
+        delay: Seconds to stall before every answer
+        error_status: HTTP status of injected failures
+        seed: Seed for fail_rate, so runs are repeatable
+    """
+
+    def __init__(self, fail_first=0, fail_rate=0.0, delay=0.0, error_status=503, seed=0):
+        self.fail_first = fail_first
+        self.fail_rate = fail_rate
+        self.delay = delay
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+
+    def should_fail(self):
+        with self.lock:
+            self.requests += 1
+            fail = self.requests <= self.fail_first or self.random.random() < self.fail_rate
+            self.failures += fail
+            return fail
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        faults = getattr(self.server, "faults", None)
+        if faults is not None:
+            if faults.delay:
+                time.sleep(faults.delay)
+            if faults.should_fail():
+                self.send_error(faults.error_status, "Injected failure")
+                return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(directory=FIXTURES_DIR, port=0, faults=None):
+    """
+    Start a fixture server on a background thread.
+
+    Args:
+        directory: Directory to serve
+        port: Port to bind on localhost (0 picks a free port)
+        faults: Optional Faults to inject (server.faults can be swapped later)
+
+    Returns:
+        tuple: (server, base_url); call server.shutdown() when done
+    """
+    handler = functools.partial(FixtureRequestHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.faults = faults
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    debug_print(f"Serving {directory} at {base_url}")
+    return server, base_url
+
+
+def build_report_page(row_count, template_path=None):
+    """
+    Build a report page with row_count rows by repeating the saved fixture rows.
+
+    Names get a numeric suffix so every row stays distinct.
+
+    Returns:
+        str: Page HTML
+    """
+    with open(template_path or os.path.join(FIXTURES_DIR, REPORT_PATH.lstrip("/")), encoding="utf-8") as f:
+        html = f.read()
+
+    body_start = html.index('<tbody id="tableBody">') + len('<tbody id="tableBody">')
+    body_end = html.index("</tbody>", body_start)
+    template_rows = re.findall(r"\s*<tr>.*?</tr>", html[body_start:body_end], re.S)
+
+    rows = []
+    for i in range(row_count):
+        row = template_rows[i % len(template_rows)]
+        rows.append(re.sub(r" IPO( O| CT)?<", lambda m: f" {i} IPO{m.group(1) or ''}<", row, count=1))
+
+    return html[:body_start] + "".join(rows) + "\n      " + html[body_end:]
+
+
+MIRROR_ASSETS = {
+    # path: size in bytes
+    "assets/img/banner.jpg": 400_000,
+    "assets/img/logo.png": 60_000,
+    "assets/fonts/inter.woff2": 120_000,
+    "assets/css/site.css": 150_000,
+    "assets/js/analytics.js": 90_000,
+    "ads/adsbygoogle.js": 180_000,
+}
+MIRROR_IMAGE_COUNT = 12
+
+
+def build_report_mirror(directory, row_count=40):
+    """
+    Write a local mirror of the live report page into directory.
+
+    Like the real site, the table body is filled in by a first-party script
+    after the page loads, and the page also pulls images, fonts, CSS, an
+    analytics script and an ad script that the table doesn't need.
+
+    Returns:
+        str: Path of the mirror page relative to directory
+    """
+    page = build_report_page(row_count)
+    body_start = page.index('<tbody id="tableBody">') + len('<tbody id="tableBody">')
+    body_end = page.index("</tbody>", body_start)
+    rows_html = page[body_start:body_end]
+
+    for path, size in MIRROR_ASSETS.items():
+        os.makedirs(os.path.join(directory, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(directory, path), "wb") as f:
+            f.write(os.urandom(size))
+    os.makedirs(os.path.join(directory, "assets/js"), exist_ok=True)
+    with open(os.path.join(directory, "assets/js/report.js"), "w", encoding="utf-8") as f:
+        f.write("setTimeout(function () {\n"
+                f"  document.getElementById('tableBody').innerHTML = {json.dumps(rows_html)};\n"
+                "}, 100);\n")
+
+    head_assets = (
+        '<link rel="stylesheet" href="/assets/css/site.css">\n'
+        '    <link rel="preload" as="font" href="/assets/fonts/inter.woff2" crossorigin>\n'
+        '    <script src="/assets/js/analytics.js"></script>\n'
+        '    <script async src="/ads/adsbygoogle.js"></script>\n'
+    )
+    body_assets = '<img src="/assets/img/logo.png">\n' + "".join(
+        f'    <img src="/assets/img/banner.jpg?{i}">\n' for i in range(MIRROR_IMAGE_COUNT)
+    )
+
+    mirror = page[:body_start] + '\n        <tr><td colspan="12">No data available</td></tr>\n      ' + page[body_end:]
+    mirror = mirror.replace("  </head>", "    " + head_assets + "  </head>")
+    mirror = mirror.replace("<body>", "<body>\n    " + body_assets, 1)
+    mirror = mirror.replace("  </body>", '    <script src="/assets/js/report.js"></script>\n  </body>')
+
+    with open(os.path.join(directory, "mirror.html"), "w", encoding="utf-8") as f:
+        f.write(mirror)
+    return "mirror.html"
+
+
+def compare_engines(url):
+    """
+    Scrape the same page with both engines and report whether the rows match.
+
+    Returns:
+        bool: True if the HTTP and Selenium engines returned identical rows
+    """
+    from scraper import fetch_rows_http, fetch_rows_selenium, parse_ipo_row
+
+    http_rows = [parse_ipo_row(row) for row in fetch_rows_http(url)]
+    selenium_rows = [parse_ipo_row(row) for row in fetch_rows_selenium(url)]
+
+    debug_print(f"HTTP engine: {len(http_rows)} rows, Selenium engine: {len(selenium_rows)} rows")
+    for http_row, selenium_row in zip(http_rows, selenium_rows):
+        if http_row != selenium_row:
+            debug_print(f"Mismatch: {http_row} != {selenium_row}")
+
+    return http_rows == selenium_rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve saved report pages locally")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--directory", default=FIXTURES_DIR)
+    parser.add_argument("--compare", action="store_true",
+                        help="Run both scraping engines against the fixture and compare rows")
+    parser.add_argument("--fail-first", type=int, default=0, help="Fail this many requests first")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Chance of failing any later request")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to stall before every answer")
+    args = parser.parse_args()
+
+    faults = None
+    if args.fail_first or args.fail_rate or args.delay:
+        faults = Faults(args.fail_first, args.fail_rate, args.delay)
+    server, base_url = start_fixture_server(args.directory, args.port, faults)
+    try:
+        if args.compare:
+            identical = compare_engines(base_url + REPORT_PATH)
+            print("[SUCCESS] Engines returned identical rows" if identical else "[FAILED] Engines disagree")
+            raise SystemExit(0 if identical else 1)
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
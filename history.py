@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Historical store of every scraped IPO row.
+
+Each scrape appends all parsed rows (including low-rated ones) to an
+embedded SQLite database indexed by IPO name and scrape time, so GMP
+trajectories can be queried per IPO.
+
+    python history.py list
+    python history.py trend "Shreeji Global FMCG IPO" --since 2026-10-01
+"""
+
+import argparse
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+
+HISTORY_DB = os.getenv("IPO_HISTORY_DB", "ipo_history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ipo_history (
+    id INTEGER PRIMARY KEY,
+    scraped_at TEXT NOT NULL,
+    name TEXT NOT NULL,
+    closing_status TEXT NOT NULL,
+    est_gains TEXT NOT NULL,
+    gmp_pct REAL,
+    rating TEXT NOT NULL,
+    rating_value REAL,
+    close_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ipo_history_name_time ON ipo_history (name, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_ipo_history_time ON ipo_history (scraped_at);
+CREATE TABLE IF NOT EXISTS ipo_summary (
+    name TEXT PRIMARY KEY,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    observations INTEGER NOT NULL,
+    latest_gmp_pct REAL
+);
+CREATE INDEX IF NOT EXISTS idx_ipo_summary_last_seen ON ipo_summary (last_seen);
+"""
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+def connect(db_path=None):
+    """Open the history database, creating the schema if needed."""
+    conn = sqlite3.connect(db_path or HISTORY_DB)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def insert_rows(conn, rows):
+    """
+    Insert history rows and keep the per-IPO summary in step.
+
+    Args:
+        conn: Open connection (caller owns the transaction)
+        rows: (scraped_at, name, closing_status, est_gains, gmp_pct, rating,
+               rating_value, close_date) tuples, oldest first
+    """
+    conn.executemany(
+        "INSERT INTO ipo_history (scraped_at, name, closing_status, est_gains, gmp_pct,"
+        " rating, rating_value, close_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.executemany(
+        "INSERT INTO ipo_summary (name, first_seen, last_seen, observations, latest_gmp_pct)"
+        " VALUES (?, ?, ?, 1, ?)"
+        " ON CONFLICT (name) DO UPDATE SET"
+        "  first_seen = MIN(first_seen, excluded.first_seen),"
+        "  observations = observations + 1,"
+        "  latest_gmp_pct = CASE WHEN excluded.last_seen >= last_seen"
+        "   THEN excluded.latest_gmp_pct ELSE latest_gmp_pct END,"
+        "  last_seen = MAX(last_seen, excluded.last_seen)",
+        [(row[1], row[0], row[0], row[4]) for row in rows],
+    )
+
+
+def record_scrape(ipos, scraped_at=None, db_path=None):
+    """
+    Append one scrape's rows in a single transaction.
+
+    Args:
+        ipos: IpoRecords (or an IpoBatch)
+        scraped_at: Scrape time (defaults to now)
+        db_path: Database path (defaults to IPO_HISTORY_DB)
+
+    Returns:
+        int: Number of rows written
+    """
+    scraped_at = (scraped_at or datetime.now()).isoformat(timespec="seconds")
+    rows = [
+        (scraped_at, ipo.name, ipo.closing_status, ipo.est_gains, ipo.gmp_pct, ipo.rating,
+         ipo.rating_value, ipo.close_date.isoformat() if ipo.close_date else ipo.close_date_text)
+        for ipo in ipos
+    ]
+    with closing(connect(db_path)) as conn, conn:
+        insert_rows(conn, rows)
+    return len(rows)
+
+
+def gmp_trend(name, since=None, until=None, db_path=None):
+    """
+    GMP time series for one IPO, oldest first.
+
+    Rows are only stored when the table changed, so each point holds until
+    the next one.
+
+    Args:
+        name: Exact IPO name (without the O/CT suffix)
+        since: Optional ISO timestamp lower bound (inclusive)
+        until: Optional ISO timestamp upper bound (inclusive)
+
+    Returns:
+        list: (scraped_at, gmp_pct, rating, closing_status) tuples
+    """
+    query = "SELECT scraped_at, gmp_pct, rating, closing_status FROM ipo_history WHERE name = ?"
+    params = [name]
+    if since:
+        query += " AND scraped_at >= ?"
+        params.append(since)
+    if until:
+        query += " AND scraped_at <= ?"
+        params.append(until)
+    query += " ORDER BY scraped_at"
+
+    with closing(connect(db_path)) as conn:
+        return conn.execute(query, params).fetchall()
+
+
+def list_ipos(since=None, db_path=None):
+    """
+    IPOs seen in the store with their first/last sighting and latest GMP.
+
+    Returns:
+        list: (name, first_seen, last_seen, observations, latest_gmp_pct) tuples
+    """
+    query = "SELECT name, first_seen, last_seen, observations, latest_gmp_pct FROM ipo_summary"
+    params = []
+    if since:
+        query += " WHERE last_seen >= ?"
+        params.append(since)
+    query += " ORDER BY last_seen DESC"
+
+    with closing(connect(db_path)) as conn:
+        return conn.execute(query, params).fetchall()
+
+
+def format_gmp(gmp_pct):
+    return f"{gmp_pct:.2f} %" if gmp_pct is not None else "-"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the IPO GMP history store")
+    parser.add_argument("--db", default=HISTORY_DB, help="History database path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List IPOs in the store")
+    list_parser.add_argument("--since", help="Only IPOs seen at or after this ISO timestamp")
+
+    trend_parser = subparsers.add_parser("trend", help="GMP trajectory for one IPO")
+    trend_parser.add_argument("name", help="IPO name, e.g. \"Orkla India IPO\"")
+    trend_parser.add_argument("--since", help="ISO timestamp lower bound")
+    trend_parser.add_argument("--until", help="ISO timestamp upper bound")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, first_seen, last_seen, count, latest in list_ipos(args.since, args.db):
+            print(f"{name:45} {first_seen} -> {last_seen}  {count:6d} obs  GMP {format_gmp(latest)}")
+    else:
+        points = gmp_trend(args.name, args.since, args.until, args.db)
+        if not points:
+            print(f"No history for {args.name}")
+        for scraped_at, gmp_pct, rating, closing_status in points:
+            print(f"{scraped_at}  {format_gmp(gmp_pct):>9}  {rating:10} {closing_status}")
@@ -6,51 +6,114 @@ This module orchestrates the scraping and email notification process for high-ra
 """
 
 import sys
-import io
 from datetime import datetime
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Set UTF-8 encoding only once
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
-from scraper import scrape_ipo_table
-from emailer import send_email
+import metrics
 
 
 def debug_print(message):
     print(f"[MAIN] {message}")
 
 
-def main():
+def setup_environment():
+    """
+    Load .env and switch stdout to UTF-8 (IPO names contain ₹ and 🔥).
+
+    Must run before scraper or emailer are imported, since both read their
+    settings from the environment at import time.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    if sys.stdout.encoding.lower() != 'utf-8':
+        sys.stdout.reconfigure(encoding='utf-8')
+
+
+def main(session=None, send=True):
     """
     Main function that orchestrates the IPO scraping and email notification process.
+
+    Args:
+        session: Optional DriverSession reused across runs by the daemon
+        send: Email the digest; False only scrapes and caches it
     """
+    from scraper import finalize_status, update_scraper_status
+
+    metrics.reset()
+    started = datetime.now()
+    try:
+        with metrics.span("total"):
+            run(session, send)
+    except Exception as e:
+        # Otherwise the status file still holds the previous run's record
+        update_scraper_status("error", f"Run failed: {e}", error_details=repr(e))
+        raise
+    finally:
+        finalize_status(since=started)
+
+
+def run(session=None, send=True):
+    """Scrape, then email each subscriber the IPOs their filter profile selects."""
+    from alert_diff import record_sent
+    from enrichment import enrich_ipos
+    from notifications import notify
+    from scraper import scrape_ipo_table, update_scraper_status
+    from snapshot_cache import mark_delivered, save_digests
+    from subscriptions import load_subscriptions, lowest_min_rating, plan_digests
+
     debug_print("=" * 50)
     debug_print("IPO Scraper Bot Started")
     debug_print(f"Timestamp: {datetime.now()}")
     debug_print("=" * 50)
 
+    try:
+        subscriptions = load_subscriptions()
+    except ValueError as e:
+        # Nobody can be emailed until the config is fixed; make sure CI notices
+        debug_print(f"Not scraping: {e}")
+        update_scraper_status("error", "Invalid subscription config - no emails sent", error_details=str(e))
+        return
+
     # Step 1: Scrape IPO data
     debug_print("Step 1: Scraping IPO data...")
-    ipo_data = scrape_ipo_table()
+    ipo_data = scrape_ipo_table(session=session, min_rating=lowest_min_rating(subscriptions))
 
     if not ipo_data:
         debug_print("No high-rated IPOs found. Process completed.")
         return
 
-    debug_print(f"Found {len(ipo_data)} high-rated IPOs")
+    debug_print(f"Found {len(ipo_data)} IPOs within the loosest subscriber filter")
+    if not subscriptions:
+        debug_print("No email recipients configured (EMAIL_RECIPIENTS, config/recipients.txt "
+                    "or config/subscriptions.json)")
+        return
+
+    ipo_data = enrich_ipos(ipo_data)
+    digests = plan_digests(ipo_data, subscriptions)
+    if not digests:
+        debug_print("No new or materially changed IPOs for any subscriber. Process completed.")
+        mark_delivered(len(ipo_data))
+        return
+
+    save_digests(digests)
+
+    if not send:
+        debug_print("Sending skipped; digests cached for 'cli.py send'")
+        return
 
-    # Step 2: Send email notifications
-    debug_print("Step 2: Sending email notifications...")
-    email_success = send_email(ipo_data)
+    # Step 2: Email the digests, and post their alerts to any chat/webhook channels
+    debug_print(f"Step 2: Sending {len(digests)} distinct digests...")
+    results = notify(digests)
+    for digest, sent in zip(digests, results):
+        if sent:
+            record_sent(digest.ipos, digest.profiles)
 
-    if email_success:
+    if all(results):
+        # Only now is this table handled; a failed send is retried on the next run
+        mark_delivered(len(ipo_data))
         debug_print("Email process completed successfully")
     else:
-        debug_print("Email process failed")
+        debug_print(f"Email process failed for {results.count(False)} of {len(digests)} digests")
 
     debug_print("=" * 50)
     debug_print("IPO Scraper Bot Completed")
@@ -59,4 +122,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    setup_environment()
+    main()
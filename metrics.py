@@ -0,0 +1,57 @@
+"""
+Lightweight per-run instrumentation.
+
+Phases are timed with span() and accumulate wall-clock seconds per name;
+counters are plain integers. Both are process-global and thread-safe, are
+cleared by reset() at the start of each run, and end up in
+scraper_status.json via snapshot().
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+_lock = threading.Lock()
+_phases = {}
+_counters = {}
+
+
+def reset():
+    with _lock:
+        _phases.clear()
+        _counters.clear()
+
+
+@contextmanager
+def span(name):
+    """
+    Time a block under a phase name.
+
+    Spans with the same name add up, including spans running concurrently
+    on worker threads (so a phase can exceed the run's wall-clock time).
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _phases[name] = _phases.get(name, 0.0) + elapsed
+
+
+def incr(name, value=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def snapshot():
+    """
+    Returns:
+        dict: {"phases": {name: seconds}, "counters": {name: count}}
+    """
+    with _lock:
+        return {
+            "phases": {name: round(seconds, 3) for name, seconds in _phases.items()},
+            "counters": dict(_counters),
+        }
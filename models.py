@@ -0,0 +1,239 @@
+"""
+Typed IPO records.
+
+IpoRecord holds one IPO with its numeric GMP, rating and close date parsed
+once at scrape time. IpoBatch stores many records column by column for
+bulk filtering and sorting.
+"""
+
+import math
+import re
+from array import array
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import date, datetime
+
+
+HIGH_RATING = 4.0
+
+_GMP_PERCENT = re.compile(r'\((-?\d+(\.\d+)?)%\)')
+_RATING = re.compile(r'(\d+(\.\d+)?)/5')
+_BLANK = ("", None, "No Rating")
+# (display text, parsed value) fields that must come from the same source
+_PAIRED_FIELDS = (("est_gains", "gmp_pct"), ("rating", "rating_value"), ("close_date_text", "close_date"))
+
+
+def parse_close_date(text, today=None):
+    """
+    Parse a year-less "13-Oct" close date into the nearest matching date.
+
+    The report omits the year, so pick the year that puts the date closest
+    to today (a December scrape of "02-Jan" means next January).
+
+    Returns:
+        date or None if the text isn't a date
+    """
+    today = today or date.today()
+    try:
+        parsed = datetime.strptime(f"{text.strip()}-{today.year}", '%d-%b-%Y').date()
+    except ValueError:
+        return None
+    candidates = []
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidates.append(parsed.replace(year=year))
+        except ValueError:  # 29-Feb outside a leap year
+            pass
+    return min(candidates, key=lambda d: abs((d - today).days))
+
+
+def parse_rating_value(rating):
+    match = _RATING.search(rating)
+    return float(match.group(1)) if match else None
+
+
+@dataclass(frozen=True, slots=True)
+class IpoRecord:
+    name: str
+    closing_status: str           # "O" (open), "CT" (closes today) or ""
+    est_gains: str                # display text, e.g. "20.62 %"
+    gmp_pct: float | None         # 20.62, or None when the report has no GMP
+    rating: str                   # display text, e.g. "4.0/5" or "No Rating"
+    rating_value: float | None    # 4.0, or None when unrated
+    close_date: date | None
+    close_date_text: str          # as shown on the report, e.g. "13-Oct"
+    detail_url: str = ""          # the IPO's own page, linked from its name
+    # Filled in from the detail page by enrichment.py; display text, "" if unknown
+    subscription: str = ""        # e.g. "12.4x"
+    price_band: str = ""          # e.g. "₹78 to ₹83"
+    lot_size: str = ""            # e.g. "1600 Shares"
+    issue_size: str = ""          # e.g. "₹85.00 Cr"
+    # ((site, gmp_pct), ...) from every site reporting this IPO, first site first
+    source_gmps: tuple = ()
+
+    @classmethod
+    def from_cells(cls, name, closing_status, gmp_text, fire_text, close_date_text, today=None,
+                   detail_url=""):
+        """
+        Build a record from cleaned report cell texts, parsing every field once.
+
+        Args:
+            name: IPO name without the O/CT suffix
+            closing_status: "O", "CT" or ""
+            gmp_text: GMP cell, e.g. "₹100 (20.62%)"
+            fire_text: Rating cell (one 🔥 per rating point)
+            close_date_text: Close date cell, e.g. "13-Oct"
+            today: Reference date for the year-less close date
+            detail_url: Absolute URL of the IPO's detail page
+        """
+        match = _GMP_PERCENT.search(gmp_text)
+        fire_count = fire_text.count("🔥")
+        return cls(
+            name=name,
+            closing_status=closing_status,
+            est_gains=match.group(1) + ' %' if match else gmp_text,
+            gmp_pct=float(match.group(1)) if match else None,
+            rating=f"{fire_count}.0/5" if fire_count else "No Rating",
+            rating_value=float(fire_count) if fire_count else None,
+            close_date=parse_close_date(close_date_text, today),
+            close_date_text=close_date_text,
+            detail_url=detail_url,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict()."""
+        close_date = data.get("close_date")
+        return cls(**{**data, "close_date": date.fromisoformat(close_date) if close_date else None,
+                      "source_gmps": tuple(tuple(pair) for pair in data.get("source_gmps", ()))})
+
+    def to_dict(self):
+        """JSON-serialisable dict (close_date as an ISO string)."""
+        data = asdict(self)
+        data["close_date"] = self.close_date.isoformat() if self.close_date else None
+        return data
+
+    @property
+    def is_high_rating(self):
+        return self.rating_value is not None and self.rating_value >= HIGH_RATING
+
+    @property
+    def is_sme(self):
+        """SME issues carry "SME" in their report name, e.g. "Curis Lifesciences NSE SME IPO"."""
+        return "SME" in self.name.split()
+
+    @property
+    def gmp_spread(self):
+        """Percentage points between the highest and lowest site GMP (None below two sites)."""
+        if len(self.source_gmps) < 2:
+            return None
+        values = [gmp for _, gmp in self.source_gmps]
+        return round(max(values) - min(values), 2)
+
+    def days_remaining(self, today=None):
+        """Whole days until the close date, or None if it is unknown."""
+        if self.close_date is None:
+            return None
+        return (self.close_date - (today or date.today())).days
+
+    def merged_with(self, other):
+        """
+        Return this record with blank or unrated fields filled in from other.
+
+        A display text and its parsed value are taken together, and only when
+        this record lacks the value, so a card never shows one source's "--"
+        next to another source's GMP.
+        """
+        updates = {}
+        for text, value in _PAIRED_FIELDS:
+            if getattr(self, value) is not None:
+                continue
+            if getattr(other, value) is not None or (
+                    getattr(self, text) in _BLANK and getattr(other, text) not in _BLANK):
+                updates[text] = getattr(other, text)
+                updates[value] = getattr(other, value)
+        paired = {name for pair in _PAIRED_FIELDS for name in pair}
+        updates.update({
+            field.name: getattr(other, field.name)
+            for field in fields(self)
+            if field.name not in paired
+            and getattr(self, field.name) in _BLANK
+            and getattr(other, field.name) not in _BLANK
+        })
+        return replace(self, **updates) if updates else self
+
+    def consolidated_with(self, other):
+        """
+        merged_with() for the same IPO seen in another report, also keeping
+        other's GMP for each site this record has none from yet.
+        """
+        merged = self.merged_with(other)
+        sites = {site for site, _ in self.source_gmps}
+        extra = tuple(pair for pair in other.source_gmps if pair[0] not in sites)
+        return replace(merged, source_gmps=self.source_gmps + extra) if extra else merged
+
+
+class IpoBatch:
+    """
+    Column-oriented container of IpoRecords.
+
+    Numeric columns (gmp_pct, rating_value) are float arrays with NaN for
+    missing values, so filters and sorts run over flat columns instead of
+    attribute lookups on every record.
+    """
+
+    __slots__ = ("records", "gmp_pct", "rating_value")
+
+    def __init__(self, records=()):
+        self.records = list(records)
+        self.gmp_pct = array('d', (math.nan if r.gmp_pct is None else r.gmp_pct for r in self.records))
+        self.rating_value = array('d', (math.nan if r.rating_value is None else r.rating_value
+                                        for r in self.records))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def __repr__(self):
+        return f"IpoBatch({len(self.records)} records)"
+
+    def names(self):
+        return [r.name for r in self.records]
+
+    def take(self, indices):
+        """New batch with the records at the given positions."""
+        return IpoBatch(self.records[i] for i in indices)
+
+    def filter(self, min_rating=None, min_gmp=None, predicate=None):
+        """
+        New batch of records passing every given threshold.
+
+        Args:
+            min_rating: Minimum rating value (unrated records never pass)
+            min_gmp: Minimum GMP percentage (records without GMP never pass)
+            predicate: Extra per-record callable
+        """
+        keep = range(len(self.records))
+        if min_rating is not None:
+            ratings = self.rating_value
+            keep = [i for i in keep if ratings[i] >= min_rating]  # NaN compares False
+        if min_gmp is not None:
+            gmps = self.gmp_pct
+            keep = [i for i in keep if gmps[i] >= min_gmp]
+        if predicate is not None:
+            keep = [i for i in keep if predicate(self.records[i])]
+        return self.take(keep)
+
+    def high_rated(self):
+        return self.filter(min_rating=HIGH_RATING)
+
+    def sort_by_gmp(self, descending=True):
+        """New batch ordered by GMP, records without GMP last."""
+        gmps = self.gmp_pct
+        order = sorted(range(len(self.records)),
+                       key=lambda i: (math.isnan(gmps[i]), -gmps[i] if descending else gmps[i]))
+        return self.take(order)
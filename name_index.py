@@ -0,0 +1,79 @@
+"""
+Normalized-name index for matching one IPO across sites.
+
+Sites spell the same issue differently ("Orkla India IPO O", "Orkla India
+Ltd", "ORKLA INDIA LIMITED (SME)"). normalize_name() reduces all of them
+to "orkla india". NameIndex matches a name to a known IPO by that key,
+and failing an exact hit, by fuzzy similarity against the keys that start
+with the same three letters, so lookups stay cheap as the table grows.
+"""
+
+import difflib
+import os
+import re
+
+import metrics
+
+
+NAME_MATCH_CUTOFF = float(os.getenv("IPO_NAME_MATCH_CUTOFF", "0.88"))
+
+# Words that say how or where an IPO lists, not which company it is
+NOISE_WORDS = frozenset({"ipo", "ltd", "limited", "sme", "nse", "bse", "emerge", "pvt", "private"})
+_STATUS_SUFFIX = re.compile(r"\s+(O|CT)$")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_name(name):
+    """
+    Matching key for an IPO name: lower case, no punctuation, no
+    open/closes-today marker and no NOISE_WORDS.
+    """
+    name = _STATUS_SUFFIX.sub("", name.strip()).lower().replace("&", " and ")
+    return " ".join(word for word in _WORD.findall(name) if word not in NOISE_WORDS)
+
+
+class NameIndex:
+    """
+    Assigns every IPO name a canonical key, reusing the key of an already
+    seen name that normalizes to the same (or a close enough) string.
+
+    Fuzzy matches only join names from different sites that carry the same
+    numbers, since one site never lists an IPO twice and "Fund 2" is not
+    "Fund 3".
+    """
+
+    def __init__(self, cutoff=NAME_MATCH_CUTOFF):
+        self.cutoff = cutoff
+        self.sites = {}   # key -> sites that reported it
+        self.blocks = {}  # first three letters -> keys starting with them
+
+    @staticmethod
+    def _block(key):
+        return key.replace(" ", "")[:3]
+
+    def key_for(self, name, site=None):
+        """
+        Canonical key for name, registering it if no known name matches.
+
+        Args:
+            name: IPO name as the site shows it
+            site: Site the name comes from
+
+        Returns:
+            str: The matched key, or name's own normalized key if it is new
+        """
+        key = normalize_name(name) or name.strip().lower()
+        if key not in self.sites:
+            block = self.blocks.setdefault(self._block(key), [])
+            numbers = re.findall(r"\d+", key)
+            candidates = [known for known in block
+                          if site not in self.sites[known] and re.findall(r"\d+", known) == numbers]
+            match = difflib.get_close_matches(key, candidates, n=1, cutoff=self.cutoff)
+            if match:
+                metrics.incr("fuzzy_name_matches")
+                key = match[0]
+            else:
+                self.sites[key] = set()
+                block.append(key)
+        self.sites[key].add(site)
+        return key
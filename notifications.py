@@ -0,0 +1,356 @@
+"""
+Notification channels and the asyncio dispatcher that fans alerts out to them.
+
+Email is one Channel among several. Each channel has its own bounded
+queue (a full queue makes the producer wait, which is the backpressure),
+its own batching (up to batch_size items, or whatever arrived within
+batch_window seconds) and a limit on batches in flight. All channels
+run at once, so a slow webhook overlaps the SMTP delivery instead of
+being added to it. Optional channels give up at IPO_NOTIFY_TIMEOUT;
+required ones always run to completion, since a delivery that finished
+after the deadline must still count as sent.
+
+Email takes the planned Digests. Chat and webhook channels take one Alert
+per IPO in any digest, so a Slack channel gets each IPO once however many
+filter profiles include it. Channels are enabled by their settings:
+
+    SLACK_WEBHOOK_URL                      Slack incoming webhook
+    TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID   Telegram bot sendMessage
+    IPO_WEBHOOK_URLS                       comma-separated URLs receiving JSON
+
+Only the email channel is required: a digest counts as sent (and is not
+retried next run) once email delivered it. The other channels are best
+effort, and their failures are logged and counted in the run's metrics.
+With email as the only channel, notify() sends directly and never starts
+an event loop, which keeps asyncio out of `cli.py send`'s import budget.
+webhook_stub.py stands in for all three HTTP endpoints offline.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import metrics
+from models import IpoRecord
+
+
+NOTIFY_TIMEOUT = float(os.getenv("IPO_NOTIFY_TIMEOUT", "120"))
+HTTP_CHANNEL_TIMEOUT = float(os.getenv("IPO_WEBHOOK_TIMEOUT", "10"))
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+
+CHANGE_LABELS = {
+    "new": "NEW",
+    "closing_today": "CLOSING TODAY",
+    "rating_changed": "RE-RATED",
+    "gmp_moved": "GMP MOVED",
+}
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+@dataclass(frozen=True)
+class Alert:
+    """One IPO for the chat and webhook channels, with its alert_diff change kind."""
+
+    ipo: IpoRecord
+    change: str | None = None
+
+    def to_text(self):
+        """One line, e.g. "Orkla India IPO: GMP 13.12 %, 4.0/5, closes 04-Nov [NEW]"."""
+        label = CHANGE_LABELS.get(self.change)
+        return (f"{self.ipo.name}: GMP {self.ipo.est_gains}, {self.ipo.rating}, "
+                f"closes {self.ipo.close_date_text}" + (f" [{label}]" if label else ""))
+
+
+def alerts_from_digests(digests):
+    """One Alert per IPO across all digests, in first-seen order."""
+    alerts = {}
+    for digest in digests:
+        for ipo in digest.ipos:
+            alerts.setdefault(ipo.name, Alert(ipo, digest.changes.get(ipo.name)))
+    return list(alerts.values())
+
+
+class Channel:
+    """
+    One notification destination.
+
+    Subclasses set the class attributes below and implement send_batch().
+    """
+
+    name = "channel"
+    required = False      # must deliver for a digest to count as sent
+    batch_size = 20       # most items per send_batch() call
+    batch_window = 0.0    # seconds to wait for a batch to fill up
+    concurrency = 2       # batches in flight at once
+    queue_size = 100      # items waiting before producers are held back
+
+    def accepts(self, item):
+        return isinstance(item, Alert)
+
+    async def send_batch(self, items, deadline=None):
+        """
+        Deliver items.
+
+        Args:
+            items: Up to batch_size accepted items
+            deadline: time.monotonic() value to be done by (None for required
+                channels). Blocking work left running past it would hold up
+                asyncio.run(), which waits for its worker threads.
+
+        Returns:
+            list: True/False per item (raising fails the whole batch)
+        """
+        raise NotImplementedError
+
+
+class EmailChannel(Channel):
+    """Digests through emailer.send_digests(), one shared SMTP pool per batch."""
+
+    name = "email"
+    required = True
+    batch_size = 1000
+    concurrency = 1
+
+    def accepts(self, item):
+        from emailer import Digest
+
+        return isinstance(item, Digest)
+
+    async def send_batch(self, items, deadline=None):
+        import asyncio
+        from emailer import send_digests
+
+        return await asyncio.to_thread(send_digests, items)
+
+
+class WebhookChannel(Channel):
+    """POSTs each batch of alerts as JSON: {"sent_at", "alerts": [IpoRecord.to_dict() + "change"]}."""
+
+    name = "webhook"
+
+    def __init__(self, url, name=None, timeout=HTTP_CHANNEL_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        if name:
+            self.name = name
+
+    def payload(self, alerts):
+        return {
+            "sent_at": datetime.now().isoformat(timespec="seconds"),
+            "alerts": [{**alert.ipo.to_dict(), "change": alert.change} for alert in alerts],
+        }
+
+    async def send_batch(self, items, deadline=None):
+        import asyncio
+
+        await asyncio.to_thread(self.post, self.payload(items), deadline)
+        return [True] * len(items)
+
+    def post(self, payload, deadline=None):
+        import requests
+        from resilience import RetryPolicy, call_with_retry
+
+        def attempt():
+            timeout = self.timeout
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    raise TimeoutError(f"{self.name}: notification deadline passed")
+            response = requests.post(self.url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            return response
+
+        # 429 and 5xx are retried; Slack and Telegram both rate limit with 429
+        call_with_retry(attempt, RetryPolicy(max_attempts=3, base_delay=1, max_delay=5), deadline,
+                        description=f"Posting to {self.name}")
+
+
+class SlackChannel(WebhookChannel):
+    """Slack incoming webhook: one message per batch, one line per IPO."""
+
+    name = "slack"
+    concurrency = 1  # Slack allows about one message per second per webhook
+
+    def payload(self, alerts):
+        lines = "\n".join(f"• {alert.to_text()}" for alert in alerts)
+        return {"text": f"*IPO Alerts - {datetime.now():%d %B %Y}*\n{lines}"}
+
+
+class TelegramChannel(WebhookChannel):
+    """Telegram bot sendMessage; batches stay well under the 4096-character limit."""
+
+    name = "telegram"
+    batch_size = 15
+    concurrency = 1
+
+    def __init__(self, token, chat_id, api_url=TELEGRAM_API_URL, timeout=HTTP_CHANNEL_TIMEOUT):
+        super().__init__(f"{api_url}/bot{token}/sendMessage", timeout=timeout)
+        self.chat_id = chat_id
+
+    def payload(self, alerts):
+        lines = "\n".join(alert.to_text() for alert in alerts)
+        return {"chat_id": self.chat_id, "text": f"IPO Alerts - {datetime.now():%d %B %Y}\n{lines}",
+                "disable_web_page_preview": True}
+
+
+def configured_channels():
+    """Email plus every chat or webhook channel whose settings are present."""
+    channels = [EmailChannel()]
+    if os.getenv("SLACK_WEBHOOK_URL"):
+        channels.append(SlackChannel(os.environ["SLACK_WEBHOOK_URL"]))
+    if os.getenv("TELEGRAM_BOT_TOKEN") and os.getenv("TELEGRAM_CHAT_ID"):
+        channels.append(TelegramChannel(os.environ["TELEGRAM_BOT_TOKEN"], os.environ["TELEGRAM_CHAT_ID"]))
+    urls = [url.strip() for url in os.getenv("IPO_WEBHOOK_URLS", "").split(",") if url.strip()]
+    for i, url in enumerate(urls, 1):
+        channels.append(WebhookChannel(url, name=f"webhook{i}" if len(urls) > 1 else "webhook"))
+    return channels
+
+
+_DONE = object()
+
+
+class Dispatcher:
+    """
+    Fans items out to every channel that accepts them.
+
+    Returns from run() once every channel has drained its queue, or once
+    only required channels are left and the timeout has passed; items an
+    optional channel never got to count as failed.
+    """
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.results = {}  # (channel name, id(item)) -> delivered
+        self.deadline = None
+
+    async def run(self, items, timeout=NOTIFY_TIMEOUT):
+        import asyncio
+
+        self.deadline = time.monotonic() + timeout
+        required, optional = [], []
+        for channel in self.channels:
+            queue = asyncio.Queue(channel.queue_size)
+            tasks = required if channel.required else optional
+            tasks.append(asyncio.create_task(self._feed(channel, queue, items)))
+            tasks.append(asyncio.create_task(self._worker(channel, queue)))
+        try:
+            async with asyncio.timeout(timeout):
+                await asyncio.gather(*optional)
+        except TimeoutError:
+            debug_print(f"Notification dispatch timed out after {timeout:.0f}s")
+            metrics.incr("notify_timeouts")
+        finally:
+            for task in optional:
+                task.cancel()
+            await asyncio.gather(*optional, return_exceptions=True)
+        # No deadline here: cancelling only abandons a send_digests() thread
+        # that goes on delivering, and the digests would be sent again next run
+        await asyncio.gather(*required)
+
+    async def _feed(self, channel, queue, items):
+        for item in items:
+            if channel.accepts(item):
+                await queue.put(item)  # waits while the channel is backed up
+        await queue.put(_DONE)
+
+    def delivered(self, channel, item):
+        return self.results.get((channel.name, id(item)), False)
+
+    async def _worker(self, channel, queue):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(channel.concurrency)
+        in_flight = set()
+        finished = False
+        try:
+            while not finished:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                batch = [item]
+                fill_by = loop.time() + channel.batch_window
+                while len(batch) < channel.batch_size:
+                    try:
+                        if queue.empty():
+                            async with asyncio.timeout_at(fill_by):
+                                item = await queue.get()
+                        else:
+                            item = queue.get_nowait()
+                    except TimeoutError:
+                        break
+                    if item is _DONE:
+                        finished = True
+                        break
+                    batch.append(item)
+
+                # Not taking more items while every slot is busy is what fills the queue up
+                await slots.acquire()
+                task = asyncio.create_task(self._send(channel, batch, slots))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            await asyncio.gather(*in_flight)
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _send(self, channel, batch, slots):
+        try:
+            with metrics.span(f"notify_{channel.name}"):
+                delivered = await channel.send_batch(batch, None if channel.required else self.deadline)
+        except Exception as e:
+            debug_print(f"{channel.name}: batch of {len(batch)} failed: {e}")
+            delivered = [False] * len(batch)
+        finally:
+            slots.release()
+        for item, ok in zip(batch, delivered):
+            self.results[(channel.name, id(item))] = ok
+        metrics.incr(f"notify_{channel.name}_sent", sum(delivered))
+        if not all(delivered):
+            metrics.incr(f"notify_{channel.name}_failed", len(batch) - sum(delivered))
+
+
+def notify(digests, channels=None, timeout=NOTIFY_TIMEOUT):
+    """
+    Send digests by email and their alerts to the other channels, concurrently.
+
+    Args:
+        digests: emailer.Digests, e.g. from subscriptions.plan_digests()
+        channels: Channels to use (default: configured_channels())
+        timeout: Seconds the optional channels may take; required ones always finish
+
+    Returns:
+        list: True/False per digest: delivered by every required channel
+    """
+    channels = configured_channels() if channels is None else channels
+    if len(channels) == 1 and isinstance(channels[0], EmailChannel):
+        # Nothing to overlap the SMTP delivery with, so no event loop (or asyncio import) either
+        from emailer import send_digests
+
+        with metrics.span("notify_email"):
+            results = send_digests(digests)
+        metrics.incr("notify_email_sent", sum(results))
+        if not all(results):
+            metrics.incr("notify_email_failed", len(results) - sum(results))
+        return results
+
+    import asyncio
+
+    alerts = alerts_from_digests(digests)
+    dispatcher = Dispatcher(channels)
+    debug_print(f"Dispatching {len(digests)} digests and {len(alerts)} alerts to "
+                f"{', '.join(channel.name for channel in channels)}")
+    asyncio.run(dispatcher.run([*digests, *alerts], timeout))
+
+    for channel in channels:
+        if not channel.required:
+            items = [item for item in (*digests, *alerts) if channel.accepts(item)]
+            sent = sum(dispatcher.delivered(channel, item) for item in items)
+            debug_print(f"{channel.name}: {sent}/{len(items)} delivered")
+    return [all(dispatcher.delivered(channel, digest) for channel in channels
+                if channel.required and channel.accepts(digest))
+            for digest in digests]
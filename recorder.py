@@ -0,0 +1,199 @@
+"""
+Record and replay of everything the bot fetches and sends.
+
+With IPO_RECORD_DIR set, every page the scraper and the enrichment stage
+download is saved under <dir>/pages/ by URL path, and listed in
+<dir>/manifest.json. Every SMTP delivery is appended to
+<dir>/smtp/transcript.jsonl, and each distinct message is saved once as
+<dir>/smtp/<sha256>.eml.
+
+replay() serves a recording with fixture_server.py and a stub SMTP server
+and runs the whole pipeline against them, so scraping, rendering and
+delivery can be measured without investorgain.com or Gmail. It then
+compares what was delivered with the recorded transcript.
+
+    python cli.py scrape --record recordings/2026-10-17 --no-send
+    python cli.py replay recordings/2026-10-17
+"""
+
+import email
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+
+RECORD_DIR = os.getenv("IPO_RECORD_DIR")
+
+_lock = threading.Lock()
+
+
+def debug_print(message):
+    print(f"[RECORDER {datetime.now()}] {message}")
+
+
+def is_recording():
+    return bool(RECORD_DIR)
+
+
+def page_path(url):
+    """Path of a recorded page relative to <dir>/pages/ ("/a/b/" -> "a/b/index.html")."""
+    path = urlparse(url).path or "/"
+    if path.endswith("/"):
+        path += "index.html"
+    return path.lstrip("/")
+
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"pages": {}}
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def record_page(url, content, kind):
+    """
+    Save one downloaded page.
+
+    Args:
+        url: URL it was fetched from
+        content: Page bytes (for Chrome, the rendered DOM)
+        kind: "report" or "detail"
+    """
+    if not is_recording():
+        return
+    relative = page_path(url)
+    with _lock:
+        _write(os.path.join(RECORD_DIR, "pages", relative), content)
+        manifest = load_manifest(RECORD_DIR)
+        manifest["pages"][url] = {"path": relative, "kind": kind,
+                                  "recorded_at": datetime.now().isoformat(timespec="seconds")}
+        _write(os.path.join(RECORD_DIR, "manifest.json"),
+               json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def record_delivery(sender, recipient, payload, error=None):
+    """Append one SMTP delivery attempt to the transcript."""
+    if not is_recording():
+        return
+    digest = hashlib.sha256(payload).hexdigest()
+    entry = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "from": sender,
+        "to": recipient,
+        "message": digest,
+        "bytes": len(payload),
+        "error": str(error) if error is not None else None,
+    }
+    with _lock:
+        message_path = os.path.join(RECORD_DIR, "smtp", f"{digest}.eml")
+        if not os.path.exists(message_path):
+            _write(message_path, payload)
+        with open(os.path.join(RECORD_DIR, "smtp", "transcript.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def load_transcript(directory):
+    path = os.path.join(directory, "smtp", "transcript.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+_DATES = re.compile(r"\d{1,2} [A-Z][a-z]+ \d{4}|-?\d+ days")
+
+
+def message_fingerprint(payload):
+    """
+    Hash of a message's HTML with dates and day counts blanked out, so a
+    replay on another day still matches its recording.
+    """
+    message = email.message_from_bytes(payload)
+    parts = [part.get_payload(decode=True) or b"" for part in message.walk()
+             if part.get_content_type() == "text/html"]
+    html = b"".join(parts).decode("utf-8", "replace")
+    return hashlib.sha256(_DATES.sub("", html).encode("utf-8")).hexdigest()
+
+
+def replay(directory, send=True):
+    """
+    Run the pipeline against a recording and compare deliveries.
+
+    Must be called before scraper, emailer or main are imported, since
+    those read the settings it overrides at import time.
+
+    Args:
+        directory: Recording made with IPO_RECORD_DIR
+        send: Also deliver (to the stub) and compare with the transcript
+
+    Returns:
+        bool: True if every recorded delivery was reproduced
+    """
+    manifest = load_manifest(directory)
+    reports = [url for url, page in manifest["pages"].items() if page["kind"] == "report"]
+    if not reports:
+        raise ValueError(f"No recorded report pages in {directory}")
+    transcript = [entry for entry in load_transcript(directory) if entry["error"] is None]
+
+    from fixture_server import start_fixture_server
+    from smtp_stub import StubSMTPServer
+
+    server, base_url = start_fixture_server(os.path.join(directory, "pages"))
+    stub = StubSMTPServer().start()
+    workdir = tempfile.mkdtemp(prefix="ipo-replay-")
+    # Nothing may leave the machine: no recording, chat or webhook deliveries
+    for name in ("IPO_RECORD_DIR", "SLACK_WEBHOOK_URL", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID",
+                 "IPO_WEBHOOK_URLS"):
+        os.environ.pop(name, None)
+    os.environ.update(
+        IPO_REPORTS=",".join(f"recorded{i}={base_url}/{manifest['pages'][url]['path']}".removesuffix("index.html")
+                             for i, url in enumerate(reports, 1)),
+        # Only the recorded reports and recipients, even if config/ lists more
+        IPO_SOURCES=os.path.join(workdir, "no-sources.json"),
+        IPO_SUBSCRIPTIONS=os.path.join(workdir, "no-subscriptions.json"),
+        IPO_CACHE_DIR=os.path.join(workdir, "cache"),
+        IPO_HISTORY_DB=os.path.join(workdir, "ipo_history.db"),
+        IPO_FEED_DIR=os.path.join(workdir, "feed"),
+        IPO_STATUS_FILE=os.path.join(workdir, "scraper_status.json"),
+        IPO_STATUS_LOG=os.path.join(workdir, "scraper_status_log.jsonl"),
+        SMTP_HOST="127.0.0.1", SMTP_PORT=str(stub.port), SMTP_SSL="0",
+        GMAIL_USER=transcript[0]["from"] if transcript else "replay@example.com",
+        GMAIL_PASSWORD="replay",
+    )
+    if transcript:
+        os.environ["EMAIL_RECIPIENTS"] = ",".join(dict.fromkeys(entry["to"] for entry in transcript))
+    debug_print(f"Replaying {len(reports)} report pages from {directory} at {base_url} (workdir {workdir})")
+
+    try:
+        from main import main
+        main(send=send)
+    finally:
+        server.shutdown()
+        stub.stop()
+
+    if not send:
+        return True
+
+    recorded = set()
+    for entry in transcript:
+        with open(os.path.join(directory, "smtp", f"{entry['message']}.eml"), "rb") as f:
+            recorded.add((entry["to"], message_fingerprint(f.read())))
+    delivered = {(recipient, message_fingerprint(data))
+                 for _, recipients, data in stub.messages for recipient in recipients}
+
+    matched = len(recorded & delivered)
+    debug_print(f"Matched {matched}/{len(recorded)} recorded deliveries "
+                f"({len(delivered - recorded)} new or different)")
+    return matched == len(recorded)
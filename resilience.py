@@ -0,0 +1,243 @@
+"""
+Retries, hedging and circuit breaking for report fetches.
+
+RetryPolicy spaces attempts with capped exponential backoff plus jitter
+and never sleeps past the caller's deadline. hedged() starts a backup
+call when the primary one stalls and takes whichever succeeds first.
+CircuitBreaker counts consecutive failures per host and, once open, fails
+fast until a cooldown has passed. Its state lives in the cache directory,
+so separate scheduled runs stop hammering a failing site too.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+
+import metrics
+from snapshot_cache import CACHE_DIR, write_json
+
+
+RETRY_ATTEMPTS = int(os.getenv("IPO_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("IPO_RETRY_BASE_DELAY", "2"))
+RETRY_MAX_DELAY = float(os.getenv("IPO_RETRY_MAX_DELAY", "30"))
+BREAKER_THRESHOLD = int(os.getenv("IPO_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("IPO_BREAKER_COOLDOWN", "900"))
+BREAKER_FILE = os.path.join(CACHE_DIR, "circuit_breakers.json")
+
+# Client errors that a retry can fix; any other 4xx won't change on its own
+RETRYABLE_CLIENT_STATUSES = (408, 425, 429)
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = RETRY_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+
+    def backoff(self, attempt, rng=random):
+        """
+        Pause before retry number attempt (1-based): half of the capped
+        exponential delay is fixed, the other half random, so runs that
+        failed together don't retry in lockstep.
+        """
+        capped = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return capped / 2 + rng.uniform(0, capped / 2)
+
+
+def is_retryable(error):
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None and 400 <= status < 500:
+        return status in RETRYABLE_CLIENT_STATUSES
+    return True
+
+
+def call_with_retry(func, policy=None, deadline=None, breaker=None, description="call"):
+    """
+    Call func until it succeeds, the policy runs out of attempts or the
+    next backoff would end past the deadline.
+
+    Args:
+        func: Zero-argument callable
+        policy: RetryPolicy (defaults to the IPO_RETRY_* settings)
+        deadline: time.monotonic() value no retry may sleep beyond
+        breaker: Optional CircuitBreaker guarding every attempt
+        description: What is being called, for log lines
+
+    Raises:
+        CircuitOpenError: If the breaker is (or trips) open
+        Exception: The last attempt's error otherwise
+    """
+    policy = policy or RetryPolicy()
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            retryable = is_retryable(e)
+            # A definitive 4xx (say a 404) means the host answered; it isn't a sign it is down
+            if breaker is not None and retryable:
+                breaker.record_failure()
+            if attempt >= policy.max_attempts or not retryable:
+                raise
+            delay = policy.backoff(attempt)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                debug_print(f"{description}: no time left to retry after attempt {attempt}")
+                raise
+            debug_print(f"{description}: attempt {attempt} failed ({e}), retrying in {delay:.1f}s")
+            metrics.incr("retries")
+            time.sleep(delay)
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+
+def hedged(primary, hedge, hedge_after, timeout=None):
+    """
+    Run primary; if it hasn't finished within hedge_after seconds, start
+    hedge alongside it and return whichever succeeds first.
+
+    The losing call is left to finish in the background.
+
+    Args:
+        primary: Zero-argument callable tried first
+        hedge: Zero-argument callable started if primary stalls
+        hedge_after: Seconds to give primary on its own
+        timeout: Seconds to wait overall (None waits indefinitely)
+
+    Raises:
+        TimeoutError: If neither call finished in time
+        Exception: primary's error if both calls failed
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        first = executor.submit(primary)
+        head_start = hedge_after if deadline is None else min(hedge_after, max(0, timeout))
+        if wait([first], timeout=head_start).done:
+            return first.result()
+
+        debug_print(f"Primary attempt stalled for {head_start:.0f}s, starting hedged attempt")
+        metrics.incr("hedged_requests")
+        second = executor.submit(hedge)
+        pending = {first, second}
+        errors = {}
+        while pending:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"no attempt finished within {timeout:.0f}s")
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors[future] = e
+                    continue
+                if future is second:
+                    metrics.incr("hedge_wins")
+                return result
+        raise errors.get(first) or errors[second]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+_breaker_lock = threading.Lock()
+_breakers = {}
+
+
+def _load_breaker_states():
+    try:
+        with open(BREAKER_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        debug_print(f"Ignoring unreadable circuit breaker state: {e}")
+        return {}
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: closed until threshold consecutive failures, then
+    open (failing fast) for cooldown seconds, then half-open, where one
+    success closes it again and one failure reopens it.
+    """
+
+    def __init__(self, name, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN, persist=True):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.persist = persist
+        self.failures = 0
+        self.opened_at = None  # wall-clock time, so it survives between runs
+        if persist:
+            state = _load_breaker_states().get(name, {})
+            self.failures = state.get("failures", 0)
+            self.opened_at = state.get("opened_at")
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def before_call(self):
+        with _breaker_lock:
+            if self.state == "open":
+                metrics.incr("circuit_open")
+                retry_at = datetime.fromtimestamp(self.opened_at + self.cooldown)
+                raise CircuitOpenError(f"circuit open for {self.name} after {self.failures} "
+                                       f"consecutive failures; next try after {retry_at:%H:%M:%S}")
+
+    def record_success(self):
+        with _breaker_lock:
+            if self.failures or self.opened_at is not None:
+                if self.opened_at is not None:
+                    debug_print(f"Circuit for {self.name} closed again")
+                self.failures = 0
+                self.opened_at = None
+                self._save()
+
+    def record_failure(self):
+        with _breaker_lock:
+            self.failures += 1
+            if self.state == "half-open" or (self.opened_at is None and self.failures >= self.threshold):
+                self.opened_at = time.time()
+                debug_print(f"Circuit for {self.name} opened after {self.failures} consecutive failures")
+            self._save()
+
+    def _save(self):
+        if not self.persist:
+            return
+        states = _load_breaker_states()
+        states[self.name] = {"failures": self.failures, "opened_at": self.opened_at}
+        write_json(BREAKER_FILE, states)
+
+
+def get_breaker(name):
+    """Shared CircuitBreaker for name (usually a host), created on first use."""
+    with _breaker_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
@@ -1,13 +1,49 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from datetime import datetime
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import replace
+from datetime import date, datetime
+from urllib.parse import urljoin, urlparse
+import requests
 import re
+import time
 import json
 import os
 
+import feed
+import history
+import metrics
+import recorder
+import snapshot_cache
+from name_index import NameIndex
+from resilience import call_with_retry, get_breaker, hedged
+from models import HIGH_RATING, IpoBatch, IpoRecord
+from sources import SOURCES_FILE, InvestorGainAdapter, as_adapter, load_sources
+
+
+REPORT_BASE_URL = "https://www.investorgain.com/report/live-ipo-gmp/331"
+REPORT_URL = os.getenv("IPO_REPORT_URL", f"{REPORT_BASE_URL}/open/")
+REPORT_SOURCES = {
+    "open": REPORT_URL,
+    "upcoming": f"{REPORT_BASE_URL}/upcoming/",
+    "sme": f"{REPORT_BASE_URL}/sme/",
+    "mainboard": f"{REPORT_BASE_URL}/ipo/",
+}
+REPORT_TIMEOUT = int(os.getenv("IPO_REPORT_TIMEOUT", "150"))
+REPORT_WORKERS = int(os.getenv("IPO_REPORT_WORKERS", "4"))
+# Seconds Chrome may stall before a second HTTP attempt is raced against it
+HEDGE_AFTER = float(os.getenv("IPO_HEDGE_AFTER", "20"))
+HTTP_TIMEOUT = int(os.getenv("IPO_HTTP_TIMEOUT", "20"))
+EXTRACTION_MODE = os.getenv("IPO_EXTRACTION_MODE", "script")  # "script" or "cells"
+BLOCK_RESOURCES = os.getenv("IPO_BLOCK_RESOURCES", "1") != "0"
+# Used when the header row has no "Close" column to locate it by
+DEFAULT_CLOSE_COLUMN = 9
+STATUS_FILE = os.getenv("IPO_STATUS_FILE", "scraper_status.json")
+STATUS_LOG_FILE = os.getenv("IPO_STATUS_LOG", "scraper_status_log.jsonl")
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+}
+
 
 def debug_print(message):
     print(f"[DEBUG {datetime.now()}] {message}")
@@ -18,7 +54,7 @@ def update_scraper_status(status, message="", ipo_count=0, error_details=""):
     Update scraper status file for GitHub Actions monitoring.
 
     Args:
-        status: "success", "warning", "error"
+        status: "running", "success", "unchanged", "warning", "error"
         message: Human readable message
         ipo_count: Number of IPOs found
         error_details: Error details if status is "error"
@@ -30,156 +66,687 @@ def update_scraper_status(status, message="", ipo_count=0, error_details=""):
         "ipo_count": ipo_count,
         "error_details": error_details,
         "workflow_run_id": os.getenv("GITHUB_RUN_ID", "local"),
-        "workflow_run_number": os.getenv("GITHUB_RUN_NUMBER", "local")
+        "workflow_run_number": os.getenv("GITHUB_RUN_NUMBER", "local"),
+        **metrics.snapshot()
     }
 
     # Update last successful run timestamp
-    if status == "success":
+    if status in ("success", "unchanged"):
         status_data["last_successful_run"] = datetime.now().isoformat()
 
-    status_file = "scraper_status.json"
     try:
-        with open(status_file, "w") as f:
+        with open(STATUS_FILE, "w") as f:
             json.dump(status_data, f, indent=2)
         debug_print(f"Status updated: {status} - {message}")
     except Exception as e:
         debug_print(f"Failed to write status file: {e}")
 
 
-def extract_listing_number(text):
-    match = re.search(r'\((-?\d+(\.\d+)?)%\)', text)
-    return match.group(1) + ' %' if match else text
+def finalize_status(since=None):
+    """
+    Close out the run's status record.
 
+    Rewrites the phase timings and counters in the status file, so phases
+    after scraping (render, SMTP) sit alongside the status the scraper
+    already recorded, then appends the final record to the JSONL status log
+    that check_scraper_status.py summarises.
 
-def convert_rating_to_fraction(text):
-    fire_count = text.count("🔥")
-    if fire_count > 0:
-        return f"{fire_count}.0/5"
-    return "No Rating"
+    Args:
+        since: Start of this run; a record older than that is a previous
+            run's and is left alone rather than logged a second time
+    """
+    try:
+        with open(STATUS_FILE, "r") as f:
+            status_data = json.load(f)
+        if since is not None and datetime.fromisoformat(status_data["timestamp"]) < since:
+            debug_print("No status recorded by this run; not appending to the status log")
+            return
+        status_data.update(metrics.snapshot())
+        status_data["duration_seconds"] = status_data["phases"].get("total")
+        with open(STATUS_FILE, "w") as f:
+            json.dump(status_data, f, indent=2)
+    except Exception as e:
+        debug_print(f"Failed to write metrics to status file: {e}")
+        return
+
+    try:
+        with open(STATUS_LOG_FILE, "a") as f:
+            f.write(json.dumps(status_data, ensure_ascii=False) + "\n")
+    except Exception as e:
+        debug_print(f"Failed to append to status log: {e}")
 
 
-def is_high_rating(rating):
-    return rating in ["4.0/5", "5.0/5"]
+def split_closing_status(full_name):
+    """Split a trailing " O" / " CT" marker off an IPO name."""
+    if full_name.endswith(" O"):
+        return full_name[:-2].strip(), "O"
+    if full_name.endswith(" CT"):
+        return full_name[:-3].strip(), "CT"
+    return full_name, ""
 
 
-def scrape_ipo_table():
+def parse_ipo_row(raw_row, today=None, base_url=None):
     """
-    Scrape IPO data from investorgain.com and return high-rated open IPOs.
+    Turn the raw cell texts of one table row into an IpoRecord.
+
+    Args:
+        raw_row: Tuple of (name_text, gmp_text, rating_text, close_date_text,
+            detail_href); rows cached before detail links were read lack the href
+        today: Reference date for the year-less close date
+        base_url: Report URL the detail href is relative to
 
     Returns:
-        list: List of IPO data in format [name, closing_status, status, est_listing, open_date, close_date, rating]
+        IpoRecord
     """
-    debug_print("Starting IPO table scraping...")
-    update_scraper_status("running", "Scraping started")
+    name_text, gmp_text, rating_text, close_date, *rest = raw_row
+    detail_href = rest[0] if rest else ""
+    name, closing_status = split_closing_status(name_text.strip())
+    return IpoRecord.from_cells(name, closing_status, gmp_text.strip(), rating_text.strip(),
+                                close_date.strip(), today,
+                                detail_url=urljoin(base_url, detail_href) if base_url and detail_href
+                                else detail_href)
 
-    try:
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--disable-software-rasterizer")
-        options.add_argument("--disable-background-timer-throttling")
-        options.add_argument("--disable-renderer-backgrounding")
-        options.add_argument("--disable-features=TranslateUI")
-        options.add_argument("--disable-ipc-flooding-protection")
-        options.add_argument("--disable-accelerated-2d-canvas")
-        options.add_argument("--disable-accelerated-jpeg-decoding")
-        options.add_argument("--disable-accelerated-mjpeg-decode")
-        options.add_argument("--disable-accelerated-video-decode")
-        options.add_argument("--disable-gl-drawing-for-tests")
-        options.add_argument("--disable-canvas-aa")
-        options.add_argument("--disable-3d-apis")
-        options.add_argument("--disable-gpu-process-crash-limit")
-        options.add_experimental_option("excludeSwitches", ["enable-logging"])
-
-        url = "https://www.investorgain.com/report/live-ipo-gmp/331/open/"
 
+def _clean_text(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def find_close_column(headers):
+    """Index of the close date column from the table's header texts."""
+    for i, header in enumerate(headers):
+        if header.strip().lower().startswith("close"):
+            return i
+    return DEFAULT_CLOSE_COLUMN
+
+
+def extract_rows_from_html(html):
+    """
+    Pull raw row cell texts out of server-rendered report HTML.
+
+    Args:
+        html: Page HTML containing #reportTable / #tableBody
+
+    Returns:
+        list: Raw rows as (name_text, gmp_text, rating_text, close_date_text, detail_href)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    body = soup.select_one("#tableBody")
+    if body is None or "No data available" in body.get_text():
+        return []
+    close_column = find_close_column(th.get_text(" ") for th in soup.select("#reportTable thead th"))
+
+    raw_rows = []
+    for i, row in enumerate(body.find_all("tr"), 1):
+        cells = row.find_all("td", recursive=False)
+        if len(cells) < 8:
+            continue
+
+        name_link = cells[0].select_one("div.mono-num a")
+        if name_link is None:
+            debug_print(f"Skipping row {i}: no name link")
+            continue
+
+        raw_rows.append((
+            _clean_text(name_link.get_text(" ")),
+            _clean_text(cells[1].get_text(" ")),
+            _clean_text(cells[2].get_text(" ")),
+            _clean_text(cells[close_column].get_text(" ")) if len(cells) > close_column else "",
+            name_link.get("href", ""),
+        ))
+    return raw_rows
+
+
+def fetch_report_http(url, timeout=HTTP_TIMEOUT, cached=None, extract=None):
+    """
+    Fast path: fetch the report with plain HTTP and parse it with BeautifulSoup.
+
+    Sends If-None-Match / If-Modified-Since when a cached report is given, and
+    reuses its rows on 304 Not Modified.
+
+    Args:
+        url: Report page URL
+        timeout: Request timeout in seconds
+        cached: Previous report for this URL ({"rows", "etag", "last_modified"})
+        extract: Function turning page bytes into raw rows (default: the
+            investorgain layout, extract_rows_from_html)
+
+    Returns:
+        dict: {"rows", "etag", "last_modified", "not_modified"}; rows is empty
+        if the page had no usable table
+    """
+    headers = dict(HTTP_HEADERS)
+    # A recording needs the page itself, not a 304
+    if cached and cached.get("rows") and not recorder.is_recording():
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    debug_print(f"Fetching report over HTTP: {url}")
+    with metrics.span("http_fetch"):
+        response = requests.get(url, headers=headers, timeout=timeout)
+    metrics.incr("http_requests")
+    metrics.incr("http_bytes", len(response.content))
+
+    if response.status_code == 304 and cached:
+        debug_print("HTTP fast path: not modified since last run")
+        return {
+            "rows": [tuple(row) for row in cached["rows"]],
+            "etag": cached.get("etag"),
+            "last_modified": cached.get("last_modified"),
+            "not_modified": True,
+        }
+
+    response.raise_for_status()
+    recorder.record_page(url, response.content, "report")
+    # Hand BeautifulSoup the bytes so it honours the page's meta charset (emoji ratings)
+    with metrics.span("html_parse"):
+        raw_rows = (extract or extract_rows_from_html)(response.content)
+    debug_print(f"HTTP fast path found {len(raw_rows)} rows")
+    return {
+        "rows": raw_rows,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "not_modified": False,
+    }
+
+
+def fetch_rows_http(url, timeout=HTTP_TIMEOUT):
+    """Fetch raw rows over HTTP (see fetch_report_http)."""
+    return fetch_report_http(url, timeout)["rows"]
+
+
+# Requests Chrome drops before they leave the browser (CDP Network.setBlockedURLs).
+# The table only needs the document and the site's own scripts, so images,
+# fonts, stylesheets, media, ads and analytics are all dead weight.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css", "*.mp4", "*.webm",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    "*googletagmanager.com*", "*google-analytics.com*", "*analytics*",
+    "*doubleclick.net*", "*googlesyndication.com*", "*adservice.google.*",
+    "*/ads/*", "*adsbygoogle*", "*facebook.net*", "*connect.facebook*",
+    "*clarity.ms*", "*hotjar.com*", "*taboola.com*", "*outbrain.com*",
+]
+
+# Bytes transferred by everything the page loaded so far (same-origin sizes
+# are exact; cross-origin entries without Timing-Allow-Origin report 0).
+PAGE_BYTES_SCRIPT = """
+const entries = performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'));
+return entries.reduce((total, e) => total + (e.transferSize || 0), 0);
+"""
+
+# Reads every row in a single WebDriver round-trip. innerText matches what
+# WebElement.text returns, so both extraction modes yield the same strings.
+EXTRACT_ROWS_SCRIPT = """
+const headers = Array.from(document.querySelectorAll('#reportTable thead th'),
+                           th => th.innerText.trim().toLowerCase());
+let closeColumn = headers.findIndex(header => header.startsWith('close'));
+if (closeColumn < 0) closeColumn = %d;
+const rows = document.querySelectorAll('#tableBody tr');
+const result = [];
+for (const row of rows) {
+    const cells = row.querySelectorAll(':scope > td');
+    if (cells.length < 8) continue;
+    const link = cells[0].querySelector('div.mono-num a');
+    if (!link) continue;
+    result.push([
+        link.innerText,
+        cells[1].innerText,
+        cells[2].innerText,
+        cells.length > closeColumn ? cells[closeColumn].innerText : '',
+        link.getAttribute('href') || ''
+    ]);
+}
+return result;
+""" % DEFAULT_CLOSE_COLUMN
+
+
+def create_driver(block_resources=None):
+    """
+    Create a headless Chrome driver with the scraper's standard options.
+
+    Args:
+        block_resources: Block images, fonts, CSS, ads and analytics and stop
+            waiting for the full page-load event; defaults to IPO_BLOCK_RESOURCES
+    """
+    # Selenium is only imported once a browser is actually needed, so the HTTP
+    # fast path and the CLI's other subcommands never pay for loading it
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    if block_resources is None:
+        block_resources = BLOCK_RESOURCES
+
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-renderer-backgrounding")
+    options.add_argument("--disable-features=TranslateUI")
+    options.add_argument("--disable-ipc-flooding-protection")
+    options.add_argument("--disable-accelerated-2d-canvas")
+    options.add_argument("--disable-accelerated-jpeg-decoding")
+    options.add_argument("--disable-accelerated-mjpeg-decode")
+    options.add_argument("--disable-accelerated-video-decode")
+    options.add_argument("--disable-gl-drawing-for-tests")
+    options.add_argument("--disable-canvas-aa")
+    options.add_argument("--disable-3d-apis")
+    options.add_argument("--disable-gpu-process-crash-limit")
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+
+    if block_resources:
+        # driver.get returns once navigation starts; wait_for_table decides when we're done
+        options.page_load_strategy = "none"
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    with metrics.span("chrome_startup"):
         driver = webdriver.Chrome(options=options)
-        driver.set_page_load_timeout(60)
+    driver.set_page_load_timeout(60)
+    metrics.incr("chrome_launches")
+
+    if block_resources:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+
+def page_bytes_transferred(driver):
+    """Return the bytes the current page has transferred so far."""
+    metrics.incr("webdriver_calls")
+    return driver.execute_script(PAGE_BYTES_SCRIPT) or 0
+
+
+def read_rows_with_script(driver):
+    """Read all table rows with one execute_script call."""
+    metrics.incr("webdriver_calls")
+    return [tuple(row) for row in driver.execute_script(EXTRACT_ROWS_SCRIPT)]
+
+
+def read_rows_with_cells(driver):
+    """Read table rows cell by cell (one WebDriver round-trip per lookup)."""
+    from selenium.webdriver.common.by import By
+
+    close_column = find_close_column(
+        header.text for header in driver.find_elements(By.CSS_SELECTOR, "#reportTable thead th"))
+    # Re-find elements to avoid stale references
+    rows = driver.find_elements(By.CSS_SELECTOR, "#tableBody tr")
+    metrics.incr("webdriver_calls", 2)
+    raw_rows = []
+
+    for i, row in enumerate(rows, 1):
+        cells = row.find_elements(By.TAG_NAME, "td")
+        metrics.incr("webdriver_calls")
+        if len(cells) < 8:
+            continue
 
         try:
-            driver.get(url)
+            # Name (column 0) - extract from link inside div.mono-num
+            name_div = cells[0].find_element(By.CSS_SELECTOR, "div.mono-num")
+            name_link = name_div.find_element(By.TAG_NAME, "a")
+
+            raw_rows.append((
+                name_link.text,
+                cells[1].text,  # GMP, e.g. "₹100 (20.62%)"
+                cells[2].text,  # Rating
+                cells[close_column].text if len(cells) > close_column else "",  # Close date, e.g. "13-Oct"
+                name_link.get_dom_attribute("href") or "",
+            ))
+            metrics.incr("webdriver_calls", 7)  # two lookups, four .text reads, one href
         except Exception as e:
-            error_msg = f"Page load timeout: {e}"
-            debug_print(error_msg)
-            update_scraper_status("error", error_msg, error_details=str(e))
-            return []
+            debug_print(f"Skipping row {i} due to error: {e}")
+            continue
 
-        try:
+    return raw_rows
+
+
+def wait_for_table(driver):
+    """Block until #reportTable has real rows (not "No data available")."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        with metrics.span("wait_table"):
             WebDriverWait(driver, 30).until(
                 EC.presence_of_element_located((By.ID, "reportTable"))
             )
-            debug_print("Table found!")
+        debug_print("Table found!")
 
-            # Wait for table to be fully loaded with rows (not "No data available")
+        # Wait for table to be fully loaded with rows (not "No data available")
+        with metrics.span("wait_rows"):
             WebDriverWait(driver, 30).until(
                 lambda d: len(d.find_elements(By.CSS_SELECTOR, "#tableBody tr")) > 0 and
                 "No data available" not in d.find_element(By.ID, "tableBody").text
             )
-            debug_print("Table rows loaded!")
+        debug_print("Table rows loaded!")
+    except Exception as e:
+        raise RuntimeError(f"Table loading timeout: {e}") from e
+
+
+def fetch_rows_selenium(url, extraction_mode=None, session=None):
+    """
+    Slow path: render the report in headless Chrome and read the table.
+
+    Args:
+        url: Report page URL
+        extraction_mode: "script" (one execute_script call) or "cells"
+            (per-cell WebDriver calls); defaults to IPO_EXTRACTION_MODE
+        session: Optional DriverSession to reuse a warm browser instead of
+            launching and quitting Chrome for this call
+
+    Returns:
+        list: Raw rows as (name_text, gmp_text, rating_text, close_date_text, detail_href)
+
+    Raises:
+        Exception: If the page or the table fails to load
+    """
+    if session is not None:
+        # A warm session is a single browser; concurrent reports take turns on it
+        with session.lock:
+            return _fetch_rows_selenium(url, extraction_mode, session)
+    return _fetch_rows_selenium(url, extraction_mode, None)
+
+
+def _fetch_rows_selenium(url, extraction_mode, session):
+    driver = None
+    started = time.monotonic()
+    try:
+        try:
+            if session is not None:
+                with metrics.span("page_load"):
+                    driver = session.load(url)
+            else:
+                driver = create_driver()
+                with metrics.span("page_load"):
+                    driver.get(url)
         except Exception as e:
-            error_msg = f"Table loading timeout: {e}"
-            debug_print(error_msg)
-            update_scraper_status("error", error_msg, error_details=str(e))
-            return []
+            raise RuntimeError(f"Page load timeout: {e}") from e
+
+        wait_for_table(driver)
+        if recorder.is_recording():
+            recorder.record_page(url, driver.page_source.encode("utf-8"), "report")
+        debug_print(f"Time to table: {time.monotonic() - started:.2f}s, "
+                    f"{page_bytes_transferred(driver)} bytes transferred")
+
+        with metrics.span("extract"):
+            if (extraction_mode or EXTRACTION_MODE) == "cells":
+                return read_rows_with_cells(driver)
+            return read_rows_with_script(driver)
+    except Exception:
+        if session is not None:
+            session.discard()
+        raise
+    finally:
+        if session is None and driver is not None:
+            driver.quit()
 
-        # Re-find elements to avoid stale references
-        rows = driver.find_elements(By.CSS_SELECTOR, "#tableBody tr")
-        ipo_list = []
 
-        debug_print(f"Found {len(rows)} total rows in table body")
+def fetch_report(url, session=None, timeout=HTTP_TIMEOUT, cached=None, extract=None):
+    """
+    Fetch one report, trying the HTTP fast path before falling back to Chrome.
 
-        for i, row in enumerate(rows, 1):
-            cells = row.find_elements(By.TAG_NAME, "td")
-            if len(cells) < 8:
-                continue
+    Failed attempts are retried with backoff (IPO_RETRY_*) as long as the
+    next one can start within timeout, and every attempt goes through the
+    host's circuit breaker. With a custom extract function (another site's
+    layout, see fetch_report_http) only HTTP is used, since the Chrome
+    extraction script reads the investorgain table.
 
+    Returns:
+        dict: {"rows", "etag", "last_modified", "not_modified"}
+
+    Raises:
+        resilience.CircuitOpenError: If the host has been failing repeatedly
+    """
+    deadline = time.monotonic() + timeout
+
+    def fetch_once():
+        if extract is None:
+            return _fetch_report_once(url, session, deadline, cached)
+        return fetch_report_http(url, timeout=max(1.0, min(deadline - time.monotonic(), HTTP_TIMEOUT)),
+                                 cached=cached, extract=extract)
+
+    return call_with_retry(fetch_once,
+                           deadline=deadline, breaker=get_breaker(urlparse(url).netloc),
+                           description=f"Fetching {url}")
+
+
+def _fetch_report_once(url, session, deadline, cached):
+    def http_timeout():
+        return max(1.0, min(deadline - time.monotonic(), HTTP_TIMEOUT))
+
+    try:
+        report = fetch_report_http(url, timeout=http_timeout(), cached=cached)
+        if report["rows"]:
+            return report
+        debug_print("HTTP fast path returned no rows, falling back to Selenium")
+    except Exception as e:
+        debug_print(f"HTTP fast path failed ({e}), falling back to Selenium")
+
+    def fetch_with_browser():
+        rows = fetch_rows_selenium(url, session=session)
+        return {"rows": rows, "etag": None, "last_modified": None, "not_modified": False}
+
+    def fetch_again_over_http():
+        # The site may have recovered from whatever broke the first HTTP try
+        report = fetch_report_http(url, timeout=http_timeout(), cached=cached)
+        if not report["rows"]:
+            raise RuntimeError("hedged HTTP attempt returned no rows")
+        return report
+
+    return hedged(fetch_with_browser, fetch_again_over_http, HEDGE_AFTER,
+                  timeout=max(0, deadline - time.monotonic()))
+
+
+def get_report_sources():
+    """
+    Return the report sources to scrape, in priority order.
+
+    config/sources.json (IPO_SOURCES) is used if it exists; see sources.py.
+    Otherwise IPO_REPORTS is a comma-separated list of investorgain report
+    names from REPORT_SOURCES or name=url pairs, e.g. "open,sme" or
+    "open,gift=https://example.com/r/".
+
+    Returns:
+        dict: {source_name: SourceAdapter}
+    """
+    if os.path.exists(SOURCES_FILE):
+        return load_sources(SOURCES_FILE)
+
+    sources = {}
+    for entry in os.getenv("IPO_REPORTS", "open").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        if "=" in entry:
+            name, url = entry.split("=", 1)
+            sources[name.strip()] = InvestorGainAdapter(name.strip(), url.strip())
+        elif entry in REPORT_SOURCES:
+            sources[entry] = InvestorGainAdapter(entry, REPORT_SOURCES[entry])
+        else:
+            debug_print(f"Ignoring unknown report source: {entry}")
+    return sources
+
+
+def scrape_reports(sources, timeout=REPORT_TIMEOUT, session=None, max_workers=REPORT_WORKERS,
+                   cached_reports=None):
+    """
+    Fetch every source concurrently on a bounded thread pool.
+
+    Each source gets its own deadline, counted from when the pool starts, so
+    a slow report is abandoned without holding up the others.
+
+    Args:
+        sources: {source_name: SourceAdapter or investorgain report URL}
+        timeout: Seconds each source may take
+        session: Optional DriverSession shared by Selenium fallbacks
+        max_workers: Maximum number of reports fetched at once
+        cached_reports: {source_name: report} from the last run, for conditional HTTP
+
+    Returns:
+        tuple: ({source_name: report} for sources that succeeded,
+                {source_name: error message} for sources that failed)
+    """
+    cached_reports = cached_reports or {}
+    reports = {}
+    errors = {}
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources))))
+    try:
+        started = time.monotonic()
+        futures = {
+            name: executor.submit(as_adapter(name, source).fetch, session, timeout, cached_reports.get(name))
+            for name, source in sources.items()
+        }
+        for name, future in futures.items():
+            remaining = max(0, started + timeout - time.monotonic())
             try:
-                # 1. Name (column 0) - extract from link inside div.mono-num
-                name_div = cells[0].find_element(By.CSS_SELECTOR, "div.mono-num")
-                name_link = name_div.find_element(By.TAG_NAME, "a")
-                full_name = name_link.text.strip()
-
-                # Extract closing status from name
-                closing_status = ""
-                name = full_name
-                if full_name.endswith(" O"):
-                    name = full_name[:-2].strip()
-                    closing_status = "O"
-                elif full_name.endswith(" CT"):
-                    name = full_name[:-3].strip()
-                    closing_status = "CT"
-
-                # 2. GMP - extract percentage from column 1 (₹100 (20.62%))
-                gmp_text = cells[1].text.strip()
-                est_gains = extract_listing_number(gmp_text)  # Gets the percentage
-
-                # 3. Rating (column 2)
-                rating_text = cells[2].text.strip()
-                rating = convert_rating_to_fraction(rating_text)
-
-                # 4. Close date (column 9) - format "13-Oct"
-                close_date = cells[9].text.strip() if len(cells) > 9 else ""
-
-                # Filter based on rating only
-                if is_high_rating(rating):
-                    ipo_list.append([name, closing_status, est_gains, close_date, rating])
-                    debug_print(f"Added: {name} | GMP: {est_gains} | Close: {close_date} | Rating: {rating}")
-                else:
-                    debug_print(f"Skipped low rating: {name} ({rating})")
+                reports[name] = future.result(timeout=remaining)
+                debug_print(f"Report '{name}': {len(reports[name]['rows'])} rows")
+            except FutureTimeoutError:
+                errors[name] = f"timed out after {timeout}s"
+                debug_print(f"Report '{name}' {errors[name]}")
+            except Exception as e:
+                errors[name] = str(e)
+                debug_print(f"Report '{name}' failed: {e}")
+    finally:
+        # Don't wait for stragglers that already blew their deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return reports, errors
+
 
+def merge_report_rows(reports, sources):
+    """
+    Parse and merge rows from several reports, de-duplicated by normalized
+    (and fuzzily matched) IPO name.
+
+    Sources earlier in the list win; later ones only fill in blank fields.
+    Every site's GMP is kept in the record's source_gmps.
+
+    Args:
+        reports: {source_name: report} from scrape_reports()
+        sources: {source_name: SourceAdapter or investorgain report URL}
+
+    Returns:
+        list: IpoRecords in source priority order
+    """
+    today = date.today()
+    index = NameIndex()
+    merged = {}
+    for name, source in sources.items():
+        adapter = as_adapter(name, source)
+        for i, raw_row in enumerate(reports[name]["rows"] if name in reports else [], 1):
+            try:
+                record = parse_ipo_row(raw_row, today, adapter.url)
             except Exception as e:
-                debug_print(f"Skipping row {i} due to error: {e}")
+                debug_print(f"Skipping row {i} of '{name}' due to error: {e}")
+                metrics.incr("rows_skipped")
                 continue
+            if record.gmp_pct is not None:
+                record = replace(record, source_gmps=((adapter.site, record.gmp_pct),))
+
+            key = index.key_for(record.name, adapter.site)
+            existing = merged.get(key)
+            merged[key] = record if existing is None else existing.consolidated_with(record)
+    return list(merged.values())
 
-        debug_print(f"Processed {len(rows)} rows, found {len(ipo_list)} high-rated IPOs")
+
+def scrape_ipo_table(sources=None, session=None, timeout=REPORT_TIMEOUT, min_rating=HIGH_RATING):
+    """
+    Scrape IPO data from investorgain.com and return high-rated open IPOs.
+
+    Args:
+        sources: {source_name: SourceAdapter or investorgain report URL} to
+            scrape; defaults to get_report_sources()
+        session: Optional DriverSession kept warm across calls (daemon mode)
+        timeout: Seconds each report source may take
+        min_rating: Lowest rating to return (None returns unrated IPOs too),
+            so looser subscriber profiles can be served from the same scrape
+
+    Returns:
+        IpoBatch: High-rated IPOs (empty on error or when the table is unchanged)
+    """
+    debug_print("Starting IPO table scraping...")
+    update_scraper_status("running", "Scraping started")
+
+    with metrics.span("scrape"):
+        return _scrape_ipo_table(sources, session, timeout, min_rating)
+
+
+def _scrape_ipo_table(sources, session, timeout, min_rating):
+    try:
+        if sources is None:
+            sources = get_report_sources()
+        if not sources:
+            raise ValueError("No report sources configured (IPO_REPORTS)")
+
+        snapshot = snapshot_cache.load_snapshot()
+        cached_reports = snapshot.get("sources", {}) if snapshot_cache.CHANGE_DETECTION else {}
+
+        reports, errors = scrape_reports(sources, timeout=timeout, session=session,
+                                         cached_reports=cached_reports)
+        failed = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        if not reports:
+            raise RuntimeError(failed)
+
+        # Short-circuit parsing, rendering and sending if nothing changed since the last delivery
+        table_hash = snapshot_cache.hash_table(reports)
+        if snapshot_cache.is_delivered(snapshot, table_hash):
+            ipo_count = snapshot.get("delivered_ipo_count", 0)
+            debug_print("Report table unchanged since last run, skipping")
+            update_scraper_status("unchanged", "Report table unchanged since last run - nothing to send",
+                                  ipo_count, error_details=failed)
+            return IpoBatch()
+        snapshot_cache.record_table(reports, table_hash)
+
+        with metrics.span("parse"):
+            ipos = IpoBatch(merge_report_rows(reports, sources))
+        metrics.incr("rows_seen", sum(len(report["rows"]) for report in reports.values()))
+
+        try:
+            with metrics.span("history"):
+                history.record_scrape(ipos)
+        except Exception as e:
+            debug_print(f"Failed to record scrape history: {e}")
+
+        try:
+            feed.export_feed(ipos)
+        except Exception as e:
+            debug_print(f"Failed to export data feed: {e}")
+
+        debug_print(f"Found {sum(len(report['rows']) for report in reports.values())} total rows "
+                    f"({len(ipos)} unique IPOs) across {len(reports)} reports")
+
+        # Filter based on rating only
+        ipo_list = ipos.filter(min_rating=min_rating)
+        kept = set(ipo_list.names())
+        for ipo in ipos:
+            if ipo.name in kept:
+                debug_print(f"Added: {ipo.name} | GMP: {ipo.est_gains} | Close: {ipo.close_date_text} | Rating: {ipo.rating}")
+            else:
+                debug_print(f"Skipped low rating: {ipo.name} ({ipo.rating})")
+
+        debug_print(f"Processed {len(ipos)} IPOs, found {len(ipo_list)} high-rated IPOs")
+        metrics.incr("rows_skipped", len(ipos) - len(ipo_list))
+
+        if not ipo_list:
+            # Nothing to send, so this table is fully handled already
+            snapshot_cache.mark_delivered(0)
 
         # Update status based on results
         if len(ipo_list) > 0:
-            update_scraper_status("success", f"Successfully scraped {len(ipo_list)} high-rated IPOs", len(ipo_list))
+            update_scraper_status("success", f"Successfully scraped {len(ipo_list)} high-rated IPOs",
+                                  len(ipo_list), error_details=failed)
         else:
-            update_scraper_status("warning", "No high-rated IPOs found - scraper may be working but no matching IPOs", 0)
+            update_scraper_status("warning", "No high-rated IPOs found - scraper may be working but no matching IPOs",
+                                  0, error_details=failed)
 
         return ipo_list
 
@@ -187,9 +754,7 @@ def scrape_ipo_table():
         error_msg = f"Error occurred during IPO scraping: {e}"
         debug_print(error_msg)
         update_scraper_status("error", error_msg, error_details=str(e))
-        return []
-    finally:
-        driver.quit()
+        return IpoBatch()
 
 
 if __name__ == "__main__":
@@ -197,4 +762,4 @@ if __name__ == "__main__":
     ipos = scrape_ipo_table()
     print(f"Found {len(ipos)} high-rated IPOs:")
     for ipo in ipos:
-        print(f"  - {ipo[0]} ({ipo[1]}) - {ipo[4]}")
\ No newline at end of file
+        print(f"  - {ipo.name} ({ipo.closing_status}) - {ipo.rating}")
\ No newline at end of file
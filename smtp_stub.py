@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Local stand-in SMTP server for offline delivery tests.
+
+Speaks enough SMTP for smtplib (EHLO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA,
+RSET, NOOP, QUIT), accepts any credentials and keeps every message in
+memory. It can also add per-message latency and reject or temporarily
+fail chosen recipients.
+
+    python smtp_stub.py --port 2525
+    SMTP_HOST=127.0.0.1 SMTP_PORT=2525 SMTP_SSL=0 python main.py
+"""
+
+import argparse
+import socketserver
+import threading
+import time
+from datetime import datetime
+
+
+def debug_print(message):
+    print(f"[SMTP-STUB {datetime.now()}] {message}")
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        stub = self.server.stub
+        with stub.lock:
+            stub.connections += 1
+        self.reply("220 stub ESMTP ready")
+        mail_from, rcpt_to = None, []
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb in ("EHLO", "HELO"):
+                self.wfile.write(b"250-stub\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+            elif verb == "AUTH":
+                if command.upper().startswith("AUTH LOGIN"):
+                    self.reply("334 VXNlcm5hbWU6")
+                    self.rfile.readline()
+                    self.reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                self.reply("235 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, rcpt_to = command[10:].strip("<> "), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipient = command[8:].strip("<> ")
+                code = stub.recipient_reply(recipient)
+                if code == 250:
+                    rcpt_to.append(recipient)
+                    self.reply("250 OK")
+                elif code == 451:
+                    self.reply("451 Try again later")
+                else:
+                    self.reply("550 No such user")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = bytearray()
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk == b".\r\n":
+                        break
+                    data += chunk[1:] if chunk.startswith(b"..") else chunk
+                if stub.latency:
+                    time.sleep(stub.latency)
+                stub.store(mail_from, rcpt_to, bytes(data))
+                mail_from, rcpt_to = None, []
+                self.reply("250 Message accepted")
+            elif verb in ("RSET", "NOOP"):
+                if verb == "RSET":
+                    mail_from, rcpt_to = None, []
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class StubSMTPServer:
+    """
+    In-memory SMTP sink running on a background thread.
+
+    Args:
+        port: Port to bind on localhost (0 picks a free port)
+        latency: Seconds to hold each DATA command, to mimic a real relay
+        reject: Recipients refused permanently (550)
+        flaky: Recipients refused once with 451, then accepted
+    """
+
+    def __init__(self, port=0, latency=0.0, reject=(), flaky=()):
+        self.latency = latency
+        self.reject = set(reject)
+        self.flaky = set(flaky)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", port), StubSMTPHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.port = self.server.server_address[1]
+
+    def recipient_reply(self, recipient):
+        with self.lock:
+            if recipient in self.reject:
+                return 550
+            if recipient in self.flaky:
+                self.flaky.discard(recipient)
+                return 451
+        return 250
+
+    def store(self, mail_from, rcpt_to, data):
+        with self.lock:
+            self.messages.append((mail_from, tuple(rcpt_to), data))
+
+    def delivered_to(self):
+        """Envelope recipients of every accepted message, in arrival order."""
+        with self.lock:
+            return [rcpt for _, rcpt_to, _ in self.messages for rcpt in rcpt_to]
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        debug_print(f"Listening on 127.0.0.1:{self.port}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in SMTP server")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per message")
+    args = parser.parse_args()
+
+    stub = StubSMTPServer(args.port, args.latency).start()
+    try:
+        while True:
+            time.sleep(5)
+            debug_print(f"{len(stub.messages)} messages over {stub.connections} connections")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
@@ -0,0 +1,143 @@
+"""
+Persistent snapshot of the last scraped report table.
+
+Stores each source's raw rows together with its HTTP validators (ETag /
+Last-Modified) and a content hash of the whole table, so an unchanged
+table can skip parsing, rendering and sending entirely.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+
+CACHE_DIR = os.getenv("IPO_CACHE_DIR", ".cache")
+SNAPSHOT_FILE = os.path.join(CACHE_DIR, "table_snapshot.json")
+DIGEST_FILE = os.path.join(CACHE_DIR, "last_digest.json")
+CHANGE_DETECTION = os.getenv("IPO_CHANGE_DETECTION", "1") != "0"
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+def load_snapshot():
+    """
+    Load the last snapshot.
+
+    Returns:
+        dict: {"table_hash", "delivered_hash", "delivered_ipo_count",
+               "sources": {name: report}}, empty if none
+    """
+    try:
+        with open(SNAPSHOT_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        debug_print(f"Ignoring unreadable snapshot cache: {e}")
+        return {}
+
+
+def write_json(path, data):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_file = path + ".tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file, path)
+    except Exception as e:
+        debug_print(f"Failed to write {path}: {e}")
+
+
+def save_snapshot(snapshot):
+    write_json(SNAPSHOT_FILE, snapshot)
+
+
+def hash_table(reports):
+    """
+    Content hash of the raw table across all sources.
+
+    Args:
+        reports: {source_name: {"rows": raw_rows, ...}}
+    """
+    table = {name: [list(row) for row in report["rows"]] for name, report in sorted(reports.items())}
+    return hashlib.sha256(json.dumps(table, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def record_table(reports, table_hash):
+    """Remember the raw rows and validators of this scrape, keeping the delivered hash."""
+    snapshot = load_snapshot()
+    snapshot["table_hash"] = table_hash
+    snapshot["updated"] = datetime.now().isoformat()
+    snapshot["sources"] = {
+        name: {
+            "rows": [list(row) for row in report["rows"]],
+            "etag": report.get("etag"),
+            "last_modified": report.get("last_modified"),
+        }
+        for name, report in reports.items()
+    }
+    save_snapshot(snapshot)
+
+
+def is_delivered(snapshot, table_hash):
+    """True if this exact table was already fully processed and sent."""
+    return CHANGE_DETECTION and table_hash == snapshot.get("delivered_hash")
+
+
+def mark_delivered(ipo_count=0, table_hash=None):
+    """
+    Mark the most recently recorded table as processed and sent.
+
+    Args:
+        ipo_count: Number of IPOs that table produced, reported on unchanged runs
+        table_hash: Only mark it if the recorded table still has this hash
+    """
+    snapshot = load_snapshot()
+    if "table_hash" in snapshot and table_hash in (None, snapshot["table_hash"]):
+        snapshot["delivered_hash"] = snapshot["table_hash"]
+        snapshot["delivered_ipo_count"] = ipo_count
+        save_snapshot(snapshot)
+
+
+def save_digests(digests):
+    """
+    Keep the digests about to be emailed so the CLI can re-send or preview
+    them without scraping again.
+
+    Args:
+        digests: emailer.Digests planned from the most recently recorded table
+    """
+    write_json(DIGEST_FILE, {
+        "table_hash": load_snapshot().get("table_hash"),
+        "saved": datetime.now().isoformat(),
+        "digests": [
+            {
+                "ipos": [ipo.to_dict() for ipo in digest.ipos],
+                "changes": digest.changes,
+                "recipients": digest.recipients,
+                "profiles": digest.profiles,
+            }
+            for digest in digests
+        ],
+    })
+
+
+def load_digests():
+    """
+    Load the last saved digests.
+
+    Returns:
+        dict: {"table_hash", "saved", "digests": [{"ipos": [IpoRecord.to_dict()],
+               "changes", "recipients", "profiles"}]}, or None
+    """
+    try:
+        with open(DIGEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, OSError) as e:
+        debug_print(f"Ignoring unreadable digest cache: {e}")
+        return None
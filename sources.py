@@ -0,0 +1,181 @@
+"""
+Pluggable report sources.
+
+A SourceAdapter fetches one report and returns its rows as raw tuples
+(name_text, gmp_text, rating_text, close_date_text, detail_href), the
+shape scraper.merge_report_rows() parses. Reports from the same site
+(investorgain's open, upcoming and SME reports) fill in each other's
+blanks. Reports from different sites are matched by normalized IPO name
+(name_index.py), and each site adds its own GMP to the record's
+source_gmps, so the email can show how far the sites disagree.
+
+config/sources.json (IPO_SOURCES) lists the reports to scrape, in
+priority order:
+
+    {
+      "sources": [
+        {"name": "open", "adapter": "investorgain"},
+        {"name": "sme", "adapter": "investorgain",
+         "url": "https://www.investorgain.com/report/live-ipo-gmp/331/sme/"},
+        {"name": "ipowatch", "adapter": "table", "url": "https://example.com/ipo-gmp/",
+         "rows": "table.gmp-table tbody tr",
+         "columns": {"name": 0, "gmp": 2, "close": 4}}
+      ]
+    }
+
+"investorgain" entries default their URL to the report of the same name
+in scraper.REPORT_SOURCES. "table" reads any server-rendered HTML table:
+"rows" is a CSS selector for its rows and "columns" gives the cell index
+of "name" and "gmp" and, optionally, "rating" and "close". Without the
+file, IPO_REPORTS picks investorgain reports as before.
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from urllib.parse import urlparse
+
+
+SOURCES_FILE = os.getenv("IPO_SOURCES", "config/sources.json")
+
+_PERCENT = re.compile(r"\(?\s*(-?\d+(?:\.\d+)?)\s*%\s*\)?")
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+class SourceAdapter:
+    """
+    One report to scrape.
+
+    Args:
+        name: Report name, unique among the configured sources
+        url: Report URL (also the base for relative detail links)
+        site: Which site the figures come from; defaults to the URL's host
+    """
+
+    adapter = None  # name used for this class in config/sources.json
+
+    def __init__(self, name, url, site=None):
+        self.name = name
+        self.url = url
+        self.site = site or urlparse(url).netloc.removeprefix("www.")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, {self.url!r})"
+
+    def fetch(self, session, timeout, cached=None):
+        """
+        Fetch the report.
+
+        Args:
+            session: Optional DriverSession for adapters that need a browser
+            timeout: Seconds the fetch may take, retries included
+            cached: This report from the last run, for conditional requests
+
+        Returns:
+            dict: {"rows", "etag", "last_modified", "not_modified"}
+        """
+        raise NotImplementedError
+
+
+class InvestorGainAdapter(SourceAdapter):
+    """investorgain.com live GMP reports: HTTP fast path, then Chrome."""
+
+    adapter = "investorgain"
+
+    def fetch(self, session, timeout, cached=None):
+        from scraper import fetch_report
+
+        return fetch_report(self.url, session, timeout, cached)
+
+
+class TableAdapter(SourceAdapter):
+    """Any site serving its GMP table as plain HTML, read by CSS selector and cell index."""
+
+    adapter = "table"
+
+    def __init__(self, name, url, rows, columns, site=None):
+        super().__init__(name, url, site)
+        missing = {"name", "gmp"} - set(columns)
+        if missing:
+            raise ValueError(f"{name}: columns needs {', '.join(sorted(missing))}")
+        self.rows = rows
+        self.columns = columns
+
+    def fetch(self, session, timeout, cached=None):
+        from scraper import fetch_report
+
+        return fetch_report(self.url, session, timeout, cached, extract=self.extract_rows)
+
+    def extract_rows(self, html):
+        from bs4 import BeautifulSoup
+
+        def cell_text(cells, column):
+            index = self.columns.get(column)
+            if index is None or index >= len(cells):
+                return ""
+            return " ".join(cells[index].get_text(" ").split())
+
+        raw_rows = []
+        for row in BeautifulSoup(html, "html.parser").select(self.rows):
+            cells = row.find_all(["td", "th"], recursive=False)
+            name = cell_text(cells, "name")
+            if not name or len(cells) <= self.columns["gmp"]:
+                continue
+            link = cells[self.columns["name"]].find("a")
+            raw_rows.append((
+                name,
+                # Bring "25.5%" / "25.5 %" into the "(25.5%)" form IpoRecord parses
+                _PERCENT.sub(r"(\1%)", cell_text(cells, "gmp"), count=1),
+                cell_text(cells, "rating"),
+                cell_text(cells, "close"),
+                link.get("href", "") if link is not None else "",
+            ))
+        return raw_rows
+
+
+ADAPTERS = {cls.adapter: cls for cls in (InvestorGainAdapter, TableAdapter)}
+
+
+def as_adapter(name, source):
+    """Adapter for a configured source; a bare URL means an investorgain report."""
+    if isinstance(source, SourceAdapter):
+        return source
+    return InvestorGainAdapter(name, source)
+
+
+def load_sources(path=None):
+    """
+    Load the configured report sources.
+
+    Returns:
+        dict: {source_name: SourceAdapter} in priority order
+
+    Raises:
+        ValueError: If the config is malformed or names an unknown adapter
+    """
+    from scraper import REPORT_SOURCES
+
+    path = path or SOURCES_FILE
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        sources = {}
+        for entry in config["sources"]:
+            settings = dict(entry)
+            name = settings.pop("name")
+            kind = settings.pop("adapter", InvestorGainAdapter.adapter)
+            if kind not in ADAPTERS:
+                raise ValueError(f"{name}: unknown adapter {kind!r}")
+            if kind == InvestorGainAdapter.adapter and "url" not in settings:
+                settings["url"] = REPORT_SOURCES[name]
+            sources[name] = ADAPTERS[kind](name, **settings)
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid source config {path}: {e}") from e
+
+    debug_print(f"Loaded {len(sources)} report sources from "
+                f"{len({source.site for source in sources.values()})} sites from {path}")
+    return sources
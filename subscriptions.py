@@ -0,0 +1,167 @@
+"""
+Per-subscriber filter profiles.
+
+config/subscriptions.json gives each subscriber a filter profile (minimum
+rating, minimum GMP %, SME issues excluded). plan_digests() filters the
+scraped IPOs once per distinct profile and groups subscribers whose
+filtered digest comes out identical, so each distinct email is rendered
+once and sent to its whole group:
+
+    {
+      "profiles": {
+        "mainboard": {"min_rating": 4, "exclude_sme": true},
+        "gmp-20": {"min_rating": 3, "min_gmp": 20}
+      },
+      "subscribers": [
+        {"email": "a@example.com"},
+        {"email": "b@example.com", "profile": "mainboard"},
+        {"email": "c@example.com", "profile": "gmp-20", "exclude_sme": true}
+      ]
+    }
+
+Subscriber keys other than "email" and "profile" override the named
+profile. Without the file, every address from emailer.get_recipients()
+gets the default profile (rated 4/5 or 5/5), as before.
+"""
+
+import json
+import os
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+
+import metrics
+from alert_diff import DIFF_ALERTS, load_last_sent, load_state, select_actionable
+from emailer import Digest, get_recipients
+from models import HIGH_RATING
+
+
+SUBSCRIPTIONS_FILE = os.getenv("IPO_SUBSCRIPTIONS", "config/subscriptions.json")
+
+
+def debug_print(message):
+    print(f"[DEBUG {datetime.now()}] {message}")
+
+
+@dataclass(frozen=True)
+class FilterProfile:
+    min_rating: float | None = HIGH_RATING  # None lets unrated IPOs through
+    min_gmp: float | None = None
+    exclude_sme: bool = False
+
+    @classmethod
+    def from_dict(cls, data, base=None):
+        """
+        Build a profile from config keys, starting from base (or the defaults).
+
+        Raises:
+            ValueError: On keys that aren't profile settings
+        """
+        names = {f.name for f in fields(cls)}
+        unknown = set(data) - names
+        if unknown:
+            raise ValueError(f"Unknown filter settings: {', '.join(sorted(unknown))}")
+        data = {key: float(value) if key != "exclude_sme" and value is not None else value
+                for key, value in data.items()}
+        return replace(base or cls(), **data)
+
+    @property
+    def key(self):
+        """Stable name for this filter combination, e.g. "rating>=4.0,gmp>=20.0,no-sme"."""
+        parts = [f"rating>={self.min_rating}" if self.min_rating is not None else "any-rating"]
+        if self.min_gmp is not None:
+            parts.append(f"gmp>={self.min_gmp}")
+        if self.exclude_sme:
+            parts.append("no-sme")
+        return ",".join(parts)
+
+    def apply(self, ipos):
+        """IpoBatch of the IPOs this profile lets through."""
+        predicate = (lambda ipo: not ipo.is_sme) if self.exclude_sme else None
+        return ipos.filter(min_rating=self.min_rating, min_gmp=self.min_gmp, predicate=predicate)
+
+
+def load_subscriptions(path=None):
+    """
+    Load every subscriber's filter profile.
+
+    Returns:
+        dict: {email: FilterProfile}
+
+    Raises:
+        ValueError: If the config is malformed or names an unknown profile
+    """
+    path = path or SUBSCRIPTIONS_FILE
+    if not os.path.exists(path):
+        return {email: FilterProfile() for email in get_recipients()}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        profiles = {name: FilterProfile.from_dict(settings)
+                    for name, settings in config.get("profiles", {}).items()}
+
+        subscriptions = {}
+        for entry in config.get("subscribers", []):
+            overrides = {key: value for key, value in entry.items() if key not in ("email", "profile")}
+            profile_name = entry.get("profile")
+            if profile_name is not None and profile_name not in profiles:
+                raise ValueError(f"{entry['email']}: unknown profile {profile_name!r}")
+            subscriptions[entry["email"].strip()] = FilterProfile.from_dict(
+                overrides, profiles.get(profile_name))
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid subscription config {path}: {e}") from e
+
+    debug_print(f"Loaded {len(subscriptions)} subscribers with "
+                f"{len(set(subscriptions.values()))} distinct filter profiles from {path}")
+    return subscriptions
+
+
+def lowest_min_rating(subscriptions):
+    """Loosest rating threshold any subscriber uses (None if one takes unrated IPOs)."""
+    ratings = [profile.min_rating for profile in set(subscriptions.values())]
+    if not ratings:
+        return HIGH_RATING
+    return None if None in ratings else min(ratings)
+
+
+def plan_digests(ipos, subscriptions, diff=DIFF_ALERTS, today=None):
+    """
+    Group subscribers by the exact digest their profile produces.
+
+    Each distinct profile is filtered (and, with diff alerts, compared with
+    its last-sent state) once; profiles ending up with the same IPOs and
+    change badges share one Digest.
+
+    Args:
+        ipos: IpoBatch holding every IPO any profile may want
+        subscriptions: {email: FilterProfile} from load_subscriptions()
+        diff: Only include IPOs that are new or changed for the profile
+
+    Returns:
+        list: Non-empty Digests, in first-subscriber order
+    """
+    recipients_by_profile = {}
+    for email, profile in subscriptions.items():
+        recipients_by_profile.setdefault(profile, []).append(email)
+
+    state = load_state() if diff else None
+    digests = {}
+    for profile, recipients in recipients_by_profile.items():
+        selected = profile.apply(ipos)
+        changes = {}
+        if diff:
+            selected, changes = select_actionable(selected, load_last_sent(profile.key, state), today=today)
+        if not selected:
+            continue
+
+        signature = (tuple(selected), tuple(sorted(changes.items())))
+        digest = digests.get(signature)
+        if digest is None:
+            digest = digests[signature] = Digest(selected, changes)
+        digest.recipients.extend(recipients)
+        digest.profiles.append(profile.key)
+
+    metrics.incr("digests_planned", len(digests))
+    debug_print(f"Planned {len(digests)} distinct digests for {len(recipients_by_profile)} "
+                f"filter profiles and {len(subscriptions)} subscribers")
+    return list(digests.values())
@@ -0,0 +1,194 @@
+"""
+Compiled, cached HTML templates for the IPO alert email.
+
+Templates are split into static text and named slots once at import time,
+so rendering is a single join. Cards are cached per IpoRecord, whose
+values were parsed at scrape time, so identical cards across many digests
+cost a dictionary lookup.
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+
+
+CARD_CACHE_SIZE = 16384
+
+_SLOT = re.compile(r"\{\{(\w+)\}\}")
+
+
+class CompiledTemplate:
+    """A template pre-split once into static parts and {{slot}} names."""
+
+    def __init__(self, text):
+        pieces = _SLOT.split(text)
+        self.head = pieces[0]
+        self.pairs = tuple(zip(pieces[1::2], pieces[2::2]))
+
+    def render(self, values):
+        out = [self.head]
+        for slot, part in self.pairs:
+            out.append(values[slot])
+            out.append(part)
+        return "".join(out)
+
+
+CARD_TEMPLATE = CompiledTemplate("""
+        <div class="ipo-card" style="margin-bottom: 20px; border: 1px solid #e0e0e0; border-radius: 12px; padding: 20px; background-color: white; box-sizing: border-box;">
+            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 16px; flex-wrap: wrap; gap: 16px;">
+                <div style="flex: 1; min-width: 280px; box-sizing: border-box;">
+                    <div style="display: flex; align-items: flex-start; margin-bottom: 12px; flex-wrap: wrap; gap: 8px;">
+                        <h3 style="margin: 0; color: #1a237e; font-size: 16px; font-weight: 600; line-height: 1.3; word-break: break-word;">{{name}}</h3>
+                        {{badge}}
+                    </div>
+                    <div style="margin-bottom: 12px;">
+                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Est. Gains (GMP %)</div>
+                        <div style="color: {{gmp_color}}; font-size: 15px; font-weight: 600; word-break: break-all;">{{est_gains}}</div>
+                    </div>
+                    <div>
+                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Rating</div>
+                        <div style="background-color: #fff3e0; color: #e65100; padding: 5px 10px; border-radius: 6px; display: inline-block; font-weight: 500; font-size: 13px;">{{rating}}</div>
+                    </div>
+                </div>
+
+                <div style="flex: 1; min-width: 200px; box-sizing: border-box;">
+                    <div style="margin-bottom: 12px;">
+                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Close Date</div>
+                        <div style="color: #333; font-size: 14px; font-weight: 500;">{{close_date}}</div>
+                    </div>
+                    <div style="margin-top: 8px;">
+                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">Days Remaining</div>
+                        <div style="color: #1565c0; font-size: 14px; font-weight: 500;">{{days_remaining}} days</div>
+                    </div>{{details}}
+                </div>
+            </div>
+        </div>
+        """)
+
+# One per detail-page field the IPO has (see enrichment.py), below Days Remaining
+DETAIL_TEMPLATE = CompiledTemplate("""
+                    <div style="margin-top: 8px;">
+                        <div style="color: #666; font-size: 12px; margin-bottom: 4px;">{{label}}</div>
+                        <div style="color: #333; font-size: 14px; font-weight: 500;">{{value}}</div>
+                    </div>""")
+
+DETAIL_FIELDS = (
+    ("price_band", "Price Band"),
+    ("lot_size", "Lot Size"),
+    ("issue_size", "Issue Size"),
+    ("subscription", "Subscribed"),
+)
+
+PAGE_TEMPLATE = CompiledTemplate("""
+    <html>
+        <head>
+            <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
+            <style>
+                @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap');
+            </style>
+        </head>
+        <body style="font-family: 'Inter', Arial, sans-serif; margin: 0; padding: 8px; background-color: #f5f5f5; -webkit-font-smoothing: antialiased; word-wrap: break-word;">
+            <div style="max-width: 100%; margin: 0 auto; background-color: white; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.05); padding: 20px; box-sizing: border-box;">
+                <div style="margin-bottom: 20px; padding-bottom: 16px; border-bottom: 2px solid #f0f0f0;">
+                    <h1 style="color: #1a237e; font-size: 20px; margin: 0; font-weight: 600; line-height: 1.3;">
+                        🎯 IPO Alerts
+                    </h1>
+                    <p style="color: #666; font-size: 14px; margin: 8px 0 0 0;">
+                        {{date}}
+                    </p>
+                </div>
+
+                <p style="color: #424242; font-size: 15px; margin: 0 0 20px 0; line-height: 1.5;">
+                    Here are the open IPOs that match your alert settings:
+                </p>
+
+                <div style="margin-bottom: 20px;">
+                    {{cards}}
+                </div>
+
+                <div style="background-color: #f8f9fa; border-radius: 8px; padding: 16px; margin-top: 20px;">
+                    <p style="color: #666; font-size: 13px; margin: 0; line-height: 1.4;">
+                        ℹ️ <strong>Status Labels:</strong> <span style="background-color: #4caf50; color: white; padding: 2px 6px; border-radius: 3px; font-size: 9px; font-weight: 600;">O</span> = Open, <span style="background-color: #ff9800; color: white; padding: 2px 6px; border-radius: 3px; font-size: 9px; font-weight: 600;">CT</span> = Closes Today
+                    </p>
+                    <p style="color: #666; font-size: 13px; margin: 8px 0 0 0; line-height: 1.4;">
+                        Only showing IPOs that match your filter profile
+                    </p>
+                </div>
+
+                <div style="margin-top: 20px; padding-top: 16px; border-top: 1px solid #f0f0f0; color: #666; font-size: 12px;">
+                    <p style="margin: 0; line-height: 1.4;">To unsubscribe from these alerts, please contact the administrator.</p>
+                </div>
+            </div>
+        </body>
+    </html>
+    """)
+
+STATUS_BADGES = {
+    "CT": "<span style='background-color: #ff9800; color: white; padding: 3px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; white-space: nowrap;'>CT</span>",
+    "O": "<span style='background-color: #4caf50; color: white; padding: 3px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; white-space: nowrap;'>O</span>",
+}
+
+# Why an IPO is in an incremental digest (see alert_diff.py). "closing_today"
+# has no badge of its own: the CT status badge already says it.
+CHANGE_BADGES = {
+    "new": "<span style='background-color: #1565c0; color: white; padding: 3px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; white-space: nowrap;'>NEW</span>",
+    "gmp_moved": "<span style='background-color: #6a1b9a; color: white; padding: 3px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; white-space: nowrap;'>GMP MOVED</span>",
+    "rating_changed": "<span style='background-color: #e65100; color: white; padding: 3px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; white-space: nowrap;'>RATING CHANGED</span>",
+}
+
+GMP_POSITIVE_COLOR = "#2e7d32"
+GMP_NEGATIVE_COLOR = "#c62828"
+GMP_NEUTRAL_COLOR = "#666"
+
+
+def gmp_color(gmp_pct):
+    if gmp_pct is None:
+        return GMP_NEUTRAL_COLOR
+    if gmp_pct > 0:
+        return GMP_POSITIVE_COLOR
+    if gmp_pct < 0:
+        return GMP_NEGATIVE_COLOR
+    return GMP_NEUTRAL_COLOR
+
+
+@lru_cache(maxsize=CARD_CACHE_SIZE)
+def render_card(ipo, today, change=None):
+    """
+    Render one IPO card. Cached on the record, today's date and the change.
+
+    Args:
+        ipo: IpoRecord
+        today: date the card is rendered for (drives "Days Remaining")
+        change: Optional alert_diff change kind, shown as a badge
+
+    Returns:
+        str: Card HTML
+    """
+    days = ipo.days_remaining(today)
+    return CARD_TEMPLATE.render({
+        "name": ipo.name,
+        "badge": STATUS_BADGES.get(ipo.closing_status, "") + CHANGE_BADGES.get(change, ""),
+        "gmp_color": gmp_color(ipo.gmp_pct),
+        "est_gains": ipo.est_gains,
+        "rating": ipo.rating,
+        "close_date": ipo.close_date_text,
+        "days_remaining": "-" if days is None else str(days),
+        "details": "".join(DETAIL_TEMPLATE.render({"label": label, "value": getattr(ipo, field)})
+                           for field, label in DETAIL_FIELDS if getattr(ipo, field))
+                   + source_gmp_detail(ipo),
+    })
+
+
+def source_gmp_detail(ipo):
+    """"GMP by Source" line for IPOs reported by more than one site, else ""."""
+    if ipo.gmp_spread is None:
+        return ""
+    figures = " · ".join(f"{site} {gmp:g}%" for site, gmp in ipo.source_gmps)
+    return DETAIL_TEMPLATE.render({"label": "GMP by Source",
+                                   "value": f"{figures} (spread {ipo.gmp_spread:g} pts)"})
+
+
+def render_page(cards_html, today=None):
+    """Wrap rendered cards in the email page."""
+    today = today or date.today()
+    return PAGE_TEMPLATE.render({"date": today.strftime('%d %B %Y'), "cards": cards_html})
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Slack, Telegram and generic webhook endpoints.
+
+Accepts any JSON POST, keeps every body in memory by path and answers the
+way the real services do (Slack "ok", Telegram {"ok": true}). It can add
+per-request latency and answer the first few requests with 429, to
+exercise the dispatcher's batching, concurrency limits and retries.
+
+    python webhook_stub.py --port 8025 --latency 0.2
+    SLACK_WEBHOOK_URL=http://127.0.0.1:8025/slack \
+    TELEGRAM_API_URL=http://127.0.0.1:8025/telegram TELEGRAM_BOT_TOKEN=x TELEGRAM_CHAT_ID=1 \
+    IPO_WEBHOOK_URLS=http://127.0.0.1:8025/hook python main.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def debug_print(message):
+    print(f"[WEBHOOK-STUB {datetime.now()}] {message}")
+
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        stub = self.server.stub
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = stub.begin_request()
+        if stub.latency:
+            time.sleep(stub.latency)
+        if status == 429:
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.end_headers()
+            stub.end_request()
+            return
+
+        stub.store(self.path, json.loads(body or b"null"))
+        reply = b"ok" if "/slack" in self.path else b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+        stub.end_request()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubWebhookServer:
+    """
+    In-memory webhook sink running on a background thread.
+
+    Args:
+        port: Port to bind on localhost (0 picks a free port)
+        latency: Seconds to hold each request, to mimic a remote API
+        throttle_first: Answer this many requests with 429 before accepting
+    """
+
+    def __init__(self, port=0, latency=0.0, throttle_first=0):
+        self.latency = latency
+        self.throttle_first = throttle_first
+        self.lock = threading.Lock()
+        self.requests = []  # (path, body) of every accepted request
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), StubWebhookHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+
+    def begin_request(self):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if self.throttle_first > 0:
+                self.throttle_first -= 1
+                return 429
+        return 200
+
+    def end_request(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def store(self, path, body):
+        with self.lock:
+            self.requests.append((path, body))
+
+    def bodies(self, path_prefix):
+        with self.lock:
+            return [body for path, body in self.requests if path.startswith(path_prefix)]
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        debug_print(f"Listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in webhook server")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--throttle-first", type=int, default=0, help="Answer this many requests with 429")
+    args = parser.parse_args()
+
+    stub = StubWebhookServer(args.port, args.latency, args.throttle_first).start()
+    try:
+        while True:
+            time.sleep(5)
+            debug_print(f"{len(stub.requests)} requests, at most {stub.max_in_flight} at once")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()